@@ -0,0 +1,128 @@
+"""
+Generation time of constrained condition sequences, rejection sampling (shuffling
+until the checks pass) vs. ``generate_condition_sequence``, for increasing run lengths,
+and the throughput of validating candidate sequences one by one vs. encoded in batches.
+
+Run with ``python benchmarks/condition_sequences.py``.
+"""
+
+import time
+
+import numpy as np
+
+from rewardgym.tasks.utils import (
+    check_conditions_not_following,
+    check_conditions_not_following_substring,
+    check_encoded_not_following,
+    condition_mask,
+    encode_conditions,
+    generate_condition_sequence,
+)
+
+NOT_FOLLOWING = ["win-a", "loss-a"]
+WINDOW_LENGTH = 2
+SUBSTRING = ["win"]
+SUBSTRING_WINDOW_LENGTH = 1
+MAX_SHUFFLES = 100000
+TIME_LIMIT = 10.0
+
+
+def make_conditions(n_per_condition):
+    return {
+        "win-a": n_per_condition,
+        "win-b": n_per_condition,
+        "loss-a": n_per_condition,
+        "loss-b": n_per_condition,
+        "neutral": 3 * n_per_condition,
+    }
+
+
+def rejection_sampling(conditions, rng):
+    sequence = [cc for cc, nn in conditions.items() for _ in range(nn)]
+    start = time.perf_counter()
+
+    for n_shuffles in range(1, MAX_SHUFFLES + 1):
+        rng.shuffle(sequence)
+        if check_conditions_not_following(
+            sequence, NOT_FOLLOWING, WINDOW_LENGTH
+        ) and check_conditions_not_following_substring(
+            sequence, SUBSTRING, SUBSTRING_WINDOW_LENGTH
+        ):
+            return sequence, n_shuffles
+        if time.perf_counter() - start > TIME_LIMIT:
+            break
+
+    return None, n_shuffles
+
+
+def validation_throughput(conditions, n_candidates=10000, batch_size=1000):
+    sequence = [cc for cc, nn in conditions.items() for _ in range(nn)]
+    rng = np.random.default_rng(1000)
+
+    start = time.perf_counter()
+    for _ in range(n_candidates):
+        rng.shuffle(sequence)
+        check_conditions_not_following(
+            sequence, NOT_FOLLOWING, WINDOW_LENGTH
+        ) and check_conditions_not_following_substring(
+            sequence, SUBSTRING, SUBSTRING_WINDOW_LENGTH
+        )
+    single = n_candidates / (time.perf_counter() - start)
+
+    codes, labels = encode_conditions(sequence)
+    members = condition_mask(labels, not_following=NOT_FOLLOWING)
+    substring = condition_mask(labels, substrings=SUBSTRING)
+
+    start = time.perf_counter()
+    for _ in range(n_candidates // batch_size):
+        candidates = rng.permuted(np.tile(codes, (batch_size, 1)), axis=1)
+        check_encoded_not_following(
+            candidates, members, WINDOW_LENGTH
+        ) & check_encoded_not_following(candidates, substring, SUBSTRING_WINDOW_LENGTH)
+    batched = n_candidates / (time.perf_counter() - start)
+
+    return single, batched
+
+
+def main(n_repeats=5):
+    print(f"{'trials':>8} {'rejection [s]':>15} {'success':>8} {'generator [s]':>15}")
+
+    for n_per_condition in [2, 5, 10, 20, 50, 100, 200]:
+        conditions = make_conditions(n_per_condition)
+        n_trials = sum(conditions.values())
+        rng = np.random.default_rng(1000)
+
+        rejection_times, successes, generator_times = [], 0, []
+
+        for _ in range(n_repeats):
+            start = time.perf_counter()
+            sequence, _ = rejection_sampling(conditions, rng)
+            rejection_times.append(time.perf_counter() - start)
+            successes += sequence is not None
+
+            start = time.perf_counter()
+            generate_condition_sequence(
+                conditions,
+                not_following=NOT_FOLLOWING,
+                window_length=WINDOW_LENGTH,
+                not_following_substring=SUBSTRING,
+                substring_window_length=SUBSTRING_WINDOW_LENGTH,
+                random_state=rng,
+            )
+            generator_times.append(time.perf_counter() - start)
+
+        print(
+            f"{n_trials:>8} {np.median(rejection_times):>15.4f} "
+            f"{successes:>5}/{n_repeats} {np.median(generator_times):>15.4f}"
+        )
+
+    print(f"\n{'trials':>8} {'checks/s':>15} {'encoded/s':>15}")
+
+    for n_per_condition in [10, 100]:
+        conditions = make_conditions(n_per_condition)
+        single, batched = validation_throughput(conditions)
+        print(f"{sum(conditions.values()):>8} {single:>15.0f} {batched:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Conversion time of a simulated session into RL tuples with ``prepare_data_for_rl``,
+compared to processing each trial with ``process_trial_for_rl``.
+
+Run with ``python benchmarks/prepare_data_for_rl.py``.
+"""
+
+import time
+
+import pandas as pd
+from psychopy_simulation import simulate
+
+from rewardgym.handling.data_tools import (
+    prepare_data,
+    prepare_data_for_rl,
+    process_trial_for_rl,
+)
+
+
+def prepare_data_for_rl_loop(df):
+    df = df.sort_values(["trial", "onset"]).reset_index(drop=True)
+
+    all_tuples = []
+    for trial_id, trial_df in df.groupby("trial"):
+        all_tuples.extend(process_trial_for_rl(trial_id, trial_df))
+
+    return pd.DataFrame(
+        all_tuples,
+        columns=["obs0", "action", "reward", "obs1", "reaction_time", "trial"],
+    )
+
+
+if __name__ == "__main__":
+    events, _ = simulate(compile_timeline=True)
+    data, _ = prepare_data(events, remap_dictionary=None, drop_trials=False)
+
+    start = time.perf_counter()
+    reference = prepare_data_for_rl_loop(data)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = prepare_data_for_rl(data)
+    vector = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(vectorized, reference)
+
+    print(f"{data['trial'].nunique()} trials, {len(data)} events")
+    print(f"process_trial_for_rl: {loop:7.3f} s")
+    print(f"prepare_data_for_rl:  {vector:7.3f} s ({loop / vector:5.1f}x)")
@@ -0,0 +1,133 @@
+"""
+Simulation time of a session with ``pspy_run_task`` and an agent, using
+``render_mode="psychopy-simulate"`` with the ``SimulationLogger`` and the
+``TypedSimulationLogger``, with and without the compiled stimulus timeline, compared
+to stepping the same task graph in a ``BaseEnv`` without rendering.
+
+Run with ``python benchmarks/psychopy_simulation.py``.
+"""
+
+import time
+
+from rewardgym.agents import QAgent
+from rewardgym.environments import BaseEnv, PsychopyEnv
+from rewardgym.psychopy_render import (
+    ActionStimulus,
+    BaseStimulus,
+    FeedBackStimulus,
+    SimulationLogger,
+    TypedSimulationLogger,
+)
+from rewardgym.psychopy_render.psychopy_stubs import Clock, Window
+from rewardgym.reward_classes import BaseReward
+from rewardgym.runner import pspy_run_task
+
+N_TRIALS = 2000
+GRAPH = {0: [1, 2], 1: [], 2: []}
+
+
+def make_info_dict():
+    # Similar to the stimulus sequence of the MID task.
+    outcome = [
+        BaseStimulus(name="delay", duration=1.5),
+        BaseStimulus(name="outcome", duration=0.5, rl_label="obs"),
+        BaseStimulus(name="fixation-2", duration=0.5),
+        FeedBackStimulus(1.0, text="{0}", name="reward", rl_label="reward"),
+        BaseStimulus(name="iti", duration=1.0),
+    ]
+
+    return {
+        0: {
+            "psychopy": [
+                BaseStimulus(name="fixation", duration=0.5),
+                BaseStimulus(name="cue", duration=1.0, rl_label="obs"),
+                BaseStimulus(name="anticipation", duration=2.0),
+                ActionStimulus(duration=2.0, rl_label="action"),
+            ]
+        },
+        1: {"psychopy": outcome},
+        2: {"psychopy": outcome},
+    }
+
+
+def make_rewards():
+    return {
+        1: BaseReward(reward=[1, 0], p=[0.7, 0.3]),
+        2: BaseReward(reward=[1, 0], p=[0.3, 0.7]),
+    }
+
+
+def settings():
+    return {
+        "ntrials": N_TRIALS,
+        "condition": ["a"] * N_TRIALS,
+        "condition_dict": {"a": None},
+        "update": [],
+    }
+
+
+def simulate(logger_class, compile_timeline=True):
+    logger = logger_class("", Clock(), participant_id="1", task="bench")
+    logger.create()
+
+    env = PsychopyEnv(
+        GRAPH,
+        make_rewards(),
+        render_mode="psychopy-simulate",
+        info_dict=make_info_dict(),
+        name="bench",
+    )
+    env.setup(
+        window=Window(),
+        logger=logger,
+        expose_last_stim=True,
+        compile_timeline=compile_timeline,
+    )
+    agent = QAgent(0.1, 1.0, action_space=2, state_space=3)
+
+    start = time.perf_counter()
+    pspy_run_task(env, logger, settings=settings(), agent=agent, plugins={})
+    events = logger.close()
+    duration = time.perf_counter() - start
+
+    return events, duration
+
+
+def step_base_env():
+    env = BaseEnv(GRAPH, make_rewards())
+    agent = QAgent(0.1, 1.0, action_space=2, state_space=3)
+
+    start = time.perf_counter()
+    for _ in range(N_TRIALS):
+        obs, info = env.reset(0)
+        done = False
+        while not done:
+            action = agent.get_action(obs, info["avail-actions"])
+            next_obs, reward, terminated, truncated, info = env.step(action)
+            agent.update(obs, action, reward, terminated, next_obs)
+            obs = next_obs
+            done = terminated or truncated
+
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    events, strings = simulate(SimulationLogger)
+    reference, legacy = simulate(SimulationLogger, compile_timeline=False)
+    assert events == reference
+
+    typed_events, typed = simulate(TypedSimulationLogger)
+    typed_reference, typed_legacy = simulate(TypedSimulationLogger, False)
+    assert typed_events.equals(typed_reference)
+
+    base = step_base_env()
+
+    print(f"{N_TRIALS} trials, {len(events['onset'])} events")
+    print(f"{'BaseEnv:':<40} {base:7.3f} s")
+    for label, duration in [
+        ("psychopy-simulate, per stimulus:", legacy),
+        ("psychopy-simulate, compiled:", strings),
+        ("psychopy-simulate, typed, per stimulus:", typed_legacy),
+        ("psychopy-simulate, typed, compiled:", typed),
+    ]:
+        print(f"{label:<40} {duration:7.3f} s ({duration / base:5.1f}x)")
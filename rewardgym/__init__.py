@@ -1,36 +1,59 @@
 # ruff: noqa: E402
 
+import importlib
 import pathlib
 
-from . import _version
-from .tasks import TaskRegistry, get_configs, get_env, get_psychopy_info, task_loader
+from .tasks import (
+    TaskManifest,
+    TaskRegistry,
+    get_configs,
+    get_env,
+    get_psychopy_info,
+    task_loader,
+)
 from .utils import check_random_state, run_single_episode
 
 TASKS_DIR = pathlib.Path(__file__).resolve().parent
 
-_task_registry = TaskRegistry(task_loader._discover_plugins(TASKS_DIR / "tasks"))
+# Plugins (bundled and installed through entry points) are only indexed here and
+# imported when a task is first requested. Their tasks are cached in a manifest in
+# the cache directory (REWARDGYM_CACHE_DIR).
+_task_registry = TaskRegistry.from_directory(
+    TASKS_DIR / "tasks", manifest=TaskManifest()
+)
+_task_registry.add_entry_points()
 
 
 ASSETS_PATH = pathlib.Path(__file__).parent.resolve() / "assets"
 
 ENVIRONMENTS = list(_task_registry.keys())
 
-from . import agents, environments, handling, psychopy_render, runner, stimuli, tasks
+# Subpackages (and their heavy dependencies, e.g. pandas, scipy, PIL or psychopy)
+# and functions that need them are only imported on first attribute access.
+_LAZY_SUBMODULES = [
+    "agents",
+    "environments",
+    "fitting",
+    "handling",
+    "psychopy_render",
+    "pygame_render",
+    "runner",
+    "stimuli",
+]
 
-try:
-    from . import pygame_render
-except ImportError:
-    print("no pygame")
+_LAZY_ATTRIBUTES = {"simulate_many": ".simulation"}
 
 __all__ = [
     "get_configs",
     "get_env",
     "run_single_episode",
+    "simulate_many",
     "ENVIRONMENTS",
     "get_psychopy_info",
     "check_random_state",
     "agents",
     "environments",
+    "fitting",
     "handling",
     "psychopy_render",
     "pygame_render",
@@ -39,12 +62,33 @@ __all__ = [
     "tasks",
 ]
 
-__version__ = _version.get_versions()["version"]
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    elif name == "__version__":
+        from . import _version
+
+        value = _version.get_versions()["version"]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | {"__version__"})
 
 
-def extend_task_registry(extra_dirs, overwrite=True):
+def extend_task_registry(extra_dirs, overwrite=True, lazy=True):
     global _task_registry
     for d in extra_dirs:
-        extra = task_loader._discover_external_plugins(d)
-        _task_registry.extend(extra, overwrite=overwrite)
+        if lazy:
+            _task_registry.add_plugin(pathlib.Path(d).resolve(), overwrite=overwrite)
+        else:
+            extra = task_loader._discover_external_plugins(d)
+            _task_registry.extend(extra, overwrite=overwrite)
     return _task_registry
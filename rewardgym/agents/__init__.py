@@ -6,6 +6,14 @@ from .base_agent import (
     ValenceQAgent_eligibility,
 )
 from .modelbased_agents import HybridAgent, ValenceHybridAgent
+from .population_agents import (
+    HybridAgentPopulation,
+    QAgentPopulation,
+    QAgentPopulation_eligibility,
+    ValenceHybridAgentPopulation,
+    ValenceQAgentPopulation,
+    ValenceQAgentPopulation_eligibility,
+)
 
 __all__ = [
     "QAgent",
@@ -15,4 +23,10 @@ __all__ = [
     "RandomAgent",
     "ValenceHybridAgent",
     "HybridAgent",
+    "QAgentPopulation",
+    "QAgentPopulation_eligibility",
+    "ValenceQAgentPopulation",
+    "ValenceQAgentPopulation_eligibility",
+    "HybridAgentPopulation",
+    "ValenceHybridAgentPopulation",
 ]
@@ -164,9 +164,7 @@ class ValenceQAgent:
         return self.q_values
 
     def reset(self):
-        self.q_values = (
-            np.zeros((self.state_space, self.action_space)) + 1 / self.action_space
-        )
+        self.q_values = np.zeros((self.n_states, self.n_actions)) + 1 / self.n_actions
         self.training_error = []
 
 
@@ -296,7 +294,7 @@ class ValenceQAgent_eligibility(ValenceQAgent):
             seed=seed,
         )
 
-        self.eligibility_traces = np.zeros((self.state_space, self.action_space))
+        self.eligibility_traces = np.zeros((self.n_states, self.n_actions))
         self.eligibility_decay = eligibility_decay
         self.reset_traces = reset_traces
 
@@ -339,7 +337,7 @@ class ValenceQAgent_eligibility(ValenceQAgent):
 
     def reset(self):
         super().reset()
-        self.eligibility_traces = np.zeros((self.state_space, self.action_space))
+        self.eligibility_traces = np.zeros((self.n_states, self.n_actions))
 
 
 class QAgent_eligibility(ValenceQAgent_eligibility):
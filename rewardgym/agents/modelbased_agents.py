@@ -69,33 +69,9 @@ class ValenceHybridAgent(ValenceQAgent):
         self.n_states = state_space
         self.n_actions = action_space
 
-        self.t_values = np.zeros((self.n_states, self.n_actions, self.n_states))
-
-        if graph is not None:
-            for k in graph.keys():
-                actions = list(graph[k].keys())
-
-                for a in actions:
-                    loc = graph[k][a]
-
-                    if isinstance(graph[k][a], tuple):
-                        prob = graph[k][a][1]
-                        loc = graph[k][a][0]
-                    else:
-                        prob = None
-
-                    loc = [loc] if isinstance(loc, int) else loc
-                    ln = len(loc)
-
-                    if use_fixed and prob is not None:
-                        for n, j in enumerate(loc):
-                            if n == 0:
-                                self.t_values[k, a, j] = prob
-                            else:
-                                self.t_values[k, a, j] = (1 - prob) / max([1, ln - 1])
-                    else:
-                        for j in loc:
-                            self.t_values[k, a, j] = 1 / max([1, ln])
+        self.t_values = _init_transition_model(
+            graph, self.n_states, self.n_actions, use_fixed
+        )
 
         self.discount_factor = discount_factor
 
@@ -296,3 +272,41 @@ class HybridAgent(ValenceHybridAgent):
             state_space=state_space,
             seed=seed,
         )
+
+
+def _init_transition_model(
+    graph: Union[dict, None], n_states: int, n_actions: int, use_fixed: bool = False
+) -> np.ndarray:
+    """
+    Initial state-action-state transition probabilities of the hybrid agents, either
+    uniform over the successors in the graph or the graph's fixed probabilities.
+    """
+    t_values = np.zeros((n_states, n_actions, n_states))
+
+    if graph is not None:
+        for k in graph.keys():
+            actions = list(graph[k].keys())
+
+            for a in actions:
+                loc = graph[k][a]
+
+                if isinstance(graph[k][a], tuple):
+                    prob = graph[k][a][1]
+                    loc = graph[k][a][0]
+                else:
+                    prob = None
+
+                loc = [loc] if isinstance(loc, int) else loc
+                ln = len(loc)
+
+                if use_fixed and prob is not None:
+                    for n, j in enumerate(loc):
+                        if n == 0:
+                            t_values[k, a, j] = prob
+                        else:
+                            t_values[k, a, j] = (1 - prob) / max([1, ln - 1])
+                else:
+                    for j in loc:
+                        t_values[k, a, j] = 1 / max([1, ln])
+
+    return t_values
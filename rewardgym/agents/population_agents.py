@@ -0,0 +1,695 @@
+from typing import List, Union
+
+import numpy as np
+
+from ..utils import check_random_state
+from .modelbased_agents import _init_transition_model
+
+
+class ValenceQAgentPopulation:
+    """
+    A population of ValenceQAgents, e.g. one per parameter combination of a sweep.
+    Q-values of all agents are stored in a single (n_agents, n_states, n_actions)
+    array and all agents select actions and learn in one batched call.
+    """
+
+    def __init__(
+        self,
+        learning_rate_pos: Union[float, np.ndarray],
+        learning_rate_neg: Union[float, np.ndarray],
+        temperature: Union[float, np.ndarray],
+        discount_factor: Union[float, np.ndarray] = 0.99,
+        action_space: int = 2,
+        state_space: int = 2,
+        n_agents: int = None,
+        seed: Union[int, np.random.Generator] = 1000,
+    ):
+        """
+        Initializes the population, parameters are either scalars (shared by all agents)
+        or arrays with one value per agent.
+
+        Parameters
+        ----------
+        learning_rate_pos : Union[float, np.ndarray]
+            The learning rate(s) used for updating Q-values when the temporal difference is positive.
+        learning_rate_neg : Union[float, np.ndarray]
+            The learning rate(s) used for updating Q-values when the temporal difference is negative.
+        temperature : Union[float, np.ndarray]
+            The softmax temperature(s) controlling exploration during action selection.
+        discount_factor : Union[float, np.ndarray], optional
+            The discount factor(s) for future rewards, by default 0.99.
+        action_space : int, optional
+            The number of actions available in the environment, by default 2.
+        state_space : int, optional
+            The number of states in the environment, by default 2.
+        n_agents : int, optional
+            Size of the population, if None inferred from the parameters, by default None.
+        seed : Union[int, np.random.Generator], optional
+            Seed or random number generator for reproducibility, by default 1000.
+        """
+        self.n_agents = _infer_n_agents(
+            n_agents, learning_rate_pos, learning_rate_neg, temperature, discount_factor
+        )
+
+        self.n_states = state_space
+        self.n_actions = action_space
+
+        self.lr_pos = self._broadcast(learning_rate_pos)
+        self.lr_neg = self._broadcast(learning_rate_neg)
+        self.temperature = self._broadcast(temperature)
+        self.discount_factor = self._broadcast(discount_factor)
+
+        self.rng = check_random_state(seed)
+        self._agents = np.arange(self.n_agents)
+
+        self.reset()
+
+    def _broadcast(self, parameter: Union[float, np.ndarray]) -> np.ndarray:
+        return np.broadcast_to(
+            np.asarray(parameter, dtype=float), (self.n_agents,)
+        ).copy()
+
+    def _avail_mask(self, avail_actions: Union[List, np.ndarray, None]) -> np.ndarray:
+        """
+        Converts available actions (None, a list of actions shared by all agents, or
+        a boolean mask of shape (n_agents, n_actions)) into a boolean mask.
+        """
+        if avail_actions is None:
+            return np.ones((self.n_agents, self.n_actions), dtype=bool)
+
+        avail_actions = np.asarray(avail_actions)
+
+        if avail_actions.dtype == bool and avail_actions.ndim == 2:
+            return avail_actions
+
+        mask = np.zeros(self.n_actions, dtype=bool)
+        mask[avail_actions] = True
+
+        return np.broadcast_to(mask, (self.n_agents, self.n_actions))
+
+    def _action_values(self, obs: np.ndarray) -> np.ndarray:
+        return self.q_values[self._agents, obs]
+
+    def get_log_probs(
+        self, obs: Union[int, np.ndarray], avail_actions: Union[List, np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Computes the log of the softmax probabilities for every agent, unavailable
+        actions have a log probability of -inf.
+
+        Parameters
+        ----------
+        obs : Union[int, np.ndarray]
+            The current state of each agent (or one state shared by all agents).
+        avail_actions : Union[List, np.ndarray], optional
+            A list of actions available to all agents, or a boolean mask of shape
+            (n_agents, n_actions). If None, all actions are assumed available, by default None.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_agents, n_actions) with the log action probabilities.
+        """
+        obs = np.broadcast_to(obs, (self.n_agents,))
+        mask = self._avail_mask(avail_actions)
+
+        qval = self._action_values(obs) * self.temperature[:, None]
+        qval = np.where(mask, qval, -np.inf)
+        # Shifting by the maximum leaves the softmax unchanged and avoids overflows.
+        qval = qval - np.max(qval, axis=1, keepdims=True)
+
+        return qval - np.log(np.sum(np.exp(qval), axis=1, keepdims=True))
+
+    def get_probs(
+        self, obs: Union[int, np.ndarray], avail_actions: Union[List, np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Computes the softmax probability distribution over actions for every agent.
+
+        Parameters
+        ----------
+        obs : Union[int, np.ndarray]
+            The current state of each agent (or one state shared by all agents).
+        avail_actions : Union[List, np.ndarray], optional
+            A list of actions available to all agents, or a boolean mask of shape
+            (n_agents, n_actions). If None, all actions are assumed available, by default None.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (n_agents, n_actions) with the action probabilities.
+        """
+        return np.exp(self.get_log_probs(obs, avail_actions))
+
+    def get_action(
+        self, obs: Union[int, np.ndarray], avail_actions: Union[List, np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Samples one action per agent from its softmax policy.
+
+        Parameters
+        ----------
+        obs : Union[int, np.ndarray]
+            The current state of each agent (or one state shared by all agents).
+        avail_actions : Union[List, np.ndarray], optional
+            A list of actions available to all agents, or a boolean mask of shape
+            (n_agents, n_actions). If None, all actions are assumed available, by default None.
+
+        Returns
+        -------
+        np.ndarray
+            The selected action of each agent.
+        """
+        prob = self.get_probs(obs, avail_actions)
+        cumulative = np.cumsum(prob, axis=1)
+        draws = self.rng.random(self.n_agents) * cumulative[:, -1]
+
+        # First action whose cumulative probability exceeds the draw (inverse CDF).
+        return np.argmax(cumulative > draws[:, None], axis=1)
+
+    def _temporal_difference(self, agents, obs, action, reward, terminated, next_obs):
+        future_q_value = (~terminated) * np.max(self.q_values[agents, next_obs], axis=1)
+
+        temporal_difference = (
+            reward
+            + self.discount_factor[agents] * future_q_value
+            - self.q_values[agents, obs, action]
+        )
+
+        learning_rate = np.where(
+            temporal_difference > 0, self.lr_pos[agents], self.lr_neg[agents]
+        )
+
+        return temporal_difference, learning_rate * temporal_difference
+
+    def _prepare_update(self, obs, action, reward, terminated, next_obs, mask):
+        obs, action, reward, terminated, next_obs = [
+            np.broadcast_to(ii, (self.n_agents,))
+            for ii in (obs, action, reward, terminated, next_obs)
+        ]
+
+        if mask is None:
+            agents = self._agents
+        else:
+            agents = np.flatnonzero(mask)
+
+        return (
+            agents,
+            obs[agents],
+            action[agents].astype(np.int64),
+            reward[agents].astype(float),
+            terminated[agents].astype(bool),
+            next_obs[agents],
+        )
+
+    def update(
+        self,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        terminated: np.ndarray,
+        next_obs: np.ndarray,
+        mask: np.ndarray = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Updates the Q-values of all agents, using valence dependent learning rates.
+
+        Parameters
+        ----------
+        obs : np.ndarray
+            The state of each agent.
+        action : np.ndarray
+            The action taken by each agent.
+        reward : np.ndarray
+            The reward received by each agent.
+        terminated : np.ndarray
+            Whether the episode of each agent has ended.
+        next_obs : np.ndarray
+            The next state of each agent.
+        mask : np.ndarray, optional
+            Boolean array, only agents that are True are updated, e.g. to skip agents
+            whose environment already terminated, by default None
+
+        Returns
+        -------
+        np.ndarray
+            The updated Q-value array.
+        """
+        agents, obs, action, reward, terminated, next_obs = self._prepare_update(
+            obs, action, reward, terminated, next_obs, mask
+        )
+
+        _, q_update = self._temporal_difference(
+            agents, obs, action, reward, terminated, next_obs
+        )
+
+        self.q_values[agents, obs, action] += q_update
+
+        return self.q_values
+
+    def reset(self):
+        self.q_values = (
+            np.zeros((self.n_agents, self.n_states, self.n_actions))
+            + 1 / self.n_actions
+        )
+
+
+class QAgentPopulation(ValenceQAgentPopulation):
+    def __init__(
+        self,
+        learning_rate: Union[float, np.ndarray],
+        temperature: Union[float, np.ndarray],
+        discount_factor: Union[float, np.ndarray] = 0.99,
+        action_space: int = 2,
+        state_space: int = 2,
+        n_agents: int = None,
+        seed: Union[int, np.random.Generator] = 1000,
+    ):
+        """
+        Initializes a population of QAgents, parameters are either scalars (shared by all agents)
+        or arrays with one value per agent.
+
+        Parameters
+        ----------
+        learning_rate : Union[float, np.ndarray]
+            The learning rate(s) used for updating Q-values.
+        temperature : Union[float, np.ndarray]
+            The softmax temperature(s) controlling exploration during action selection.
+        discount_factor : Union[float, np.ndarray], optional
+            The discount factor(s) for future rewards, by default 0.99.
+        action_space : int, optional
+            The number of actions available in the environment, by default 2.
+        state_space : int, optional
+            The number of states in the environment, by default 2.
+        n_agents : int, optional
+            Size of the population, if None inferred from the parameters, by default None.
+        seed : Union[int, np.random.Generator], optional
+            Seed or random number generator for reproducibility, by default 1000.
+        """
+        super().__init__(
+            learning_rate_pos=learning_rate,
+            learning_rate_neg=learning_rate,
+            temperature=temperature,
+            discount_factor=discount_factor,
+            action_space=action_space,
+            state_space=state_space,
+            n_agents=n_agents,
+            seed=seed,
+        )
+
+
+class ValenceQAgentPopulation_eligibility(ValenceQAgentPopulation):
+    def __init__(
+        self,
+        learning_rate_pos: Union[float, np.ndarray],
+        learning_rate_neg: Union[float, np.ndarray],
+        temperature: Union[float, np.ndarray],
+        discount_factor: Union[float, np.ndarray] = 0.99,
+        eligibility_decay: Union[float, np.ndarray] = 0.0,
+        reset_traces: bool = True,
+        action_space: int = 2,
+        state_space: int = 2,
+        n_agents: int = None,
+        seed: Union[int, np.random.Generator] = 1000,
+    ):
+        """
+        Initializes a population of ValenceQAgents with eligibility traces.
+
+        Parameters
+        ----------
+        learning_rate_pos : Union[float, np.ndarray]
+            The learning rate(s) used for updating Q-values when the temporal difference is positive.
+        learning_rate_neg : Union[float, np.ndarray]
+            The learning rate(s) used for updating Q-values when the temporal difference is negative.
+        temperature : Union[float, np.ndarray]
+            The softmax temperature(s) controlling exploration during action selection.
+        discount_factor : Union[float, np.ndarray], optional
+            The discount factor(s) for future rewards, by default 0.99.
+        eligibility_decay : Union[float, np.ndarray], optional
+            The decay rate(s) of the eligibility traces, by default 0.0.
+        reset_traces : bool, optional
+            Whether to reset the eligibility traces each episode or not, by default True.
+        action_space : int, optional
+            The number of actions available in the environment, by default 2.
+        state_space : int, optional
+            The number of states in the environment, by default 2.
+        n_agents : int, optional
+            Size of the population, if None inferred from the parameters, by default None.
+        seed : Union[int, np.random.Generator], optional
+            Seed or random number generator for reproducibility, by default 1000.
+        """
+        n_agents = _infer_n_agents(
+            n_agents,
+            learning_rate_pos,
+            learning_rate_neg,
+            temperature,
+            discount_factor,
+            eligibility_decay,
+        )
+
+        super().__init__(
+            learning_rate_pos=learning_rate_pos,
+            learning_rate_neg=learning_rate_neg,
+            temperature=temperature,
+            discount_factor=discount_factor,
+            action_space=action_space,
+            state_space=state_space,
+            n_agents=n_agents,
+            seed=seed,
+        )
+
+        self.eligibility_decay = self._broadcast(eligibility_decay)
+        self.reset_traces = reset_traces
+
+    def update(
+        self,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        terminated: np.ndarray,
+        next_obs: np.ndarray,
+        mask: np.ndarray = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """Updates the Q-values of all (masked) agents, using eligibility traces."""
+        agents, obs, action, reward, terminated, next_obs = self._prepare_update(
+            obs, action, reward, terminated, next_obs, mask
+        )
+
+        _, q_update = self._temporal_difference(
+            agents, obs, action, reward, terminated, next_obs
+        )
+
+        self.eligibility_traces[agents, obs, action] += 1
+
+        self.q_values[agents] += (
+            q_update[:, None, None] * self.eligibility_traces[agents]
+        )
+
+        self.eligibility_traces[agents] *= (
+            self.discount_factor[agents] * self.eligibility_decay[agents]
+        )[:, None, None]
+
+        if self.reset_traces:
+            self.eligibility_traces[agents[terminated]] = 0
+
+        return self.q_values
+
+    def reset(self):
+        super().reset()
+        self.eligibility_traces = np.zeros(
+            (self.n_agents, self.n_states, self.n_actions)
+        )
+
+
+class QAgentPopulation_eligibility(ValenceQAgentPopulation_eligibility):
+    def __init__(
+        self,
+        learning_rate: Union[float, np.ndarray],
+        temperature: Union[float, np.ndarray],
+        discount_factor: Union[float, np.ndarray] = 0.99,
+        eligibility_decay: Union[float, np.ndarray] = 0.0,
+        reset_traces: bool = True,
+        action_space: int = 2,
+        state_space: int = 2,
+        n_agents: int = None,
+        seed: Union[int, np.random.Generator] = 1000,
+    ):
+        """
+        Initializes a population of QAgents with eligibility traces.
+
+        Parameters
+        ----------
+        learning_rate : Union[float, np.ndarray]
+            The learning rate(s) used for updating Q-values.
+        temperature : Union[float, np.ndarray]
+            The softmax temperature(s) controlling exploration during action selection.
+        discount_factor : Union[float, np.ndarray], optional
+            The discount factor(s) for future rewards, by default 0.99.
+        eligibility_decay : Union[float, np.ndarray], optional
+            The decay rate(s) of the eligibility traces, by default 0.0.
+        reset_traces : bool, optional
+            Whether to reset the eligibility traces each episode or not, by default True.
+        action_space : int, optional
+            The number of actions available in the environment, by default 2.
+        state_space : int, optional
+            The number of states in the environment, by default 2.
+        n_agents : int, optional
+            Size of the population, if None inferred from the parameters, by default None.
+        seed : Union[int, np.random.Generator], optional
+            Seed or random number generator for reproducibility, by default 1000.
+        """
+        super().__init__(
+            learning_rate_pos=learning_rate,
+            learning_rate_neg=learning_rate,
+            temperature=temperature,
+            discount_factor=discount_factor,
+            eligibility_decay=eligibility_decay,
+            reset_traces=reset_traces,
+            action_space=action_space,
+            state_space=state_space,
+            n_agents=n_agents,
+            seed=seed,
+        )
+
+
+class ValenceHybridAgentPopulation(ValenceQAgentPopulation):
+    """
+    A population of ValenceHybridAgents. Every agent blends the Q-values of a
+    transition model (model-based) with the Q-values of a valence Q-learner with
+    eligibility traces (model-free).
+    """
+
+    def __init__(
+        self,
+        learning_rate_mb: Union[float, np.ndarray],
+        learning_rate_mf_pos: Union[float, np.ndarray],
+        learning_rate_mf_neg: Union[float, np.ndarray],
+        temperature: Union[float, np.ndarray],
+        discount_factor: Union[float, np.ndarray] = 0.99,
+        eligibility_decay: Union[float, np.ndarray] = 0.0,
+        reset_traces: bool = True,
+        hybrid: Union[float, np.ndarray] = 1.0,
+        action_space: int = 2,
+        state_space: int = 2,
+        n_agents: int = None,
+        seed: Union[int, np.random.Generator] = 1000,
+        graph: dict = None,
+        use_fixed: bool = False,
+    ):
+        """
+        Initializes a population of hybrid agents, parameters are either scalars (shared
+        by all agents) or arrays with one value per agent.
+
+        Parameters
+        ----------
+        learning_rate_mb : Union[float, np.ndarray]
+            The learning rate(s) for updating the state-action-state transition model.
+        learning_rate_mf_pos : Union[float, np.ndarray]
+            The model-free learning rate(s) for positive temporal differences.
+        learning_rate_mf_neg : Union[float, np.ndarray]
+            The model-free learning rate(s) for negative temporal differences.
+        temperature : Union[float, np.ndarray]
+            The softmax temperature(s) controlling exploration during action selection.
+        discount_factor : Union[float, np.ndarray], optional
+            The discount factor(s) for future rewards, by default 0.99.
+        eligibility_decay : Union[float, np.ndarray], optional
+            The decay rate(s) of the model-free eligibility traces, by default 0.0.
+        reset_traces : bool, optional
+            Whether to reset the eligibility traces each episode or not, by default True.
+        hybrid : Union[float, np.ndarray], optional
+            Weight(s) of the model-based Q-values, by default 1.0 (fully MB).
+        action_space : int, optional
+            The number of actions available in the environment, by default 2.
+        state_space : int, optional
+            The number of states in the environment, by default 2.
+        n_agents : int, optional
+            Size of the population, if None inferred from the parameters, by default None.
+        seed : Union[int, np.random.Generator], optional
+            Seed or random number generator for reproducibility, by default 1000.
+        graph : dict, optional
+            The environment graph used to initialize the transition model, by default None.
+        use_fixed : bool, optional
+            Whether to use the fixed transition probabilities of the graph, by default False.
+        """
+        n_agents = _infer_n_agents(
+            n_agents,
+            learning_rate_mb,
+            learning_rate_mf_pos,
+            learning_rate_mf_neg,
+            temperature,
+            discount_factor,
+            eligibility_decay,
+            hybrid,
+        )
+
+        self.q_agent = ValenceQAgentPopulation_eligibility(
+            learning_rate_pos=learning_rate_mf_pos,
+            learning_rate_neg=learning_rate_mf_neg,
+            temperature=temperature,
+            discount_factor=discount_factor,
+            eligibility_decay=eligibility_decay,
+            reset_traces=reset_traces,
+            action_space=action_space,
+            state_space=state_space,
+            n_agents=n_agents,
+        )
+
+        super().__init__(
+            learning_rate_pos=learning_rate_mf_pos,
+            learning_rate_neg=learning_rate_mf_neg,
+            temperature=temperature,
+            discount_factor=discount_factor,
+            action_space=action_space,
+            state_space=state_space,
+            n_agents=n_agents,
+            seed=seed,
+        )
+
+        self.lr = self._broadcast(learning_rate_mb)
+        self.hybrid = self._broadcast(hybrid)
+
+        self.t_values = np.broadcast_to(
+            _init_transition_model(graph, self.n_states, self.n_actions, use_fixed),
+            (self.n_agents, self.n_states, self.n_actions, self.n_states),
+        ).copy()
+
+    def _action_values(self, obs: np.ndarray) -> np.ndarray:
+        hybrid = self.hybrid[:, None]
+        return self.q_values[self._agents, obs] * hybrid + self.q_agent.q_values[
+            self._agents, obs
+        ] * (1 - hybrid)
+
+    def update(
+        self,
+        obs: np.ndarray,
+        action: np.ndarray,
+        reward: np.ndarray,
+        terminated: np.ndarray,
+        next_obs: np.ndarray,
+        mask: np.ndarray = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        Updates the model-free Q-values, the transition model and the model-based
+        Q-values of all (masked) agents. Negative next states (e.g. a missing final
+        observation) only decay the transition model.
+        """
+        self.q_agent.update(obs, action, reward, terminated, next_obs, mask=mask)
+
+        agents, obs, action, reward, terminated, next_obs = self._prepare_update(
+            obs, action, reward, terminated, next_obs, mask
+        )
+
+        has_next = next_obs >= 0
+        transitions = self.t_values[agents, obs, action]
+
+        lr = self.lr[agents]
+        target = np.zeros_like(transitions)
+        target[has_next, next_obs[has_next]] = 1
+
+        # Equal to (1 - lr) * t for all other states, and t + lr * (1 - t) for next_obs.
+        transitions = transitions * (1 - lr[:, None]) + lr[:, None] * target
+        self.t_values[agents, obs, action] = transitions
+
+        future = np.max(self.q_agent.q_values[agents], axis=2)
+        qval_mb = np.sum(transitions * (reward[:, None] + future), axis=1)
+
+        self.q_values[agents, obs, action] = np.where(
+            terminated, self.q_agent.q_values[agents, obs, action], qval_mb
+        )
+
+        return self.q_values
+
+    def reset(self):
+        super().reset()
+        self.q_agent.reset()
+        self.q_values = np.zeros((self.n_agents, self.n_states, self.n_actions))
+        self.t_values = np.zeros(
+            (self.n_agents, self.n_states, self.n_actions, self.n_states)
+        )
+
+
+class HybridAgentPopulation(ValenceHybridAgentPopulation):
+    def __init__(
+        self,
+        learning_rate_mb: Union[float, np.ndarray],
+        learning_rate_mf: Union[float, np.ndarray],
+        temperature: Union[float, np.ndarray],
+        discount_factor: Union[float, np.ndarray] = 0.99,
+        eligibility_decay: Union[float, np.ndarray] = 0.0,
+        reset_traces: bool = True,
+        hybrid: Union[float, np.ndarray] = 1.0,
+        action_space: int = 2,
+        state_space: int = 2,
+        n_agents: int = None,
+        seed: Union[int, np.random.Generator] = 1000,
+        graph: dict = None,
+        use_fixed: bool = False,
+    ):
+        """
+        Initializes a population of HybridAgents, with a shared model-free learning rate
+        for positive and negative temporal differences.
+
+        Parameters
+        ----------
+        learning_rate_mb : Union[float, np.ndarray]
+            The learning rate(s) for updating the state-action-state transition model.
+        learning_rate_mf : Union[float, np.ndarray]
+            The model-free learning rate(s).
+        temperature : Union[float, np.ndarray]
+            The softmax temperature(s) controlling exploration during action selection.
+        discount_factor : Union[float, np.ndarray], optional
+            The discount factor(s) for future rewards, by default 0.99.
+        eligibility_decay : Union[float, np.ndarray], optional
+            The decay rate(s) of the model-free eligibility traces, by default 0.0.
+        reset_traces : bool, optional
+            Whether to reset the eligibility traces each episode or not, by default True.
+        hybrid : Union[float, np.ndarray], optional
+            Weight(s) of the model-based Q-values, by default 1.0 (fully MB).
+        action_space : int, optional
+            The number of actions available in the environment, by default 2.
+        state_space : int, optional
+            The number of states in the environment, by default 2.
+        n_agents : int, optional
+            Size of the population, if None inferred from the parameters, by default None.
+        seed : Union[int, np.random.Generator], optional
+            Seed or random number generator for reproducibility, by default 1000.
+        graph : dict, optional
+            The environment graph used to initialize the transition model, by default None.
+        use_fixed : bool, optional
+            Whether to use the fixed transition probabilities of the graph, by default False.
+        """
+        super().__init__(
+            learning_rate_mb=learning_rate_mb,
+            learning_rate_mf_pos=learning_rate_mf,
+            learning_rate_mf_neg=learning_rate_mf,
+            temperature=temperature,
+            discount_factor=discount_factor,
+            eligibility_decay=eligibility_decay,
+            reset_traces=reset_traces,
+            hybrid=hybrid,
+            action_space=action_space,
+            state_space=state_space,
+            n_agents=n_agents,
+            seed=seed,
+            graph=graph,
+            use_fixed=use_fixed,
+        )
+
+
+def _infer_n_agents(n_agents, *parameters) -> int:
+    """Infers the population size from the largest parameter array."""
+    sizes = {np.size(pp) for pp in parameters if np.size(pp) > 1}
+
+    if len(sizes) > 1:
+        raise ValueError(f"Parameter arrays have different sizes: {sorted(sizes)}.")
+
+    if n_agents is None:
+        return sizes.pop() if sizes else 1
+
+    if sizes and sizes.pop() != n_agents:
+        raise ValueError("Parameter arrays do not match n_agents.")
+
+    return n_agents
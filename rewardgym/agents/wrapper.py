@@ -1,6 +1,7 @@
-from typing import Tuple
+from typing import Tuple, Union
 
 import numpy as np
+from scipy.special import log_ndtr
 
 
 class RTWrapper:
@@ -33,6 +34,8 @@ class EAMWrapper(RTWrapper):
         eam_v0: float = 0,
         eam_w: float = 1.0,
         add_error_process: bool = False,
+        block_size: int = None,
+        analytic: bool = False,
         **kwargs,
     ):
         self.agent = agent(*args, **kwargs)
@@ -42,6 +45,10 @@ class EAMWrapper(RTWrapper):
         self.eam_v0 = eam_v0
         self.eam_w = eam_w
         self.add_error_process = add_error_process
+        # If not None, accumulator increments are drawn in blocks of block_size steps.
+        self.block_size = block_size
+        # If True, first passage times are sampled from the inverse Gaussian race.
+        self.analytic = analytic
 
     def get_rt_action(
         self, obs: Tuple[int, int, bool], avail_actions: list = None
@@ -71,20 +78,145 @@ class EAMWrapper(RTWrapper):
         if self.add_error_process:
             qval = np.hstack([qval, np.mean(qval)])
 
-        evidence = np.zeros_like(qval)
-        rts = 0
+        if self.analytic:
+            choice, rts = race_first_passage_analytic(
+                self.eam_v0 + self.eam_w * qval,
+                threshold=self.eam_a,
+                sd=self.eam_sd,
+                random_state=self.agent.rng,
+            )
+            a, rts = choice[0], rts[0]
+        elif self.block_size is not None:
+            choice, rts = race_first_passage(
+                self.eam_v0 + self.eam_w * qval,
+                threshold=self.eam_a,
+                sd=self.eam_sd,
+                dt=self.eam_dt,
+                random_state=self.agent.rng,
+                block_size=self.block_size,
+            )
+            a, rts = choice[0], rts[0]
+        else:
+            evidence = np.zeros_like(qval)
+            rts = 0
 
-        while all(evidence < self.eam_a):
-            evidence = self._accumulate(qval, evidence)
-            rts += self.eam_dt
+            while all(evidence < self.eam_a):
+                evidence = self._accumulate(qval, evidence)
+                rts += self.eam_dt
 
-        a = np.argmax(evidence)
+            a = np.argmax(evidence)
 
         if a == len(qval) - 1 and self.add_error_process:
             a = self.agent.rng.choice(len(avail_actions))
 
         return a, rts
 
+    def get_rt_actions(
+        self, obs: Union[int, np.ndarray], avail_actions: list = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simulates the evidence accumulation process for many trials at once, e.g. all
+        agents of a population or many repetitions of the same state.
+
+        Parameters
+        ----------
+        obs : Union[int, np.ndarray]
+            The observation of each trial. For population agents one observation per
+            agent, otherwise a sequence of observations of the single agent.
+        avail_actions : list, optional
+            List of available actions shared by all trials, by default None
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Returns the actions and reaction times of all trials.
+        """
+        q_values = np.asarray(self.q_values)
+
+        if q_values.ndim == 3:
+            obs = np.broadcast_to(obs, (q_values.shape[0],))
+            qval = q_values[np.arange(q_values.shape[0]), obs]
+        else:
+            qval = q_values[np.atleast_1d(obs)]
+
+        if avail_actions is None:
+            avail_actions = np.arange(qval.shape[1])
+
+        qval = qval[:, avail_actions]
+
+        if self.add_error_process:
+            qval = np.hstack([qval, np.mean(qval, axis=1, keepdims=True)])
+
+        if self.analytic:
+            actions, rts = race_first_passage_analytic(
+                self.eam_v0 + self.eam_w * qval,
+                threshold=self.eam_a,
+                sd=self.eam_sd,
+                random_state=self.agent.rng,
+            )
+        else:
+            actions, rts = race_first_passage(
+                self.eam_v0 + self.eam_w * qval,
+                threshold=self.eam_a,
+                sd=self.eam_sd,
+                dt=self.eam_dt,
+                random_state=self.agent.rng,
+                block_size=100 if self.block_size is None else self.block_size,
+            )
+
+        if self.add_error_process:
+            error = actions == qval.shape[1] - 1
+            actions[error] = self.agent.rng.choice(len(avail_actions), np.sum(error))
+
+        return actions, rts
+
+    def get_rt_log_likelihood(
+        self,
+        obs: Union[int, np.ndarray],
+        action: Union[int, np.ndarray],
+        rt: Union[float, np.ndarray],
+        avail_actions: list = None,
+    ) -> np.ndarray:
+        """
+        Log-likelihood of observed actions and reaction times under the (continuous
+        time) race of the wrapped agent's current q-values, see ``race_log_likelihood``.
+
+        Parameters
+        ----------
+        obs : Union[int, np.ndarray]
+            The observation of each trial.
+        action : Union[int, np.ndarray]
+            The chosen action of each trial, as index into avail_actions.
+        rt : Union[float, np.ndarray]
+            The reaction time of each trial.
+        avail_actions : list, optional
+            List of available actions shared by all trials, by default None
+
+        Returns
+        -------
+        np.ndarray
+            The log-likelihood of each trial.
+        """
+        q_values = np.asarray(self.q_values)
+
+        if q_values.ndim == 3:
+            obs = np.broadcast_to(obs, (q_values.shape[0],))
+            qval = q_values[np.arange(q_values.shape[0]), obs]
+        else:
+            qval = q_values[np.atleast_1d(obs)]
+
+        if avail_actions is not None:
+            qval = qval[:, avail_actions]
+
+        return race_log_likelihood(
+            self.eam_v0 + self.eam_w * qval,
+            threshold=self.eam_a,
+            sd=self.eam_sd,
+            choices=action,
+            rts=rt,
+            add_error_process=self.add_error_process,
+        )
+
     def _accumulate(self, q, evidence):
         noise = self.agent.rng.normal(0, self.eam_sd, len(q))
         evidence += (self.eam_v0 + self.eam_w * q) * self.eam_dt + noise * np.sqrt(
@@ -94,6 +226,275 @@ class EAMWrapper(RTWrapper):
         return evidence
 
 
+def race_first_passage(
+    drift: np.ndarray,
+    threshold: float,
+    sd: float,
+    dt: float,
+    random_state: np.random.Generator,
+    block_size: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulates racing accumulators with Euler steps, for many trials at once.
+    Increments are drawn in blocks of ``block_size`` steps and the first threshold
+    crossing of each trial is found on the cumulative sums. For a single trial the
+    result equals the step-by-step simulation with the same random numbers.
+
+    Parameters
+    ----------
+    drift : np.ndarray
+        Array of shape (n_accumulators,) or (n_trials, n_accumulators), the drift rate
+        of every accumulator.
+    threshold : float
+        The decision threshold.
+    sd : float
+        Standard deviation of the accumulation noise.
+    dt : float
+        Step size of the simulation.
+    random_state : np.random.Generator
+        The random number generator.
+    block_size : int, optional
+        Number of steps simulated at once, by default 100
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The winning accumulator and the reaction time of each trial.
+    """
+    drift = np.atleast_2d(np.asarray(drift, dtype=float))
+    n_trials, n_accumulators = drift.shape
+
+    evidence = np.zeros((n_trials, n_accumulators))
+    steps = np.zeros(n_trials, dtype=np.int64)
+    choices = np.zeros(n_trials, dtype=np.int64)
+    active = np.arange(n_trials)
+
+    while active.size > 0:
+        noise = random_state.normal(0, sd, (active.size, block_size, n_accumulators))
+        increments = drift[active, None, :] * dt + noise * np.sqrt(dt)
+
+        # Starting from the current evidence keeps the summation order of single steps.
+        path = np.cumsum(
+            np.concatenate([evidence[active, None, :], increments], axis=1), axis=1
+        )[:, 1:]
+
+        crossed = np.any(path >= threshold, axis=2)
+        done = np.any(crossed, axis=1)
+        first = np.argmax(crossed, axis=1)
+
+        finished = active[done]
+        steps[finished] += first[done] + 1
+        choices[finished] = np.argmax(path[done, first[done]], axis=1)
+
+        running = active[~done]
+        steps[running] += block_size
+        evidence[running] = path[~done, -1]
+
+        active = running
+
+    return choices, _step_times(steps, dt)
+
+
+def race_first_passage_analytic(
+    drift: np.ndarray,
+    threshold: float,
+    sd: float,
+    random_state: np.random.Generator,
+    max_redraws: int = 1000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Samples racing Wiener accumulators exactly, using their first passage time
+    distributions instead of simulating the paths.
+
+    The first passage time of an accumulator starting at 0 with drift v > 0 is inverse
+    Gaussian with mean a / v and shape a^2 / sd^2. With v < 0 the threshold is only
+    reached with probability exp(2 v a / sd^2), and then with the passage times of
+    drift -v. With v = 0 it follows a Levy distribution. Trials in which no
+    accumulator reaches the threshold are drawn again, i.e. the returned reaction
+    times are conditional on a response.
+
+    Parameters
+    ----------
+    drift : np.ndarray
+        Array of shape (n_accumulators,) or (n_trials, n_accumulators), the drift rate
+        of every accumulator.
+    threshold : float
+        The decision threshold.
+    sd : float
+        Standard deviation of the accumulation noise, has to be positive.
+    random_state : np.random.Generator
+        The random number generator.
+    max_redraws : int, optional
+        How often trials without a response are drawn again, by default 1000
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The winning accumulator and the (continuous) reaction time of each trial.
+
+    Raises
+    ------
+    ValueError
+        If sd is not positive.
+    RuntimeError
+        If a trial still has no response after max_redraws redraws, e.g. if all
+        drift rates are strongly negative.
+    """
+    if sd <= 0:
+        raise ValueError("The analytic race requires a positive eam_sd.")
+
+    drift = np.atleast_2d(np.asarray(drift, dtype=float))
+
+    times = np.full(drift.shape, np.inf)
+    pending = np.ones(drift.shape[0], dtype=bool)
+    shape = threshold**2 / sd**2
+
+    n_draws = 0
+
+    while pending.any():
+        if n_draws > max_redraws:
+            raise RuntimeError(
+                f"No accumulator reached the threshold in {np.sum(pending)} trial(s) "
+                f"after {max_redraws} redraws. With negative drift rates, the "
+                "threshold is only reached with probability exp(2 v a / sd^2)."
+            )
+
+        n_draws += 1
+        trial_drift = drift[pending]
+        trial_times = np.full(trial_drift.shape, np.inf)
+
+        moving = trial_drift != 0
+        trial_times[moving] = random_state.wald(
+            threshold / np.abs(trial_drift[moving]), shape
+        )
+
+        negative = trial_drift < 0
+        hit = random_state.random(np.sum(negative)) < np.exp(
+            2 * trial_drift[negative] * threshold / sd**2
+        )
+        trial_times[negative] = np.where(hit, trial_times[negative], np.inf)
+
+        still = ~moving
+        trial_times[still] = shape / random_state.standard_normal(np.sum(still)) ** 2
+
+        times[pending] = trial_times
+        pending[pending] = np.all(np.isinf(trial_times), axis=1)
+
+    choices = np.argmin(times, axis=1)
+
+    return choices, times[np.arange(drift.shape[0]), choices]
+
+
+def race_log_likelihood(
+    drift: np.ndarray,
+    threshold: float,
+    sd: float,
+    choices: np.ndarray,
+    rts: np.ndarray,
+    add_error_process: bool = False,
+) -> np.ndarray:
+    """
+    Log-likelihood of choices and reaction times under the race of Wiener accumulators
+    (the counterpart of ``race_first_passage_analytic``), i.e. the first passage
+    density of the chosen accumulator times the survival of all others. As the
+    sampler only returns trials with a response, the density is conditioned on any
+    accumulator (including the error accumulator) reaching the threshold, which is
+    not certain if all drift rates are negative.
+
+    Parameters
+    ----------
+    drift : np.ndarray
+        Array of shape (n_accumulators,) or (n_trials, n_accumulators), the drift rates
+        of the accumulators (without the error accumulator).
+    threshold : float
+        The decision threshold.
+    sd : float
+        Standard deviation of the accumulation noise, has to be positive.
+    choices : np.ndarray
+        The chosen accumulator of each trial.
+    rts : np.ndarray
+        The reaction time of each trial.
+    add_error_process : bool, optional
+        If an error accumulator with the mean drift rate races as well, whose responses
+        are distributed uniformly over all choices, by default False
+
+    Returns
+    -------
+    np.ndarray
+        The log-likelihood of each trial.
+    """
+    drift = np.atleast_2d(np.asarray(drift, dtype=float))
+    rts = np.asarray(rts, dtype=float)
+    n_trials = np.broadcast_shapes(drift.shape[:1], np.shape(choices), rts.shape)[0]
+
+    drift = np.broadcast_to(drift, (n_trials, drift.shape[1]))
+    choices = np.broadcast_to(choices, (n_trials,))
+    rts = np.broadcast_to(rts, (n_trials,))[:, None]
+    n_choices = drift.shape[1]
+
+    if add_error_process:
+        drift = np.hstack([drift, np.mean(drift, axis=1, keepdims=True)])
+
+    log_density = _wiener_log_density(drift, threshold, sd, rts)
+    log_survival = _wiener_log_survival(drift, threshold, sd, rts)
+    total_survival = np.sum(log_survival, axis=1)
+
+    rows = np.arange(n_trials)
+    log_lik = log_density[rows, choices] + total_survival - log_survival[rows, choices]
+
+    if add_error_process:
+        log_error = log_density[:, -1] + total_survival - log_survival[:, -1]
+        log_lik = np.logaddexp(log_lik, log_error - np.log(n_choices))
+
+    return log_lik - _log_response_probability(drift, threshold, sd)
+
+
+def _log_response_probability(drift, threshold, sd):
+    """Log probability that any of the racing accumulators reaches the threshold."""
+    # Accumulators with a non-negative drift reach the threshold almost surely.
+    with np.errstate(divide="ignore"):
+        log_miss = np.where(
+            drift < 0,
+            np.log1p(-np.exp(2 * np.minimum(drift, 0) * threshold / sd**2)),
+            -np.inf,
+        )
+
+    return np.log(-np.expm1(np.sum(log_miss, axis=1)))
+
+
+def _wiener_log_density(drift, threshold, sd, t):
+    """Log first passage density of a Wiener process with drift through threshold."""
+    with np.errstate(divide="ignore"):
+        return (
+            np.log(threshold)
+            - np.log(sd)
+            - 0.5 * np.log(2 * np.pi * t**3)
+            - (threshold - drift * t) ** 2 / (2 * sd**2 * t)
+        )
+
+
+def _wiener_log_survival(drift, threshold, sd, t):
+    """Log probability that a Wiener process has not reached the threshold at time t."""
+    scale = sd * np.sqrt(t)
+    log_upper = log_ndtr((threshold - drift * t) / scale)
+    log_reflected = 2 * drift * threshold / sd**2 + log_ndtr(
+        -(threshold + drift * t) / scale
+    )
+
+    with np.errstate(divide="ignore"):
+        return log_upper + np.log1p(-np.exp(np.minimum(log_reflected - log_upper, 0)))
+
+
+def _step_times(steps: np.ndarray, dt: float) -> np.ndarray:
+    """Elapsed time after a number of steps, summed in the same order as step-wise."""
+    if steps.size == 0:
+        return np.zeros(0)
+
+    times = np.concatenate([[0], np.cumsum(np.full(steps.max(), dt))])
+
+    return times[steps]
+
+
 class SimpleWrapper(RTWrapper):
     def __init__(self, agent, *args, rt_extra=0.0, env_name=None, **kwargs):
         self.agent = agent(*args, **kwargs)
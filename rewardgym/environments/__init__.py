@@ -1,5 +1,14 @@
-from .base_env import BaseEnv
+from .base_env import BaseEnv, NodeInfo
+from .compiled_graph import CompiledGraph
 from .psychopy_env import PsychopyEnv
 from .render_env import RenderEnv
+from .vector_env import VectorBaseEnv
 
-__all__ = ["BaseEnv", "PsychopyEnv", "RenderEnv"]
+__all__ = [
+    "BaseEnv",
+    "CompiledGraph",
+    "NodeInfo",
+    "PsychopyEnv",
+    "RenderEnv",
+    "VectorBaseEnv",
+]
@@ -12,6 +12,47 @@ from typing import Tuple
 import numpy as np
 
 from ..utils import check_random_state
+from .compiled_graph import CompiledGraph
+
+
+class NodeInfo:
+    """
+    Lightweight, read-only replacement of the info dictionary, supporting the same
+    keys ("avail-actions", "behav_remap", "skip-node" and "obs").
+    """
+
+    __slots__ = ("avail_actions", "behav_remap", "skip_node", "obs")
+
+    _keys = {
+        "avail-actions": "avail_actions",
+        "behav_remap": "behav_remap",
+        "skip-node": "skip_node",
+        "obs": "obs",
+    }
+
+    def __init__(self, avail_actions: list, behav_remap: list, skip_node, obs: int):
+        self.avail_actions = avail_actions
+        self.behav_remap = behav_remap
+        self.skip_node = skip_node
+        self.obs = obs
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, self._keys[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self._keys else default
+
+    def keys(self):
+        return self._keys.keys()
+
+    def __repr__(self):
+        return repr({key: self[key] for key in self._keys})
 
 
 class BaseEnv(Env):
@@ -31,6 +72,7 @@ class BaseEnv(Env):
         name: str = None,
         n_actions: int = None,
         reduced_actions: int = None,
+        light_info: bool = False,
     ):
         """
         The core environment used for modeling and in part for displays.
@@ -47,6 +89,9 @@ class BaseEnv(Env):
             Additional information, that should be associated with a node, by default defaultdict(int)
         random_state : Union[int, np.random.Generator], optional
             The random_state associated with the environment, creates a generator, by default 1000
+        light_info : bool, optional
+            If True, reset and step return a ``NodeInfo`` record instead of the node's
+            info dictionary, only possible without rendering, by default False
         """
 
         # It should be possible to use wrapper for one-hot, so no box and other handling necessary (might need an
@@ -80,11 +125,23 @@ class BaseEnv(Env):
 
         self.graph = environment_graph
         self.full_graph, self.skip_nodes = self._unpack_graph(self.graph)
+        self.compiled_graph = None
 
         for ke in self.graph.keys():
             if ke not in self.info_dict.keys():
                 self.info_dict[ke] = {}
 
+        # The available actions of each node, and of nodes replaced by a condition.
+        self._node_info = {
+            node: self._make_node_info(node, edges)
+            for node, edges in self.full_graph.items()
+        }
+        self._condition_node_info = {}
+
+        if light_info and render_mode is not None:
+            raise ValueError("light_info can only be used without rendering.")
+        self.light_info = light_info
+
         self.agent_location = None
 
         self.cumulative_reward = 0
@@ -120,23 +177,54 @@ class BaseEnv(Env):
         dict
             Info dict at current node
         """
-        node_info_dict = self.info_dict[self.agent_location]
-        node_info_dict["skip-node"] = self.skip_nodes[self.agent_location]
+        node_info = self._get_node_info()
 
-        if self.condition is None:
-            avail_actions = list(self.full_graph[self.agent_location].keys())
-        elif self.agent_location in self.condition.keys():
-            avail_actions = list(self.condition[self.agent_location].keys())
-        else:
-            avail_actions = list(self.full_graph[self.agent_location].keys())
+        if self.light_info:
+            return node_info
 
-        node_info_dict["avail-actions"] = [i for i in avail_actions if i is not None]
-        node_info_dict["behav_remap"] = avail_actions
+        node_info_dict = self.info_dict[self.agent_location]
+        node_info_dict["skip-node"] = node_info.skip_node
+        node_info_dict["avail-actions"] = node_info.avail_actions
+        node_info_dict["behav_remap"] = node_info.behav_remap
 
         node_info_dict["obs"] = self.agent_location
 
         return node_info_dict
 
+    def _make_node_info(self, node: int, edges: Dict) -> NodeInfo:
+        behav_remap = list(edges.keys())
+        return NodeInfo(
+            avail_actions=[i for i in behav_remap if i is not None],
+            behav_remap=behav_remap,
+            skip_node=self.skip_nodes.get(node, False),
+            obs=node,
+        )
+
+    def _get_node_info(self) -> NodeInfo:
+        """
+        Returns the cached available actions at the current node. The lists are shared
+        between calls and should not be modified.
+        """
+        location = self.agent_location
+        condition = self.condition
+
+        if condition is None or location not in condition.keys():
+            return self._node_info[location]
+
+        cached = self._condition_node_info.get(id(condition))
+
+        # Keeps a reference to the condition, so that its id cannot be reused.
+        if cached is None or cached[0] is not condition:
+            if len(self._condition_node_info) >= 256:
+                self._condition_node_info.clear()
+            cached = (condition, {})
+            self._condition_node_info[id(condition)] = cached
+
+        if location not in cached[1]:
+            cached[1][location] = self._make_node_info(location, condition[location])
+
+        return cached[1][location]
+
     def reset(
         self, agent_location: int = 0, condition: int = None
     ) -> Tuple[Union[int, np.array], Dict]:
@@ -162,12 +250,15 @@ class BaseEnv(Env):
         else:
             self.agent_location = agent_location
 
+        if self.compiled_graph is not None:
+            node_actions = self.compiled_graph.avail_actions[self.agent_location]
+        else:
+            node_actions = list(self.full_graph[self.agent_location].keys())
+
         if condition is not None:
             self.condition = condition
-        elif self.reduced_actions < len(self.full_graph[self.agent_location]):
-            locs = self.random_state.choice(
-                list(self.full_graph[self.agent_location].keys()), size=self.n_actions
-            )
+        elif self.reduced_actions < len(node_actions):
+            locs = self.random_state.choice(node_actions, size=self.n_actions)
             self.condition = {
                 self.agent_location: {
                     i: self.full_graph[self.agent_location][i] for i in locs
@@ -212,27 +303,23 @@ class BaseEnv(Env):
         """
 
         if self.condition is not None and self.agent_location in self.condition.keys():
-            current_graph = self.condition[self.agent_location]
-
-        else:
-            current_graph = self.full_graph[self.agent_location]
-
-        if action not in current_graph.keys():
-            next_position = self.agent_location
-        elif isinstance(current_graph[action], tuple):
-            stochasticiy = current_graph[action][1]
-
-            if self.random_state.random() <= stochasticiy:
-                next_position = current_graph[action][0][0]
-            else:
-                possible_locs = current_graph[action][0][1:]
-                next_position = self.random_state.choice(possible_locs)
+            next_position = self._transition(
+                self.condition[self.agent_location], action
+            )
+        elif self.compiled_graph is not None:
+            next_position = self.compiled_graph.transition(
+                self.agent_location, action, self.random_state
+            )
         else:
-            next_position = current_graph[action]
+            next_position = self._transition(
+                self.full_graph[self.agent_location], action
+            )
 
         self.agent_location = next_position
 
-        if len(self.graph[next_position]) == 0:
+        if self.compiled_graph is not None:
+            terminated = self.compiled_graph.is_terminal(next_position)
+        elif len(self.graph[next_position]) == 0:
             terminated = True
         else:
             terminated = False
@@ -260,6 +347,74 @@ class BaseEnv(Env):
 
         return observation, self.reward, terminated, False, info
 
+    def _transition(self, current_graph: Dict, action: int = None) -> int:
+        """
+        Finds the next position in the graph, given the edges of the current node.
+
+        Parameters
+        ----------
+        current_graph : Dict
+            The edges of the current node (action: next node).
+        action : int, optional
+            the action made by an agent, by default None
+
+        Returns
+        -------
+        int
+            The next position, the current position if the action is not available.
+        """
+        if action not in current_graph.keys():
+            next_position = self.agent_location
+        elif isinstance(current_graph[action], tuple):
+            stochasticiy = current_graph[action][1]
+
+            if self.random_state.random() <= stochasticiy:
+                next_position = current_graph[action][0][0]
+            else:
+                possible_locs = current_graph[action][0][1:]
+                next_position = self.random_state.choice(possible_locs)
+        else:
+            next_position = current_graph[action]
+
+        return next_position
+
+    def compile(self, compiled_graph: CompiledGraph = None) -> CompiledGraph:
+        """
+        Compiles the environment graph into dense transition tables, which are
+        subsequently used by ``reset`` and ``step``. Conditions passed to ``reset``
+        still take precedence over the compiled tables.
+        The graph should not be changed after compilation.
+
+        Parameters
+        ----------
+        compiled_graph : CompiledGraph, optional
+            An already compiled version of the graph (e.g. loaded from a cache) that
+            is used instead of compiling, by default None
+
+        Returns
+        -------
+        CompiledGraph
+            The compiled representation of the environment graph.
+
+        Raises
+        ------
+        ValueError
+            If the compiled graph does not match the environment graph.
+        """
+        if compiled_graph is None:
+            compiled_graph = CompiledGraph.from_graph(
+                self.graph, self.full_graph, self.skip_nodes, n_actions=self.n_actions
+            )
+        elif compiled_graph.n_states != len(self.full_graph) or any(
+            list(self.full_graph.get(node, {}).keys()) != actions
+            for node, actions in enumerate(compiled_graph.avail_actions)
+        ):
+            raise ValueError("The compiled graph does not match the environment graph.")
+
+        self.compiled_graph = compiled_graph
+
+        return self.compiled_graph
+
     def _render_frame(self, info: Dict):
         """
         Rendering method, not implemented for BaseEnvironment.
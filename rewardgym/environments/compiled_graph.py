@@ -0,0 +1,373 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+_ARRAYS = [
+    "next_state",
+    "stochasticity",
+    "alternatives",
+    "n_alternatives",
+    "terminal",
+    "skip",
+]
+
+
+class CompiledGraph:
+    """
+    Dense array representation of an unpacked environment graph, as produced by
+    ``BaseEnv._unpack_graph``. Nodes have to be the integers ``0 ... n_states - 1``
+    and actions non-negative integers.
+    """
+
+    def __init__(
+        self,
+        next_state: np.ndarray,
+        stochasticity: np.ndarray,
+        alternatives: np.ndarray,
+        n_alternatives: np.ndarray,
+        terminal: np.ndarray,
+        skip: np.ndarray,
+        avail_actions: List[List[int]],
+    ):
+        """
+        Holds the transition tables of an environment graph.
+
+        Parameters
+        ----------
+        next_state : np.ndarray
+            Array of shape (n_states, n_actions), the (primary) successor of each
+            state-action pair, -1 if the action is not available.
+        stochasticity : np.ndarray
+            Array of shape (n_states, n_actions), probability of moving to the
+            primary successor, NaN for deterministic transitions.
+        alternatives : np.ndarray
+            Array of shape (n_states, n_actions, max_successors), all possible
+            successors of a state-action pair (primary first), padded with -1.
+        n_alternatives : np.ndarray
+            Array of shape (n_states, n_actions), number of valid entries in alternatives.
+        terminal : np.ndarray
+            Boolean array of shape (n_states,), True for terminal nodes.
+        skip : np.ndarray
+            Boolean array of shape (n_states,), True for nodes that should be skipped.
+        avail_actions : List[List[int]]
+            The action keys of each node, in the order of the graph.
+        """
+        self.next_state = next_state
+        self.stochasticity = stochasticity
+        self.alternatives = alternatives
+        self.n_alternatives = n_alternatives
+        self.terminal = terminal
+        self.skip = skip
+        self.avail_actions = avail_actions
+
+        self.n_states, self.n_actions = next_state.shape
+        self.first_action = np.array(
+            [
+                next((a for a in actions if a is not None), -1)
+                for actions in avail_actions
+            ],
+            dtype=np.int64,
+        )
+        self.is_stochastic = ~np.isnan(stochasticity)
+        self.action_mask = next_state >= 0
+
+        # Python lists are faster than numpy scalar indexing, when stepping a single environment.
+        self._next_state = next_state.tolist()
+        self._stochasticity = np.where(self.is_stochastic, stochasticity, -1.0).tolist()
+        self._terminal = terminal.tolist()
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: Dict,
+        full_graph: Dict,
+        skip_nodes: Dict,
+        n_actions: int = None,
+    ) -> "CompiledGraph":
+        """
+        Compiles the dictionaries of an environment into transition tables.
+
+        Parameters
+        ----------
+        graph : Dict
+            The original environment graph, used to determine terminal nodes.
+        full_graph : Dict
+            The unpacked environment graph.
+        skip_nodes : Dict
+            Dictionary indicating which nodes should be skipped.
+        n_actions : int, optional
+            Minimum width of the action dimension, by default None
+
+        Returns
+        -------
+        CompiledGraph
+            The compiled graph.
+
+        Raises
+        ------
+        ValueError
+            If nodes are not consecutive integers starting at 0 or actions are not
+            non-negative integers.
+        """
+        n_states = len(full_graph)
+
+        if set(full_graph.keys()) != set(range(n_states)):
+            raise ValueError(
+                "Only graphs with nodes 0 ... n_states - 1 can be compiled."
+            )
+
+        max_action = -1
+        max_successors = 1
+        for node in range(n_states):
+            for action, target in full_graph[node].items():
+                _check_action(action)
+                max_action = max(max_action, action)
+                if isinstance(target, tuple):
+                    max_successors = max(max_successors, len(target[0]))
+
+        width = max_action + 1 if n_actions is None else max(n_actions, max_action + 1)
+
+        next_state = np.full((n_states, width), -1, dtype=np.int64)
+        stochasticity = np.full((n_states, width), np.nan)
+        alternatives = np.full((n_states, width, max_successors), -1, dtype=np.int64)
+        n_alternatives = np.zeros((n_states, width), dtype=np.int64)
+
+        for node in range(n_states):
+            _fill_node(
+                full_graph[node],
+                next_state[node],
+                stochasticity[node],
+                alternatives[node],
+                n_alternatives[node],
+            )
+
+        terminal = np.array([len(graph[node]) == 0 for node in range(n_states)])
+        skip = np.array([bool(skip_nodes[node]) for node in range(n_states)])
+        avail_actions = [list(full_graph[node].keys()) for node in range(n_states)]
+
+        return cls(
+            next_state=next_state,
+            stochasticity=stochasticity,
+            alternatives=alternatives,
+            n_alternatives=n_alternatives,
+            terminal=terminal,
+            skip=skip,
+            avail_actions=avail_actions,
+        )
+
+    def save(self, directory: Union[str, Path]):
+        """
+        Writes the transition tables as .npy files (and the available actions as
+        json) into a directory, see ``CompiledGraph.load``.
+
+        Parameters
+        ----------
+        directory : Union[str, Path]
+            The target directory, created if necessary.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+
+        with open(directory / "avail_actions.json", "w") as f:
+            json.dump(self.avail_actions, f)
+
+    @classmethod
+    def load(
+        cls, directory: Union[str, Path], mmap_mode: Union[str, None] = "r"
+    ) -> "CompiledGraph":
+        """
+        Loads a compiled graph written by ``CompiledGraph.save``.
+
+        Parameters
+        ----------
+        directory : Union[str, Path]
+            Directory of the compiled graph.
+        mmap_mode : Union[str, None], optional
+            Memory map mode of the arrays (see ``np.load``), with the default
+            read-only maps, processes loading the same graph share its memory,
+            by default "r"
+
+        Returns
+        -------
+        CompiledGraph
+            The compiled graph.
+        """
+        directory = Path(directory)
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in _ARRAYS
+        }
+
+        with open(directory / "avail_actions.json", "r") as f:
+            avail_actions = json.load(f)
+
+        return cls(avail_actions=avail_actions, **arrays)
+
+    def with_condition(self, condition: Dict) -> "CompiledGraph":
+        """
+        Creates a copy of the compiled graph, where the nodes that are part of a
+        condition (as passed to ``BaseEnv.reset``) are replaced by the condition's edges.
+
+        Parameters
+        ----------
+        condition : Dict
+            Condition dictionary, mapping nodes to their edges. Keys that are not
+            nodes of the graph (e.g. "reward") are ignored.
+
+        Returns
+        -------
+        CompiledGraph
+            The compiled graph with the condition applied.
+        """
+        next_state = self.next_state.copy()
+        stochasticity = self.stochasticity.copy()
+        alternatives = self.alternatives
+        n_alternatives = self.n_alternatives.copy()
+        avail_actions = [list(actions) for actions in self.avail_actions]
+
+        nodes = [
+            node
+            for node in condition.keys()
+            if isinstance(node, (int, np.integer)) and 0 <= node < self.n_states
+        ]
+
+        max_successors = max(
+            [alternatives.shape[-1]]
+            + [
+                len(target[0])
+                for node in nodes
+                for target in condition[node].values()
+                if isinstance(target, tuple)
+            ]
+        )
+        padded = np.full(alternatives.shape[:2] + (max_successors,), -1, dtype=np.int64)
+        padded[..., : alternatives.shape[-1]] = alternatives
+
+        for node in nodes:
+            node_graph = {k: v for k, v in condition[node].items() if k is not None}
+
+            for action in node_graph.keys():
+                _check_action(action)
+                if action >= self.n_actions:
+                    raise ValueError(
+                        f"Action {action} of node {node} exceeds the compiled action space."
+                    )
+
+            next_state[node] = -1
+            stochasticity[node] = np.nan
+            padded[node] = -1
+            n_alternatives[node] = 0
+
+            _fill_node(
+                node_graph,
+                next_state[node],
+                stochasticity[node],
+                padded[node],
+                n_alternatives[node],
+            )
+            avail_actions[node] = list(condition[node].keys())
+
+        return CompiledGraph(
+            next_state=next_state,
+            stochasticity=stochasticity,
+            alternatives=padded,
+            n_alternatives=n_alternatives,
+            terminal=self.terminal,
+            skip=self.skip,
+            avail_actions=avail_actions,
+        )
+
+    def transition(
+        self, state: int, action: Union[int, None], random_state: np.random.Generator
+    ) -> int:
+        """
+        Moves from state to the next state, following the same rules (and the same
+        consumption of random numbers) as ``BaseEnv.step``.
+
+        Parameters
+        ----------
+        state : int
+            The current location in the graph.
+        action : Union[int, None]
+            The action taken, unavailable actions keep the agent in place.
+        random_state : np.random.Generator
+            Generator used for stochastic transitions.
+
+        Returns
+        -------
+        int
+            The next location in the graph.
+        """
+        if action is None:
+            return state
+
+        try:
+            if action < 0:
+                return state
+            next_position = self._next_state[state][action]
+        except IndexError:
+            return state
+        except (TypeError, ValueError):
+            # Dictionary lookups treat integral floats as their integer key, other
+            # actions that are no index (e.g. strings) are not available.
+            if isinstance(action, (float, np.floating)) and float(action).is_integer():
+                return self.transition(state, int(action), random_state)
+            return state
+
+        if next_position < 0:
+            return state
+
+        stochasticity = self._stochasticity[state][action]
+
+        if stochasticity < 0 or random_state.random() <= stochasticity:
+            return next_position
+
+        return random_state.choice(
+            self.alternatives[state, action, 1 : self.n_alternatives[state, action]]
+        )
+
+    def is_terminal(self, state: int) -> bool:
+        """
+        Returns if a given state is a terminal node.
+
+        Parameters
+        ----------
+        state : int
+            Location in the graph.
+
+        Returns
+        -------
+        bool
+            True if the node has no outgoing edges.
+        """
+        return self._terminal[state]
+
+
+def _check_action(action):
+    if isinstance(action, (bool, np.bool_)) or not isinstance(
+        action, (int, np.integer)
+    ):
+        raise ValueError(f"Only integer actions can be compiled, got {action!r}.")
+    if action < 0:
+        raise ValueError(f"Only non-negative actions can be compiled, got {action}.")
+
+
+def _fill_node(node_graph, next_state, stochasticity, alternatives, n_alternatives):
+    """Writes the edges of a single node into the (row) views of the tables."""
+    for action, target in node_graph.items():
+        if isinstance(target, tuple):
+            successors, prob = target
+            next_state[action] = successors[0]
+            stochasticity[action] = prob
+            alternatives[action, : len(successors)] = successors
+            n_alternatives[action] = len(successors)
+        else:
+            next_state[action] = target
+            stochasticity[action] = np.nan
+            alternatives[action, 0] = target
+            n_alternatives[action] = 1
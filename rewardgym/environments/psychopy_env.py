@@ -11,11 +11,14 @@ except ModuleNotFoundError:
 from typing import Dict, Tuple
 
 from .. import psychopy_render as psrender
-from ..psychopy_render.logger import MinimalLogger
+from ..psychopy_render.logger import ExperimentLogger, MinimalLogger
+from ..psychopy_render.psychopy_display import static_simulation
 from .base_env import BaseEnv
 
 
 class PsychopyEnv(BaseEnv):
+    compile_timeline = False
+
     def __init__(
         self,
         environment_graph: dict,
@@ -64,9 +67,34 @@ class PsychopyEnv(BaseEnv):
         self.is_setup = False
         self.action = False
 
-    def setup(self, window=None, logger=None, expose_last_stim=False):
+    def setup(
+        self, window=None, logger=None, expose_last_stim=False, compile_timeline=True
+    ):
+        """
+        Sets up the stimuli (psychopy) or the simulation (psychopy-simulate).
+
+        Parameters
+        ----------
+        window : Window, optional
+            The psychopy window, by default None
+        logger : ExperimentLogger, optional
+            The logger of the experiment, by default None
+        expose_last_stim : bool, optional
+            If the action stimulus of a node is simulated by the caller (using
+            simulate_action), by default False
+        compile_timeline : bool, optional
+            Only for psychopy-simulate. Stimuli that do not depend on the agent's
+            behavior are grouped per node and logged at once, instead of being
+            simulated one by one, if the logger supports it (log_static_events, e.g.
+            SimulationLogger). The logged events are the same, by default True
+        """
         if self.render_mode == "psychopy-simulate":
-            self._setup_simulation(window, logger, expose_last_stim=expose_last_stim)
+            self._setup_simulation(
+                window,
+                logger,
+                expose_last_stim=expose_last_stim,
+                compile_timeline=compile_timeline,
+            )
         elif self.render_mode == "psychopy":
             self._setup_render(window, logger)
 
@@ -95,9 +123,14 @@ class PsychopyEnv(BaseEnv):
                     if not stim.is_setup
                 ]
 
+        # Uploads all images to the GPU, before the first trial.
+        psrender.get_texture_cache(self.window).preload()
+
         self.is_setup = True
 
-    def _setup_simulation(self, window=None, logger=None, expose_last_stim=False):
+    def _setup_simulation(
+        self, window=None, logger=None, expose_last_stim=False, compile_timeline=True
+    ):
         self.expose_last_stim = expose_last_stim
         self.reaction_time = None
 
@@ -111,8 +144,101 @@ class PsychopyEnv(BaseEnv):
         else:
             self.logger = logger
 
+        # Loggers that change how events are logged, have to log them one by one.
+        self.compile_timeline = (
+            compile_timeline
+            and hasattr(self.logger, "log_static_events")
+            and type(self.logger).log_event is ExperimentLogger.log_event
+        )
+        self._timelines = {}
+
         self.sim_setup = True
 
+    def _get_timeline(self, stimuli: list) -> list:
+        """
+        The compiled timeline of the stimuli of the current node: consecutive
+        stimuli, which do not depend on the agent's behavior, are grouped into one
+        segment, which can be logged at once.
+
+        Parameters
+        ----------
+        stimuli : list
+            The stimuli of the current node.
+
+        Returns
+        -------
+        list
+            List of segments, either ("static", (events, stimuli)), with the name,
+            rl_label and feedback flag of each stimulus as events, or
+            ("simulate", stimulus).
+        """
+        key = tuple(stimuli)
+        cached = self._timelines.get(self.agent_location)
+
+        # The stimuli of a node can be changed (e.g. by plugins).
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        timeline = []
+
+        for disp in stimuli:
+            if disp.entity == "action" and self.expose_last_stim:
+                continue
+
+            kind = static_simulation(disp)
+
+            if kind is None:
+                timeline.append(("simulate", disp))
+                continue
+
+            if not timeline or timeline[-1][0] != "static":
+                timeline.append(("static", ([], [])))
+
+            events, segment = timeline[-1][1]
+            events.append((disp.name, disp.rl_label, kind == "feedback"))
+            segment.append(disp)
+
+        # The events are used as key of the logger's cache.
+        timeline = [
+            (kind, (tuple(seg[0]), seg[1]) if kind == "static" else seg)
+            for kind, seg in timeline
+        ]
+        self._timelines[self.agent_location] = (key, timeline)
+
+        return timeline
+
+    def _simulate_timeline(self, info: dict):
+        """
+        Simulates the stimuli of the current node, using the compiled timeline.
+
+        Parameters
+        ----------
+        info : dict
+            Additional information, that should be associated with a node.
+        """
+        for kind, segment in self._get_timeline(info["psychopy"]):
+            if kind == "static":
+                events, stimuli = segment
+                # Durations are read here, as they can be updated between trials.
+                self.logger.log_static_events(
+                    events,
+                    [disp.duration for disp in stimuli],
+                    reward=self.reward,
+                    total_reward=self.cumulative_reward,
+                )
+            else:
+                segment.simulate(
+                    win=self.window,
+                    logger=self.logger,
+                    condition=self.condition,
+                    total_reward=self.cumulative_reward,
+                    reward=self.reward,
+                    location=self.agent_location,
+                    key=self.previous_action,
+                    rt=self.reaction_time,
+                    info=info,
+                )
+
     def _render_frame(self, info: dict) -> None:
         """
         Renders a "frame", which here means, all the stimuli that are included
@@ -157,19 +283,22 @@ class PsychopyEnv(BaseEnv):
                     "You have to setup the environment first, using env.setup_simulation()"
                 )
 
-            for disp in info["psychopy"]:
-                if disp.entity != "action" or not self.expose_last_stim:
-                    disp.simulate(
-                        win=self.window,
-                        logger=self.logger,
-                        condition=self.condition,
-                        total_reward=self.cumulative_reward,
-                        reward=self.reward,
-                        location=self.agent_location,
-                        key=self.previous_action,
-                        rt=self.reaction_time,
-                        info=info,
-                    )
+            if self.compile_timeline:
+                self._simulate_timeline(info)
+            else:
+                for disp in info["psychopy"]:
+                    if disp.entity != "action" or not self.expose_last_stim:
+                        disp.simulate(
+                            win=self.window,
+                            logger=self.logger,
+                            condition=self.condition,
+                            total_reward=self.cumulative_reward,
+                            reward=self.reward,
+                            location=self.agent_location,
+                            key=self.previous_action,
+                            rt=self.reaction_time,
+                            info=info,
+                        )
 
             if not self.expose_last_stim:
                 self.simulate_action(info, self.previous_action, self.reaction_time)
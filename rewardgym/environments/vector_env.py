@@ -0,0 +1,352 @@
+import copy
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..utils import spawn_seeds
+from .base_env import BaseEnv
+from .compiled_graph import CompiledGraph
+
+
+def _freeze(value):
+    """Hashable representation of (nested) dicts, lists and tuples."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(val)) for key, val in value.items())
+    if isinstance(value, (list, tuple)):
+        # Lists and tuples have a different meaning in the graph.
+        return (type(value).__name__,) + tuple(_freeze(val) for val in value)
+    return value
+
+
+def _condition_key(condition: Dict):
+    """Key of a condition by its content, or by its id if it is not hashable."""
+    key = _freeze(condition)
+
+    try:
+        hash(key)
+    except TypeError:
+        key = ("id", id(condition))
+
+    return key
+
+
+class VectorBaseEnv:
+    """
+    Steps many copies of the same task graph at once, e.g. to simulate whole cohorts
+    of participants. Transitions of all environments are computed with a single
+    set of array operations per step.
+    """
+
+    # Maximum number of cached condition graphs.
+    max_conditions = 256
+
+    def __init__(
+        self,
+        environment_graph: Dict,
+        reward_locations: Union[Dict, List[Dict]],
+        n_envs: int,
+        random_state: Union[int, np.random.Generator, np.random.SeedSequence] = 1000,
+        name: str = None,
+        n_actions: int = None,
+        reduced_actions: int = None,
+        buffer_size: int = 64,
+    ):
+        """
+        Vectorized version of the BaseEnv, without rendering.
+
+        Parameters
+        ----------
+        environment_graph : Dict
+            The main graph showing the association between states and actions.
+        reward_locations : Union[Dict, List[Dict]]
+            Which location in the graph are associated with a reward. If a single
+            dictionary is given, it is copied for each environment and reward objects
+            (having a random_state attribute) are reseeded. A list provides the
+            reward locations of each environment directly.
+        n_envs : int
+            Number of environments.
+        random_state : Union[int, np.random.Generator, np.random.SeedSequence], optional
+            Root seed, from which a separate random stream for each environment's
+            transitions and rewards is spawned, by default 1000
+        name : str, optional
+            Name of the task, by default None
+        n_actions : int, optional
+            Size of the action space, by default None
+        reduced_actions : int, optional
+            As in BaseEnv, if a node has more actions, environments without a
+            condition get a random subset of them on reset, by default None
+        buffer_size : int, optional
+            Number of uniform random numbers drawn per environment at once, by default 64
+        """
+        self.graph = environment_graph
+        self.full_graph, self.skip_nodes = BaseEnv._unpack_graph(environment_graph)
+        self.compiled_graph = CompiledGraph.from_graph(
+            self.graph, self.full_graph, self.skip_nodes, n_actions=n_actions
+        )
+
+        self.n_envs = n_envs
+        self.n_states = self.compiled_graph.n_states
+        self.n_actions = self.compiled_graph.n_actions
+        self.reduced_actions = (
+            self.n_actions if reduced_actions is None else reduced_actions
+        )
+        self.name = name
+        self.buffer_size = buffer_size
+
+        seeds = spawn_seeds(random_state, n_envs)
+        transition_seeds, reward_seeds = zip(*[sd.spawn(2) for sd in seeds])
+        self.random_states = [np.random.default_rng(sd) for sd in transition_seeds]
+
+        if isinstance(reward_locations, dict):
+            self.reward_locations = []
+            generator_ids = {
+                id(rw.random_state)
+                for rw in reward_locations.values()
+                if hasattr(rw, "random_state")
+            }
+            for sd in reward_seeds:
+                reward_rng = np.random.default_rng(sd)
+                # Substitutes the generators during copying, instead of copying them.
+                memo = {ii: reward_rng for ii in generator_ids}
+                self.reward_locations.append(copy.deepcopy(reward_locations, memo))
+        else:
+            if len(reward_locations) != n_envs:
+                raise ValueError(
+                    "Need one reward_locations dictionary per environment."
+                )
+            self.reward_locations = list(reward_locations)
+
+        self._uniforms = np.stack(
+            [rng.random(buffer_size) for rng in self.random_states]
+        )
+        self._buffer_position = np.zeros(n_envs, dtype=np.int64)
+
+        self._clear_conditions()
+        self._stack_graphs()
+
+        self.agent_location = np.zeros(n_envs, dtype=np.int64)
+        self.condition_index = np.zeros(n_envs, dtype=np.int64)
+        self.terminated = np.zeros(n_envs, dtype=bool)
+        self.reward = np.zeros(n_envs)
+        self.cumulative_reward = np.zeros(n_envs)
+
+    def _stack_graphs(self):
+        max_successors = max([gr.alternatives.shape[-1] for gr in self._graphs])
+
+        self._next_state = np.stack([gr.next_state for gr in self._graphs])
+        self._stochasticity = np.stack([gr.stochasticity for gr in self._graphs])
+        self._n_alternatives = np.stack([gr.n_alternatives for gr in self._graphs])
+        self._first_action = np.stack([gr.first_action for gr in self._graphs])
+        self._action_mask = self._next_state >= 0
+        self._alternatives = np.full(
+            self._next_state.shape + (max_successors,), -1, dtype=np.int64
+        )
+        for n, gr in enumerate(self._graphs):
+            self._alternatives[n, ..., : gr.alternatives.shape[-1]] = gr.alternatives
+
+        self._fixed_reward = np.array(self._condition_reward, dtype=float)
+
+    def _clear_conditions(self):
+        self._condition_cache = {}
+        self._condition_reward = [np.nan]
+        self._graphs = [self.compiled_graph]
+
+    def _get_condition_indices(self, conditions: List[Union[Dict, None]]) -> List[int]:
+        """
+        Indices of the compiled graphs of the conditions. Graphs are cached by the
+        content of the conditions, new ones are stacked once per call. If more than
+        max_conditions graphs would be cached, the cache is cleared first, which is
+        safe, as all environments get new conditions on reset.
+        """
+        keys = [None if cond is None else _condition_key(cond) for cond in conditions]
+        new = {
+            key: cond
+            for key, cond in zip(keys, conditions)
+            if key is not None and key not in self._condition_cache
+        }
+
+        if new and len(self._condition_cache) + len(new) > self.max_conditions:
+            self._clear_conditions()
+            new = {key: cond for key, cond in zip(keys, conditions) if key is not None}
+
+        for key, cond in new.items():
+            self._graphs.append(self.compiled_graph.with_condition(cond))
+            self._condition_reward.append(cond.get("reward", np.nan))
+            # Keeps a reference, in case the key contains the id of the condition.
+            self._condition_cache[key] = (len(self._graphs) - 1, cond)
+
+        if new:
+            self._stack_graphs()
+
+        return [0 if key is None else self._condition_cache[key][0] for key in keys]
+
+    def _draw_uniform(self, mask: np.ndarray) -> np.ndarray:
+        """Takes the next uniform number from the streams of the masked environments."""
+        idx = np.flatnonzero(mask)
+        values = self._uniforms[idx, self._buffer_position[idx]]
+        self._buffer_position[idx] += 1
+
+        for ii in idx[self._buffer_position[idx] == self.buffer_size]:
+            self._uniforms[ii] = self.random_states[ii].random(self.buffer_size)
+            self._buffer_position[ii] = 0
+
+        return values
+
+    def _get_info(self) -> Dict:
+        locations = self.agent_location
+        return {
+            "avail-actions": self._action_mask[self.condition_index, locations],
+            "skip-node": self.compiled_graph.skip[locations],
+            "obs": locations.copy(),
+        }
+
+    def _reduce_actions(self, env_index: int) -> Union[Dict, None]:
+        """Random subset of the actions at the start node, drawn as in BaseEnv.reset."""
+        location = int(self.agent_location[env_index])
+        node_actions = self.compiled_graph.avail_actions[location]
+
+        if self.reduced_actions >= len(node_actions):
+            return None
+
+        locs = self.random_states[env_index].choice(node_actions, size=self.n_actions)
+
+        return {location: {i: self.full_graph[location][i] for i in locs}}
+
+    def reset(
+        self,
+        agent_location: Union[int, np.ndarray] = 0,
+        condition: Union[Dict, Sequence[Union[Dict, None]], None] = None,
+    ) -> Tuple[np.ndarray, Dict]:
+        """
+        Resets all environments.
+
+        Parameters
+        ----------
+        agent_location : Union[int, np.ndarray], optional
+            Starting location(s) in the graph, by default 0
+        condition : Union[Dict, Sequence[Union[Dict, None]], None], optional
+            A condition applied to all environments, or one condition (or None)
+            per environment, by default None
+
+        Returns
+        -------
+        Tuple[np.ndarray, Dict]
+            The observations and the info dictionary, containing a boolean mask of
+            available actions with shape (n_envs, n_actions).
+        """
+        self.agent_location[:] = agent_location
+
+        if condition is not None and not isinstance(condition, dict):
+            if len(condition) != self.n_envs:
+                raise ValueError("Need one condition per environment.")
+            conditions = list(condition)
+        elif condition is None and self.reduced_actions < self.n_actions:
+            conditions = [None] * self.n_envs
+        else:
+            conditions = None
+            self.condition_index[:] = self._get_condition_indices([condition])[0]
+
+        if conditions is not None:
+            conditions = [
+                self._reduce_actions(ii) if cond is None else cond
+                for ii, cond in enumerate(conditions)
+            ]
+            self.condition_index[:] = self._get_condition_indices(conditions)
+
+        self.terminated[:] = False
+        self.reward[:] = 0
+
+        skip = self.compiled_graph.skip[self.agent_location]
+
+        if skip.any():
+            actions = self._first_action[self.condition_index, self.agent_location]
+            observation, _, _, _, info = self.step(np.where(skip, actions, -1))
+        else:
+            observation, info = self.agent_location.copy(), self._get_info()
+
+        return observation, info
+
+    def step(
+        self, actions: np.ndarray, step_reward: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Steps all environments. Environments that already terminated are not moved
+        until the next reset.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            One action per environment. Negative values are treated as no action.
+        step_reward : bool, optional
+            If True calls all reward objects, not only the selected one, by default False
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]
+            Observations, rewards, terminated flags, truncated flags and info.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        locations = self.agent_location
+        cond = self.condition_index
+
+        valid = ~self.terminated & (actions >= 0) & (actions < self.n_actions)
+        act = np.where(valid, actions, 0)
+
+        next_position = self._next_state[cond, locations, act]
+        valid &= next_position >= 0
+
+        stochasticity = self._stochasticity[cond, locations, act]
+        stochastic = valid & ~np.isnan(stochasticity)
+
+        if stochastic.any():
+            branch = np.zeros(self.n_envs, dtype=bool)
+            branch[stochastic] = (
+                self._draw_uniform(stochastic) > stochasticity[stochastic]
+            )
+
+            if branch.any():
+                n_alternatives = self._n_alternatives[cond, locations, act][branch]
+                pick = 1 + (self._draw_uniform(branch) * (n_alternatives - 1)).astype(
+                    np.int64
+                )
+                next_position[branch] = self._alternatives[
+                    cond[branch], locations[branch], act[branch], pick
+                ]
+
+        self.agent_location = np.where(valid, next_position, locations)
+
+        terminated = (
+            ~self.terminated & self.compiled_graph.terminal[self.agent_location]
+        )
+        self.reward = np.zeros(self.n_envs)
+
+        for ii in np.flatnonzero(terminated):
+            self.reward[ii] = self._get_reward(ii, step_reward)
+
+        self.terminated |= terminated
+        self.cumulative_reward += self.reward
+
+        return (
+            self.agent_location.copy(),
+            self.reward.copy(),
+            self.terminated.copy(),
+            np.zeros(self.n_envs, dtype=bool),
+            self._get_info(),
+        )
+
+    def _get_reward(self, env_index: int, step_reward: bool = False) -> float:
+        location = self.agent_location[env_index]
+        fixed_reward = self._fixed_reward[self.condition_index[env_index]]
+        rewards = self.reward_locations[env_index]
+
+        if not np.isnan(fixed_reward):
+            reward = fixed_reward
+        else:
+            reward = rewards[location]()
+
+        if step_reward:
+            for rw in rewards.keys():
+                if location != rw:
+                    rewards[rw]()
+
+        return reward
@@ -0,0 +1,15 @@
+from .fit import (
+    fit_dataset,
+    fit_participant,
+    load_participant_data,
+)
+from .likelihood import log_likelihood, negative_log_likelihood, prepare_fitting_data
+
+__all__ = [
+    "fit_dataset",
+    "fit_participant",
+    "load_participant_data",
+    "log_likelihood",
+    "negative_log_likelihood",
+    "prepare_fitting_data",
+]
@@ -0,0 +1,272 @@
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+from ..handling.bids import find_bids_files, read_bids_file
+from ..handling.data_tools import prepare_data_for_rl
+from ..utils import check_random_state
+from .likelihood import negative_log_likelihood, prepare_fitting_data
+
+
+def fit_participant(
+    data: Union[pd.DataFrame, Dict],
+    agent: type,
+    bounds: Dict[str, Tuple[float, float]],
+    n_starts: int = 5,
+    n_screen: int = 200,
+    state_space: int = None,
+    action_space: int = None,
+    seed: Union[int, np.random.Generator] = 1000,
+    agent_kwargs: Dict = None,
+) -> Dict:
+    """
+    Maximum likelihood fit of an agent to the data of a single participant.
+
+    Random starting points are first screened with a single vectorized likelihood
+    evaluation, the best ``n_starts`` of them are then refined with L-BFGS-B. The
+    finite difference gradient is evaluated in the same replay as the function value.
+
+    Parameters
+    ----------
+    data : Union[pd.DataFrame, Dict]
+        Output of ``prepare_data_for_rl`` or ``prepare_fitting_data``.
+    agent : type
+        The agent class to fit, see ``log_likelihood``.
+    bounds : Dict[str, Tuple[float, float]]
+        Lower and upper bound of each fitted parameter (keyword argument of the agent).
+    n_starts : int, optional
+        Number of local optimizations, by default 5
+    n_screen : int, optional
+        Number of random parameter sets the starting points are chosen from, by default 200
+    state_space : int, optional
+        Number of states, if None inferred from the data, by default None
+    action_space : int, optional
+        Number of actions, if None inferred from the data, by default None
+    seed : Union[int, np.random.Generator], optional
+        Seed or random number generator for the starting points, by default 1000
+    agent_kwargs : Dict, optional
+        Further (fixed) keyword arguments of the agent, by default None
+
+    Returns
+    -------
+    Dict
+        The fitted parameters, negative log-likelihood, AIC, BIC, number of choices and
+        whether the best optimization converged.
+    """
+    data = prepare_fitting_data(data)
+    agent_kwargs = {} if agent_kwargs is None else agent_kwargs
+    rng = check_random_state(seed)
+
+    names = list(bounds.keys())
+    lower, upper = np.array([bounds[nm] for nm in names], dtype=float).T
+
+    def _nll(parameters):
+        return negative_log_likelihood(
+            data,
+            agent,
+            dict(zip(names, parameters)),
+            state_space=state_space,
+            action_space=action_space,
+            **agent_kwargs,
+        )
+
+    candidates = lower + rng.random((max(n_screen, n_starts), len(names))) * (
+        upper - lower
+    )
+    screen_nll = _nll(candidates.T)
+    starts = candidates[np.argsort(screen_nll, kind="stable")[:n_starts]]
+
+    def _nll_and_grad(x):
+        # Function value and finite difference gradient in one vectorized replay.
+        step = 1e-7 * np.maximum(1, np.abs(x))
+        step = np.where(x + step > upper, -step, step)
+        points = x[:, None] + np.diag(step)
+        nll = _nll(np.concatenate([x[:, None], points], axis=1))
+        return nll[0], (nll[1:] - nll[0]) / step
+
+    best = None
+    for x0 in starts:
+        result = minimize(
+            _nll_and_grad,
+            x0,
+            jac=True,
+            method="L-BFGS-B",
+            bounds=list(zip(lower, upper)),
+        )
+        if best is None or result.fun < best.fun:
+            best = result
+
+    n_choices = int(np.sum(data["scored"]))
+    nll = float(best.fun)
+
+    fit = {nm: float(val) for nm, val in zip(names, best.x)}
+    fit.update(
+        {
+            "nll": nll,
+            "aic": 2 * nll + 2 * len(names),
+            "bic": 2 * nll + len(names) * np.log(max(n_choices, 1)),
+            "n_choices": n_choices,
+            "converged": bool(best.success),
+        }
+    )
+
+    return fit
+
+
+def _run_order(entities: Dict) -> Tuple:
+    """Sort key of a file, by its session and run, comparing numbers as integers."""
+    return tuple(
+        (-1, 0, "")
+        if value is None
+        else ((0, int(value), "") if value.isdigit() else (1, 0, value))
+        for value in (entities["session"], entities["run"])
+    )
+
+
+def load_participant_data(
+    paths: List[Union[str, pathlib.Path]], prepare_kwargs: Dict = None
+) -> pd.DataFrame:
+    """
+    Prepares the files (runs) of a participant for fitting and concatenates them.
+    The trials are numbered consecutively over the files, so that the last trial of
+    each file is terminal.
+
+    Parameters
+    ----------
+    paths : List[Union[str, pathlib.Path]]
+        The behavioral files, in the order of the runs.
+    prepare_kwargs : Dict, optional
+        Keyword arguments for ``prepare_data``, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        The concatenated output of ``prepare_data_for_rl``.
+    """
+    prepare_kwargs = {} if prepare_kwargs is None else prepare_kwargs
+
+    rl_data = []
+    for path in paths:
+        # Typed as in BidsDataset, instead of inferring the types of each file.
+        data = read_bids_file(path, prepare_kwargs=prepare_kwargs)
+        rl_data.append(prepare_data_for_rl(data))
+
+    rl_data = pd.concat(rl_data, keys=range(len(rl_data)), names=["file", None])
+    rl_data["trial"] = rl_data.groupby(["file", "trial"], sort=False).ngroup()
+
+    return rl_data.reset_index(drop=True)
+
+
+def _fit_participant_files(
+    paths: List[pathlib.Path],
+    agent: type,
+    bounds: Dict[str, Tuple[float, float]],
+    prepare_kwargs: Dict,
+    fit_kwargs: Dict,
+    seed: np.random.SeedSequence,
+) -> Dict:
+    rl_data = load_participant_data(paths, prepare_kwargs)
+
+    return fit_participant(
+        rl_data, agent, bounds, seed=np.random.default_rng(seed), **fit_kwargs
+    )
+
+
+def fit_dataset(
+    directory: Union[str, pathlib.Path],
+    agent: type,
+    bounds: Dict[str, Tuple[float, float]],
+    n_workers: int = None,
+    output: Union[str, pathlib.Path] = None,
+    task: Union[str, List[str]] = None,
+    suffixes: Tuple[str, ...] = ("beh",),
+    by_session: bool = False,
+    seed: int = 1000,
+    prepare_kwargs: Dict = None,
+    **fit_kwargs,
+) -> pd.DataFrame:
+    """
+    Fits an agent to every participant of a directory, one participant per worker
+    process. All files (runs) of a participant and task are fitted together, in the
+    order of their sessions and runs, with the agent's values carried over from one
+    run to the next.
+
+    Parameters
+    ----------
+    directory : Union[str, pathlib.Path]
+        Root directory of the dataset, searched recursively for files following the
+        ``make_bids_name`` convention.
+    agent : type
+        The agent class to fit, see ``log_likelihood``.
+    bounds : Dict[str, Tuple[float, float]]
+        Lower and upper bound of each fitted parameter.
+    n_workers : int, optional
+        Number of processes, if 1 everything runs in the current process, if None
+        one process per CPU is used, by default None
+    output : Union[str, pathlib.Path], optional
+        If given, the summary table is written to this tsv file, by default None
+    task : Union[str, List[str]], optional
+        Task(s) to fit, see ``find_bids_files``. Each task of a participant is
+        fitted separately, by default None (all)
+    suffixes : Tuple[str, ...], optional
+        Suffixes of the files, see ``find_bids_files``, by default ("beh",)
+    by_session : bool, optional
+        If True, each session of a participant is fitted separately, by default False
+    seed : int, optional
+        Root seed, every participant gets its own spawned seed, by default 1000
+    prepare_kwargs : Dict, optional
+        Keyword arguments for ``prepare_data``, by default None
+    fit_kwargs :
+        Further keyword arguments of ``fit_participant``, e.g. n_starts or agent_kwargs.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per participant, task (and session), with the participant id, task,
+        the fitted files, fitted parameters and fit statistics.
+    """
+    groups = {}
+    for path, entities in find_bids_files(directory, task=task, suffixes=suffixes):
+        key = (
+            entities["participant_id"],
+            entities["task"],
+            entities["session"] if by_session else None,
+        )
+        groups.setdefault(key, []).append((_run_order(entities), path))
+
+    # Paths sort run-10 before run-2.
+    groups = {key: [path for _, path in sorted(runs)] for key, runs in groups.items()}
+
+    seeds = np.random.SeedSequence(seed).spawn(len(groups))
+
+    arguments = [
+        (paths, agent, bounds, prepare_kwargs, fit_kwargs, sd)
+        for paths, sd in zip(groups.values(), seeds)
+    ]
+
+    if n_workers == 1 or len(groups) == 0:
+        results = [_fit_participant_files(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_fit_participant_files, *zip(*arguments)))
+
+    summary = []
+    for (participant, task_name, session), paths, fit in zip(
+        groups, groups.values(), results
+    ):
+        keys = {"participant_id": participant, "task": task_name}
+        if by_session:
+            keys["session"] = session
+        keys["files"] = ",".join(path.name for path in paths)
+        summary.append({**keys, **fit})
+
+    summary = pd.DataFrame(summary)
+
+    if output is not None:
+        summary.to_csv(output, sep="\t", index=False, na_rep="n/a")
+
+    return summary
@@ -0,0 +1,191 @@
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from ..agents import base_agent, modelbased_agents, population_agents
+
+AGENT_POPULATIONS = {
+    base_agent.QAgent: population_agents.QAgentPopulation,
+    base_agent.ValenceQAgent: population_agents.ValenceQAgentPopulation,
+    base_agent.QAgent_eligibility: population_agents.QAgentPopulation_eligibility,
+    base_agent.ValenceQAgent_eligibility: population_agents.ValenceQAgentPopulation_eligibility,
+    modelbased_agents.HybridAgent: population_agents.HybridAgentPopulation,
+    modelbased_agents.ValenceHybridAgent: population_agents.ValenceHybridAgentPopulation,
+}
+
+
+def prepare_fitting_data(data: Union[pd.DataFrame, Dict]) -> Dict[str, np.ndarray]:
+    """
+    Converts the output of ``prepare_data_for_rl`` into plain arrays, so that
+    repeated likelihood evaluations (e.g. during optimization) skip the conversion.
+
+    Parameters
+    ----------
+    data : Union[pd.DataFrame, Dict]
+        Table with (at least) the columns obs0, action, reward and obs1. If a trial
+        column is present, the last row of each trial is treated as terminal.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        The arrays obs0, action, reward, obs1 (-1 where missing), terminated, scored
+        (rows with a recorded action) and learn (scored rows with a reward).
+    """
+    if isinstance(data, dict) and "scored" in data:
+        return data
+
+    data = pd.DataFrame(data)
+
+    def _column(name):
+        return pd.to_numeric(data[name], errors="coerce").to_numpy(dtype=float)
+
+    obs0 = _column("obs0")
+    action = _column("action")
+    reward = _column("reward")
+    obs1 = _column("obs1")
+
+    terminated = np.isnan(obs1)
+
+    if "trial" in data.columns:
+        trial = data["trial"].to_numpy()
+        terminated[:-1] |= trial[1:] != trial[:-1]
+
+    if len(terminated) > 0:
+        terminated[-1] = True
+
+    scored = ~np.isnan(obs0) & ~np.isnan(action)
+
+    return {
+        "obs0": np.where(scored, obs0, 0).astype(np.int64),
+        "action": np.where(scored, action, 0).astype(np.int64),
+        "reward": np.where(np.isnan(reward), 0, reward),
+        "obs1": np.where(np.isnan(obs1), -1, obs1).astype(np.int64),
+        "terminated": terminated,
+        "scored": scored,
+        "learn": scored & ~np.isnan(reward),
+    }
+
+
+def log_likelihood(
+    data: Union[pd.DataFrame, Dict],
+    agent: type,
+    parameters: Dict[str, Union[float, np.ndarray]],
+    state_space: int = None,
+    action_space: int = None,
+    avail_actions: np.ndarray = None,
+    **agent_kwargs,
+) -> np.ndarray:
+    """
+    Log-likelihood of recorded choices under an agent, for many parameter sets at once.
+    The data is replayed once, with one agent of a population per parameter set.
+
+    Parameters
+    ----------
+    data : Union[pd.DataFrame, Dict]
+        Output of ``prepare_data_for_rl`` or ``prepare_fitting_data``.
+    agent : type
+        The agent class, either a single agent (e.g. ``ValenceQAgent``) or one of the
+        population agents.
+    parameters : Dict[str, Union[float, np.ndarray]]
+        Keyword arguments of the agent that are fitted, each either a scalar or an
+        array with one value per parameter set.
+    state_space : int, optional
+        Number of states, if None inferred from the data, by default None
+    action_space : int, optional
+        Number of actions, if None inferred from the data, by default None
+    avail_actions : np.ndarray, optional
+        Boolean array of shape (n_rows, n_actions), the actions available in each row,
+        if None all actions are available, by default None
+    agent_kwargs :
+        Further (fixed) keyword arguments of the agent, e.g. the graph of a hybrid agent.
+
+    Returns
+    -------
+    np.ndarray
+        The log-likelihood of each parameter set.
+
+    Raises
+    ------
+    ValueError
+        If no population implementation exists for the agent.
+    """
+    data = prepare_fitting_data(data)
+
+    population_class = AGENT_POPULATIONS.get(agent, agent)
+
+    if not issubclass(population_class, population_agents.ValenceQAgentPopulation):
+        raise ValueError(f"No vectorized likelihood available for {agent}.")
+
+    if state_space is None:
+        state_space = int(max(data["obs0"].max(initial=0), data["obs1"].max(initial=0)))
+        state_space += 1
+
+    if action_space is None:
+        action_space = int(data["action"].max(initial=0)) + 1
+
+    population = population_class(
+        **parameters,
+        action_space=action_space,
+        state_space=state_space,
+        **agent_kwargs,
+    )
+
+    agents = np.arange(population.n_agents)
+    log_lik = np.zeros(population.n_agents)
+
+    obs0 = data["obs0"].tolist()
+    action = data["action"].tolist()
+    reward = data["reward"].tolist()
+    obs1 = data["obs1"].tolist()
+    terminated = data["terminated"].tolist()
+    scored = data["scored"].tolist()
+    learn = data["learn"].tolist()
+
+    for tt in range(len(obs0)):
+        if not scored[tt]:
+            continue
+
+        if avail_actions is not None:
+            mask = np.broadcast_to(
+                avail_actions[tt], (population.n_agents, action_space)
+            )
+        else:
+            mask = None
+
+        log_lik += population.get_log_probs(obs0[tt], mask)[agents, action[tt]]
+
+        if learn[tt]:
+            population.update(
+                obs0[tt], action[tt], reward[tt], terminated[tt], obs1[tt]
+            )
+
+    return log_lik
+
+
+def negative_log_likelihood(
+    data: Union[pd.DataFrame, Dict],
+    agent: type,
+    parameters: Dict[str, Union[float, np.ndarray]],
+    state_space: int = None,
+    action_space: int = None,
+    avail_actions: np.ndarray = None,
+    **agent_kwargs,
+) -> np.ndarray:
+    """
+    Negative log-likelihood of recorded choices, see ``log_likelihood``.
+
+    Returns
+    -------
+    np.ndarray
+        The negative log-likelihood of each parameter set.
+    """
+    return -log_likelihood(
+        data,
+        agent,
+        parameters,
+        state_space=state_space,
+        action_space=action_space,
+        avail_actions=avail_actions,
+        **agent_kwargs,
+    )
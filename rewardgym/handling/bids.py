@@ -0,0 +1,376 @@
+import pathlib
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Union
+
+import pandas as pd
+
+from .data_tools import prepare_data
+
+# Entities of the file names created by runner.make_bids_name, in their order.
+BIDS_ENTITIES = {
+    "sub": "participant_id",
+    "ses": "session",
+    "task": "task",
+    "acq": "acquisition",
+    "run": "run",
+}
+
+_BIDS_NAME = re.compile(
+    r"^sub-(?P<sub>[a-zA-Z0-9]+)"
+    r"(?:_ses-(?P<ses>[a-zA-Z0-9]+))?"
+    r"(?:_task-(?P<task>[a-zA-Z0-9]+))?"
+    r"(?:_acq-(?P<acq>[a-zA-Z0-9]+))?"
+    r"(?:_run-(?P<run>[a-zA-Z0-9]+))?"
+    r"_(?P<suffix>[a-zA-Z0-9]+)\.tsv$"
+)
+
+# Columns of the logger's files needed by prepare_data and prepare_data_for_rl.
+DEFAULT_COLUMNS = [
+    "onset",
+    "duration",
+    "trial_type",
+    "event_type",
+    "response_time",
+    "response_button",
+    "action",
+    "reward",
+    "trial",
+    "current_location",
+    "start_position",
+    "rl_label",
+]
+
+# Data types of the logger's columns, so that they do not need to be inferred.
+DEFAULT_DTYPES = {
+    "onset": float,
+    "duration": float,
+    "trial_type": str,
+    "event_type": str,
+    "response_time": float,
+    "response_button": str,
+    "response_late": str,
+    "action": pd.Int64Dtype(),
+    "reward": float,
+    "trial": pd.Int64Dtype(),
+    "current_location": pd.Int64Dtype(),
+    "trial_time": float,
+    "total_reward": float,
+    "avail_actions": str,
+    "misc": str,
+    "TR": pd.Int64Dtype(),
+    "expected_duration": float,
+    "start_position": pd.Int64Dtype(),
+    "task": str,
+    "run": str,
+    "participant_id": str,
+    "rl_label": str,
+}
+
+NA_VALUES = ["n/a", "None", ""]
+
+
+def parse_bids_name(file_name: Union[str, pathlib.Path]) -> Union[Dict, None]:
+    """
+    Splits a file name created by make_bids_name into its entities.
+
+    Parameters
+    ----------
+    file_name : Union[str, pathlib.Path]
+        Name or path of the file, e.g. "sub-01_ses-1_task-mid_run-1_beh.tsv".
+
+    Returns
+    -------
+    Union[Dict, None]
+        The participant_id, session, task, acquisition, run (None if not part of
+        the name) and suffix (e.g. "beh"), or None if the name does not follow the
+        convention.
+    """
+    match = _BIDS_NAME.match(pathlib.Path(file_name).name)
+
+    if match is None:
+        return None
+
+    entities = {key: match.group(ent) for ent, key in BIDS_ENTITIES.items()}
+    entities["suffix"] = match.group("suffix")
+
+    return entities
+
+
+def _as_set(value) -> Union[set, None]:
+    if value is None:
+        return None
+    if isinstance(value, (str, int)):
+        value = [value]
+    return {str(vv) for vv in value}
+
+
+def find_bids_files(
+    directory: Union[str, pathlib.Path],
+    participant_id: Union[str, List[str]] = None,
+    session: Union[str, List[str]] = None,
+    task: Union[str, List[str]] = None,
+    run: Union[int, str, List] = None,
+    suffixes: Tuple[str, ...] = ("beh",),
+) -> List[Tuple[pathlib.Path, Dict]]:
+    """
+    Recursively collects the tsv files of a directory that follow the make_bids_name
+    convention, optionally selecting participants, sessions, tasks and runs.
+
+    Parameters
+    ----------
+    directory : Union[str, pathlib.Path]
+        Root directory of the dataset.
+    participant_id : Union[str, List[str]], optional
+        Participant(s) to select, by default None (all)
+    session : Union[str, List[str]], optional
+        Session(s) to select, by default None (all)
+    task : Union[str, List[str]], optional
+        Task(s) to select, dashes are removed as in make_bids_name, by default None
+        (all)
+    run : Union[int, str, List], optional
+        Run(s) to select, by default None (all)
+    suffixes : Tuple[str, ...], optional
+        Suffixes of the files, by default ("beh",). The events files written next
+        to the behavioral files contain the same runs, so selecting both suffixes
+        reads each run twice.
+
+    Returns
+    -------
+    List[Tuple[pathlib.Path, Dict]]
+        The files, sorted by path, and their entities (see parse_bids_name).
+    """
+    if task is not None:
+        task = [
+            tt.replace("-", "") for tt in ([task] if isinstance(task, str) else task)
+        ]
+
+    selection = {
+        "participant_id": _as_set(participant_id),
+        "session": _as_set(session),
+        "task": _as_set(task),
+        "run": _as_set(run),
+        "suffix": _as_set(suffixes),
+    }
+
+    files = []
+    for path in sorted(pathlib.Path(directory).rglob("sub-*.tsv")):
+        entities = parse_bids_name(path)
+
+        if entities is not None and all(
+            values is None or entities[key] in values
+            for key, values in selection.items()
+        ):
+            files.append((path, entities))
+
+    return files
+
+
+def read_bids_file(
+    path: Union[str, pathlib.Path],
+    columns: List[str] = DEFAULT_COLUMNS,
+    dtype: Dict = None,
+    prepare_kwargs: Dict = None,
+) -> pd.DataFrame:
+    """
+    Reads a single behavioral file, only parsing the given columns, with the data
+    types of the logger's columns.
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Path to the tsv file.
+    columns : List[str], optional
+        Columns to read, columns that are not in the file are skipped. All columns
+        are read if None, by default DEFAULT_COLUMNS
+    dtype : Dict, optional
+        Data types, updating DEFAULT_DTYPES, by default None
+    prepare_kwargs : Dict, optional
+        If given, the data is passed through prepare_data with these keyword
+        arguments, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        The data of the file.
+    """
+    dtypes = DEFAULT_DTYPES if dtype is None else {**DEFAULT_DTYPES, **dtype}
+
+    if columns is None:
+        usecols = None
+    else:
+        columns = set(columns)
+        usecols = columns.__contains__
+
+    data = pd.read_csv(
+        path,
+        sep="\t",
+        usecols=usecols,
+        dtype=dtypes,
+        na_values=NA_VALUES,
+        keep_default_na=False,
+    )
+
+    if prepare_kwargs is not None:
+        data, _ = prepare_data(data, **prepare_kwargs)
+
+    return data
+
+
+def _read_with_keys(path, entities, columns, dtype, prepare_kwargs):
+    data = read_bids_file(path, columns, dtype, prepare_kwargs)
+
+    # The keys of the file name replace the logged ones.
+    for ent, key in BIDS_ENTITIES.items():
+        data[key] = entities[key]
+
+    return data
+
+
+def iter_bids_dataset(
+    directory: Union[str, pathlib.Path],
+    participant_id: Union[str, List[str]] = None,
+    session: Union[str, List[str]] = None,
+    task: Union[str, List[str]] = None,
+    run: Union[int, str, List] = None,
+    suffixes: Tuple[str, ...] = ("beh",),
+    columns: List[str] = DEFAULT_COLUMNS,
+    dtype: Dict = None,
+    prepare_kwargs: Dict = None,
+    n_workers: int = 4,
+) -> Iterator[Tuple[Dict, pd.DataFrame]]:
+    """
+    Reads the files of a dataset (see find_bids_files) in a thread pool and yields
+    them one by one in the order of their paths. At most twice n_workers files are
+    read ahead, so that large datasets do not need to fit into memory.
+
+    Parameters
+    ----------
+    directory : Union[str, pathlib.Path]
+        Root directory of the dataset.
+    participant_id : Union[str, List[str]], optional
+        Participant(s) to select, by default None (all)
+    session : Union[str, List[str]], optional
+        Session(s) to select, by default None (all)
+    task : Union[str, List[str]], optional
+        Task(s) to select, by default None (all)
+    run : Union[int, str, List], optional
+        Run(s) to select, by default None (all)
+    suffixes : Tuple[str, ...], optional
+        Suffixes of the files, see find_bids_files, by default ("beh",)
+    columns : List[str], optional
+        Columns to read, see read_bids_file, by default DEFAULT_COLUMNS
+    dtype : Dict, optional
+        Data types, updating DEFAULT_DTYPES, by default None
+    prepare_kwargs : Dict, optional
+        If given, each file is passed through prepare_data with these keyword
+        arguments, by default None
+    n_workers : int, optional
+        Number of threads, if 1 the files are read in the current thread,
+        by default 4
+
+    Yields
+    ------
+    Iterator[Tuple[Dict, pd.DataFrame]]
+        The entities of the file (see parse_bids_name) and its data, with the
+        columns participant_id, session, task, acquisition and run taken from the
+        file name.
+    """
+    files = find_bids_files(directory, participant_id, session, task, run, suffixes)
+
+    if n_workers == 1:
+        for path, entities in files:
+            yield (
+                entities,
+                _read_with_keys(path, entities, columns, dtype, prepare_kwargs),
+            )
+        return
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        pending = deque()
+
+        for path, entities in files:
+            pending.append(
+                (
+                    entities,
+                    executor.submit(
+                        _read_with_keys, path, entities, columns, dtype, prepare_kwargs
+                    ),
+                )
+            )
+
+            if len(pending) >= 2 * n_workers:
+                entities, future = pending.popleft()
+                yield entities, future.result()
+
+        while pending:
+            entities, future = pending.popleft()
+            yield entities, future.result()
+
+
+def load_bids_dataset(
+    directory: Union[str, pathlib.Path],
+    participant_id: Union[str, List[str]] = None,
+    session: Union[str, List[str]] = None,
+    task: Union[str, List[str]] = None,
+    run: Union[int, str, List] = None,
+    suffixes: Tuple[str, ...] = ("beh",),
+    columns: List[str] = DEFAULT_COLUMNS,
+    dtype: Dict = None,
+    prepare_kwargs: Dict = None,
+    n_workers: int = 4,
+) -> pd.DataFrame:
+    """
+    Reads the files of a dataset (see iter_bids_dataset) and concatenates them.
+
+    Parameters
+    ----------
+    directory : Union[str, pathlib.Path]
+        Root directory of the dataset.
+    participant_id : Union[str, List[str]], optional
+        Participant(s) to select, by default None (all)
+    session : Union[str, List[str]], optional
+        Session(s) to select, by default None (all)
+    task : Union[str, List[str]], optional
+        Task(s) to select, by default None (all)
+    run : Union[int, str, List], optional
+        Run(s) to select, by default None (all)
+    suffixes : Tuple[str, ...], optional
+        Suffixes of the files, see find_bids_files, by default ("beh",)
+    columns : List[str], optional
+        Columns to read, see read_bids_file, by default DEFAULT_COLUMNS
+    dtype : Dict, optional
+        Data types, updating DEFAULT_DTYPES, by default None
+    prepare_kwargs : Dict, optional
+        If given, each file is passed through prepare_data with these keyword
+        arguments, by default None
+    n_workers : int, optional
+        Number of threads, by default 4
+
+    Returns
+    -------
+    pd.DataFrame
+        The data of all files, with the columns participant_id, session, task,
+        acquisition and run identifying the file.
+    """
+    frames = [
+        data
+        for _, data in iter_bids_dataset(
+            directory,
+            participant_id=participant_id,
+            session=session,
+            task=task,
+            run=run,
+            suffixes=suffixes,
+            columns=columns,
+            dtype=dtype,
+            prepare_kwargs=prepare_kwargs,
+            n_workers=n_workers,
+        )
+    ]
+
+    if not frames:
+        return pd.DataFrame(columns=list(BIDS_ENTITIES.values()))
+
+    return pd.concat(frames, ignore_index=True)
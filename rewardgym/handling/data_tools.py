@@ -129,21 +129,122 @@ def process_trial_for_rl(trial_id: int, trial_df: pd.DataFrame) -> list:
     return tuples
 
 
+_RL_COLUMNS = ["obs0", "action", "reward", "obs1", "reaction_time", "trial"]
+
+_is_none = np.frompyfunc(lambda value: value is None, 1, 1)
+
+
+def _rl_event_positions(df: pd.DataFrame, label: str) -> pd.Series:
+    """Row positions of the events with rl_label == label, indexed by trial and
+    the count of the event within its trial."""
+    mask = (df["rl_label"] == label).to_numpy(dtype=bool)
+    events = pd.DataFrame(
+        {"trial": df["trial"].to_numpy()[mask], "position": np.flatnonzero(mask)}
+    )
+    events["k"] = events.groupby("trial").cumcount()
+
+    return events.set_index(["trial", "k"])["position"]
+
+
 def prepare_data_for_rl(df: pd.DataFrame) -> pd.DataFrame:
     """
     Convert raw event dataframe into structured obs→action→reward→obs1 sequences.
+
+    The k-th tuple of a trial is built from the k-th action and reward and the k-th
+    and (k + 1)-th obs of the trial, using their counts within the trial instead of
+    iterating over the rows. This is the same as process_trial_for_rl, as long as
+    the events of each tuple come after the events closing the previous tuple.
+    Trials where this is not the case (e.g. additional obs between two actions, or
+    missing values) are processed with process_trial_for_rl.
     """
-    # Step 1: Sort and reset
-    df = df.sort_values(["trial", "onset"]).reset_index(drop=True).copy()
+    df = df[df["trial"].notna()].sort_values(["trial", "onset"])
+    df = df.reset_index(drop=True)
+
+    obs = _rl_event_positions(df, "obs")
+    table = pd.concat(
+        {
+            "obs0": obs,
+            "obs1": obs.groupby(level="trial").shift(-1),
+            "action": _rl_event_positions(df, "action"),
+            "reward": _rl_event_positions(df, "reward"),
+        },
+        axis=1,
+    ).sort_index()
+
+    positions = table.to_numpy(dtype=float)
+    exists = ~np.isnan(positions)
+    k = table.index.get_level_values("k").to_numpy()
+    trials = table.index.get_level_values("trial")
+
+    complete = exists[:, 1:].all(axis=1)
+    closed = pd.Series(
+        np.where(complete, positions[:, 1:].max(axis=1), np.nan), index=table.index
+    )
+    previous_closed = closed.groupby(level="trial").shift(1).fillna(-1).to_numpy()
+    n_complete = (
+        pd.Series(complete, index=table.index)
+        .groupby(level="trial")
+        .transform("sum")
+        .to_numpy()
+    )
 
-    # Step 2: Process trials
-    all_tuples = []
-    for trial_id, trial_df in df.groupby("trial"):
-        all_tuples.extend(process_trial_for_rl(trial_id, trial_df))
+    # Tuples whose events occur before the previous tuple is closed, are not
+    # formed by the k-th events of the trial.
+    irregular = (
+        (k >= 1)
+        & (k <= n_complete)
+        & (positions[:, 1:] <= previous_closed[:, None]).any(axis=1)
+    )
 
-    # Step 3: Build dataframe
-    rl_dataframe = pd.DataFrame(
-        all_tuples,
-        columns=["obs0", "action", "reward", "obs1", "reaction_time", "trial"],
+    # The last tuple of a trial can lack obs1.
+    dangling = (k == n_complete) & exists[:, 0] & exists[:, 2] & exists[:, 3]
+
+    # Missing values are skipped by process_trial_for_rl.
+    none_values = np.zeros(len(df), dtype=bool)
+    for label, columns in [
+        ("obs", ["current_location"]),
+        ("action", ["action", "response_time"]),
+        ("reward", ["reward"]),
+    ]:
+        mask = (df["rl_label"] == label).to_numpy(dtype=bool)
+        for col in columns:
+            none_values[mask] |= _is_none(df[col].to_numpy(dtype=object)[mask]).astype(
+                bool
+            )
+
+    fallback_trials = np.union1d(
+        trials[irregular].unique(), df["trial"][none_values].unique()
+    )
+    keep = (complete | dangling) & ~trials.isin(fallback_trials)
+
+    keep_positions = positions[keep]
+    location = df["current_location"].to_numpy(dtype=object)
+    action_position = keep_positions[:, 2].astype(int)
+
+    obs1 = np.full(len(keep_positions), None, dtype=object)
+    has_obs1 = exists[keep, 1]
+    obs1[has_obs1] = location[keep_positions[has_obs1, 1].astype(int)]
+
+    all_tuples = list(
+        zip(
+            location[keep_positions[:, 0].astype(int)],
+            df["action"].to_numpy(dtype=object)[action_position],
+            df["reward"].to_numpy(dtype=object)[keep_positions[:, 3].astype(int)],
+            obs1,
+            df["response_time"].to_numpy(dtype=object)[action_position],
+            df["trial"].to_numpy(dtype=object)[action_position],
+        )
     )
+
+    fallback = df[df["trial"].isin(fallback_trials)]
+    for trial_id, trial_df in fallback.groupby("trial"):
+        all_tuples.extend(process_trial_for_rl(trial_id, trial_df))
+
+    rl_dataframe = pd.DataFrame(all_tuples, columns=_RL_COLUMNS)
+
+    if len(fallback):
+        rl_dataframe = rl_dataframe.sort_values(
+            "trial", kind="stable", ignore_index=True
+        )
+
     return rl_dataframe
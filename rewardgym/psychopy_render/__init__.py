@@ -6,7 +6,7 @@ from .advanced_display import (
     TextWithBorder,
     TwoStimuliWithResponseAndSelection,
 )
-from .logger import ExperimentLogger, SimulationLogger
+from .logger import ExperimentLogger, SimulationLogger, TypedSimulationLogger
 from .psychopy_display import (
     ActionStimulus,
     BaseStimulus,
@@ -14,10 +14,16 @@ from .psychopy_display import (
     ImageStimulus,
     TextStimulus,
 )
+from .textures import TextureCache, get_texture_cache
+from .timing import FrameTimer
 
 __all__ = [
     "ExperimentLogger",
     "SimulationLogger",
+    "TypedSimulationLogger",
+    "FrameTimer",
+    "TextureCache",
+    "get_texture_cache",
     "ActionStimulusTooEarly",
     "ConditionBasedDisplay",
     "TwoStimuliWithResponseAndSelection",
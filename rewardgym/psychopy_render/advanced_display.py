@@ -128,7 +128,7 @@ class ActionStimulusTooEarly(ActionStimulus):
                 response_key = self.timeout_action
                 self.text_stim.draw()
             else:
-                win.flip()
+                logger.flip(win, self.name)
 
             return response_key, remaining
 
@@ -229,7 +229,7 @@ class ConditionBasedDisplay(BaseStimulus):
         if imgB is not None:
             imgB.draw()
 
-        win.flip()
+        logger.flip(win, self.name, stim_onset)
 
         logger.wait(win, self.duration, stim_onset)
 
@@ -429,7 +429,7 @@ class TwoStimuliWithResponseAndSelection(ActionStimulus):
         for img in self.image_class[2:]:
             img.draw()
 
-        win.flip()
+        logger.flip(win, name, stim_onset)
 
         logger.wait(win, duration, stim_onset)
 
@@ -508,7 +508,7 @@ class TextWithBorder(BaseStimulus):
         self.rectStim.autoDraw = True
         self.textStim.autoDraw = True
         stim_onset = logger.get_time()
-        win.flip()
+        logger.flip(win, self.name, stim_onset)
 
         self.rectStim.autoDraw = False
         self.textStim.autoDraw = False
@@ -576,7 +576,7 @@ class StimuliWithResponse(ActionStimulus):
             win,
             logger,
         )
-        win.flip()
+        logger.flip(win, self.name)
 
         response_window_onset = logger.get_time()
 
@@ -632,7 +632,7 @@ class StimuliWithResponse(ActionStimulus):
             elif self.flip_dir == "horiz":
                 ii.flip = [False, flip]
 
-        win.flip()
+        logger.flip(win, self.target_name, stim_onset)
 
         for ii in self.imageStims:
             ii.autoDraw = False
@@ -803,7 +803,7 @@ class LingeringAction(ActionStimulus):
             for ii in self.image_class_phase1:
                 ii.autoDraw = True
 
-            win.flip()
+            logger.flip(win, name, stim_onset)
 
             for ii in self.image_class_phase1:
                 ii.autoDraw = self.autodraw
@@ -812,7 +812,7 @@ class LingeringAction(ActionStimulus):
             for ii in self.image_class_phase2:
                 ii.autoDraw = True
 
-            win.flip()
+            logger.flip(win, name, stim_onset)
 
             for ii in self.image_class_phase2:
                 ii.autoDraw = self.autodraw
@@ -1,6 +1,12 @@
 """Logger classes used by the experiment."""
 
-from typing import Dict, List, Tuple, Union
+import atexit
+import math
+import queue
+import threading
+import warnings
+from array import array
+from typing import Dict, List, Literal, Tuple, Union
 
 try:
     from psychopy import core
@@ -11,12 +17,20 @@ except ModuleNotFoundError:
     from . import psychopy_stubs as core
     from .psychopy_stubs import Clock, Window, getKeys
 
+from .timing import FrameTimer
+
 
 class ExperimentLogger:
     """
     Logger class to log what is going on during the experiment.
     """
 
+    writer = "direct"
+    _queue = None
+    _writer_thread = None
+    _writer_error = None
+    frame_timer = None
+
     def __init__(
         self,
         file_name: str,
@@ -30,6 +44,9 @@ class ExperimentLogger:
         kill_switch: str = "q",
         mr_trigger: str = "5",
         mr_clock: Clock = None,
+        writer: Literal["direct", "background"] = "direct",
+        buffer_size: int = 4096,
+        frame_timer: FrameTimer = None,
     ):
         """
         Logger class to help with logging during a potential fMRI experiment,
@@ -57,9 +74,28 @@ class ExperimentLogger:
             Button to press to exit the experiment, by default "q"
         mr_trigger : str, optional
             Trigger of the MRI (assuming that it is transformed to a key press), by default "5"
-        """
+        writer : Literal["direct", "background"], optional
+            If "direct", rows are written to the file when they are logged. If
+            "background", rows are put into a bounded buffer and written by a
+            separate thread, so that disk access does not delay stimulus presentation.
+            The buffer is flushed on close (also when using the kill switch),
+            by default "direct"
+        buffer_size : int, optional
+            Maximum number of rows in the buffer of the background writer, logging
+            blocks when it is full, by default 4096
+        frame_timer : FrameTimer, optional
+            If given, records the timing of all window flips and waits (see flip),
+            so that dropped frames and onset delays can be summarized after the
+            experiment, by default None
+        """
+
+        if writer not in ["direct", "background"]:
+            raise ValueError(f"Unknown writer {writer}, use 'direct' or 'background'.")
 
         self.file_name = file_name
+        self.writer = writer
+        self.buffer_size = buffer_size
+        self.frame_timer = frame_timer
 
         if global_clock is None:
             global_clock = Clock()
@@ -228,8 +264,44 @@ class ExperimentLogger:
             List of strings to write to file.
         """
 
-        if tmp_values:
+        if not tmp_values:
+            return
+
+        if self._writer_thread is None:
             self.log_file.write(self.sep.join(tmp_values) + "\n")
+        else:
+            if self._writer_error is not None:
+                raise self._writer_error
+            self._queue.put(tmp_values)
+
+    def _background_writer(self):
+        """
+        Writes the rows of the buffer to the file, until it receives None.
+        """
+        while True:
+            rows = [self._queue.get()]
+
+            # Writes everything that is currently buffered at once.
+            while rows[-1] is not None:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            finished = rows[-1] is None
+            rows = rows[:-1] if finished else rows
+
+            try:
+                if rows:
+                    self.log_file.write(
+                        "".join(self.sep.join(row) + "\n" for row in rows)
+                    )
+                    self.log_file.flush()
+            except Exception as e:
+                self._writer_error = e
+
+            if finished:
+                return
 
     def create(self, mode: str = "w"):
         """
@@ -245,15 +317,35 @@ class ExperimentLogger:
         # set trial start to not break stuff
         self.set_trial_time()
 
+        if self.writer == "background":
+            self._queue = queue.Queue(maxsize=self.buffer_size)
+            self._writer_error = None
+            self._writer_thread = threading.Thread(
+                target=self._background_writer, name="ExperimentLogger", daemon=True
+            )
+            self._writer_thread.start()
+            # Ensures the buffer is written, if the experiment ends without close.
+            atexit.register(self.close)
+
         if mode == "w":
             self._write_to_file(self.categories)
 
     def close(self):
         """
-        Closes the file.
+        Closes the file, after writing all buffered rows.
         """
+        if self._writer_thread is not None:
+            self._queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+            atexit.unregister(self.close)
+
         self.log_file.close()
 
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise error
+
     def set_trial_time(self):
         """
         Set the trial's start using the global clock.
@@ -349,6 +441,25 @@ class ExperimentLogger:
             else:
                 raise AttributeError(f"Cannot / doest not have attribute: {k}")
 
+    def flip(self, win: Window, name: str = None, intended_onset: float = None):
+        """
+        Flips the window, recording the timing of the flip, if the logger has a
+        frame timer.
+
+        Parameters
+        ----------
+        win : Window
+            Psychopy window object, used to display the task.
+        name : str, optional
+            Name of the stimulus that is shown by the flip, by default None
+        intended_onset : float, optional
+            When the stimulus was supposed to appear, by default None
+        """
+        win.flip()
+
+        if self.frame_timer is not None:
+            self.frame_timer.record_flip(name, intended_onset, self.get_time())
+
     def wait(self, win, time: float, start: float = None, wait_no_keys: bool = False):
         """
         Wait for a given time.
@@ -374,6 +485,9 @@ class ExperimentLogger:
             if not wait_no_keys:
                 self.key_strokes(win)
 
+        if self.frame_timer is not None:
+            self.frame_timer.record_wait(t_wait, self.get_time())
+
 
 class MinimalLogger(ExperimentLogger):
     """
@@ -458,12 +572,123 @@ class MinimalLogger(ExperimentLogger):
 
 
 class SimulationLogger(ExperimentLogger):
+    # Conversion of the values of log_static_events.
+    _convert = str
+
     def _write_to_file(self, tmp_values: List[float]):
-        for n, ii in enumerate(self.categories):
-            self.df[ii].append(tmp_values[n])
+        for column, value in zip(self._columns, tmp_values):
+            column.append(value)
+
+    def _write_columns(self, columns: List[List]):
+        """Appends several rows at once, given as one list per category."""
+        for column, values in zip(self._columns, columns):
+            column.extend(values)
 
     def create(self):
         self.df = {ii: [] for ii in self.categories}
+        self._columns = [self.df[ii] for ii in self.categories]
+        self._static_events = {}
+        self._index = {ii: n for n, ii in enumerate(self.categories)}
+
+    def _static_constants(self, events: Tuple[Tuple[str, str, bool], ...]) -> Tuple:
+        """
+        The converted event types and rl labels of a segment of static events, and
+        which of them are feedback events. Cached, as segments repeat every trial.
+        """
+        constants = self._static_events.get(events)
+
+        if constants is None:
+            convert = self._convert
+            event_type, rl_label = convert(self.na), convert(self.rllabel)
+
+            constants = (
+                [event_type if nm is None else convert(nm) for nm, _, _ in events],
+                [rl_label if rl is None else convert(rl) for _, rl, _ in events],
+                [fb for _, _, fb in events],
+            )
+            self._static_events[events] = constants
+
+        return constants
+
+    def log_static_events(
+        self,
+        events: Tuple[Tuple[str, str, bool], ...],
+        durations: List[float],
+        reward: float = None,
+        total_reward: float = None,
+    ):
+        """
+        Logs the events of stimuli that do not depend on the agent's behavior, and
+        advances the clock by their durations. The rows are the same as when each
+        stimulus is simulated on its own (see BaseStimulus.simulate and
+        FeedBackStimulus.simulate), but are added column-wise: the columns that are
+        the same for all events are only converted once.
+
+        Parameters
+        ----------
+        events : Tuple[Tuple[str, str, bool], ...]
+            For each stimulus the name, the rl_label and whether it is a feedback
+            stimulus, which also logs the reward and the total reward.
+        durations : List[float]
+            The duration of each stimulus.
+        reward : float, optional
+            The reward of the trial, logged by feedback stimuli, by default None
+        total_reward : float, optional
+            The total reward, logged by feedback stimuli, by default None
+        """
+        if not events:
+            return
+
+        convert = self._convert
+        event_types, rl_labels, feedback = self._static_constants(events)
+        row = self._create_log_list(self._default_logging(None))
+        n_events = len(events)
+
+        columns = [[value] * n_events for value in row]
+        index = self._index
+        columns[index["event_type"]] = event_types
+        columns[index["rl_label"]] = rl_labels
+
+        onsets = columns[index["onset"]]
+        lengths = columns[index["duration"]]
+        trial_times = columns[index["trial_time"]]
+        expected_durations = columns[index["expected_duration"]]
+        rewards = columns[index["reward"]]
+        total_rewards = columns[index["total_reward"]]
+
+        event_reward = convert(reward)
+        event_total_reward = None if total_reward is None else convert(total_reward)
+
+        current_time = self.global_clock.getTime()
+        trial_start = self.trial_start
+
+        for n, (duration, fb) in enumerate(zip(durations, feedback)):
+            stim_onset = current_time
+
+            if duration is not None:
+                current_time += duration
+                expected_durations[n] = convert(duration)
+            elif not fb:
+                stim_onset = None
+
+            trial_times[n] = convert(current_time - trial_start)
+
+            # As in log_event, an onset of 0 is not used.
+            if stim_onset:
+                onsets[n] = convert(stim_onset)
+                lengths[n] = convert(current_time - stim_onset)
+            else:
+                onsets[n] = convert(current_time)
+
+            if fb:
+                rewards[n] = event_reward
+                if event_total_reward is not None:
+                    total_rewards[n] = event_total_reward
+
+        self.global_clock.time = current_time
+        self.reward = reward if feedback[-1] else None
+
+        self._write_columns(columns)
 
     def key_strokes(
         self,
@@ -494,3 +719,135 @@ class SimulationLogger(ExperimentLogger):
             start = self.get_time()
 
         self.global_clock.time += time
+
+
+def _identity(value):
+    return value
+
+
+def _as_int(value):
+    """
+    Integral floats (e.g. an action as np.float64) are converted to int, other
+    values are returned unchanged.
+    """
+    is_integer = getattr(value, "is_integer", None)
+
+    if not hasattr(value, "__index__") and is_integer is not None and is_integer():
+        return int(value)
+
+    return value
+
+
+class TypedSimulationLogger(SimulationLogger):
+    """
+    Simulation logger, which keeps the native types of the logged values, instead
+    of converting them to strings. Numeric columns are stored in typed arrays
+    (array.array, which preallocates space as it grows), close returns a pandas
+    DataFrame with float, Int64 and categorical columns. Missing values are NaN or
+    <NA>.
+    """
+
+    float_columns = [
+        "onset",
+        "duration",
+        "response_time",
+        "reward",
+        "trial_time",
+        "total_reward",
+        "expected_duration",
+    ]
+    int_columns = ["trial", "action", "current_location", "start_position", "TR", "run"]
+    categorical_columns = ["event_type", "trial_type", "task", "participant_id"]
+
+    _convert = staticmethod(_identity)
+
+    def create(self):
+        self._columns = []
+
+        for ii in self.categories:
+            if ii in self.float_columns:
+                self._columns.append(("float", array("d"), None))
+            elif ii in self.int_columns:
+                self._columns.append(("int", array("q"), array("b")))
+            else:
+                self._columns.append(("object", [], None))
+
+        self._static_events = {}
+        self._index = {ii: n for n, ii in enumerate(self.categories)}
+
+    def _create_log_list(self, tmp_dict: Dict) -> List:
+        return [tmp_dict[kk] for kk in self.categories]
+
+    def _to_object(self, index: int, value):
+        """
+        Stores a numeric column as list of objects, after it received a value, which
+        is not a number of the column's type.
+        """
+        kind, data, mask = self._columns[index]
+
+        warnings.warn(
+            f"Column '{self.categories[index]}' received the value {value!r} of type "
+            f"{type(value).__name__} and is stored as object column from now on.",
+            UserWarning,
+        )
+
+        if kind == "int":
+            values = [None if mm else vv for vv, mm in zip(data, mask)]
+        else:
+            values = [None if vv != vv else vv for vv in data]
+
+        self._columns[index] = ("object", values, None)
+
+    def _write_to_file(self, tmp_values: List):
+        for n, value in enumerate(tmp_values):
+            kind, data, mask = self._columns[n]
+            missing = (
+                value is None
+                or (isinstance(value, str) and value == self.na)
+                or (isinstance(value, float) and math.isnan(value))
+            )
+
+            try:
+                if kind == "float":
+                    data.append(float("nan") if missing else value)
+                elif kind == "int":
+                    data.append(0 if missing else _as_int(value))
+                    mask.append(missing)
+            except TypeError:
+                self._to_object(n, value)
+                kind, data, mask = self._columns[n]
+
+            if kind == "object":
+                data.append(None if missing else value)
+
+    def _write_columns(self, columns: List[List]):
+        for row in zip(*columns):
+            self._write_to_file(row)
+
+    def close(self):
+        """
+        Returns the logged events.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per event, with the columns of the logger.
+        """
+        import numpy as np
+        import pandas as pd
+
+        df = {}
+
+        for ii, (kind, data, mask) in zip(self.categories, self._columns):
+            if kind == "float":
+                df[ii] = np.array(data, dtype=float)
+            elif kind == "int":
+                df[ii] = pd.arrays.IntegerArray(
+                    np.array(data, dtype=np.int64), np.array(mask, dtype=bool)
+                )
+            elif ii in self.categorical_columns:
+                df[ii] = pd.Categorical(data)
+            else:
+                df[ii] = pd.Series(data, dtype=object)
+
+        return pd.DataFrame(df)
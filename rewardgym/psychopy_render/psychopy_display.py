@@ -7,9 +7,20 @@ except ModuleNotFoundError:
     from .psychopy_stubs import Window, TextStim, ImageStim, Rect
 
 import warnings
+from functools import lru_cache, partial
 
 from ..stimuli import lose_cross, win_cross, zero_cross
 from .logger import ExperimentLogger, SimulationLogger
+from .textures import get_texture_cache
+
+
+@lru_cache(maxsize=None)
+def _default_feedback_images() -> Dict:
+    """
+    The default feedback images (win, lose and zero fixation crosses), created once
+    and shared by all FeedBackStimulus instances.
+    """
+    return {"win": win_cross(), "lose": lose_cross(), "zero": zero_cross()}
 
 
 class BaseStimulus:
@@ -74,7 +85,7 @@ class BaseStimulus:
             stim_onset = logger.get_time()
 
             if not self.noflip:
-                win.flip()
+                logger.flip(win, self.name, stim_onset)
 
             logger.wait(win, self.duration, stim_onset, self.wait_no_keys)
 
@@ -194,7 +205,7 @@ class TextStimulus(BaseStimulus):
         """
         stim_onset = logger.get_time()
         self.textStim.draw()
-        win.flip()
+        logger.flip(win, self.name, stim_onset)
 
         logger.wait(win, self.duration, stim_onset)
 
@@ -268,16 +279,23 @@ class ImageStimulus(BaseStimulus):
         if image_paths is not None:
             self.image_paths = image_paths
 
+        # Stimuli that are drawn permanently get their own ImageStim, so that other
+        # stimuli sharing the image do not switch drawing off.
+        if self.autodraw:
+            create_stim = partial(ImageStim, win)
+        else:
+            create_stim = get_texture_cache(win).get
+
         self.imageStims = []
         for ip, pos in zip(self.image_paths, self.positions):
             if isinstance(ip, str):
-                self.imageStims.append(ImageStim(win, image=ip, pos=pos))
+                self.imageStims.append(create_stim(image=ip, pos=pos))
 
             else:
                 width = ip.shape[1] if self.width is None else self.width
                 height = ip.shape[0] if self.height is None else self.height
                 self.imageStims.append(
-                    ImageStim(win, image=ip, size=(width, height), pos=pos)
+                    create_stim(image=ip, size=(width, height), pos=pos)
                 )
 
         for ip in self.imageStims:
@@ -306,7 +324,7 @@ class ImageStimulus(BaseStimulus):
         for ii in self.imageStims:
             ii.autoDraw = True
 
-        win.flip()
+        logger.flip(win, self.name, stim_onset)
 
         for ii in self.imageStims:
             ii.autoDraw = self.autodraw
@@ -396,7 +414,7 @@ class ActionStimulus(BaseStimulus):
         )
 
         if not self.noflip:
-            win.flip()
+            logger.flip(win, self.name)
 
         return response
 
@@ -597,11 +615,7 @@ class FeedBackStimulus(BaseStimulus):
         self.target = target
 
         if feedback_stim is True:
-            self.feedback_stim = {
-                "win": win_cross(),
-                "lose": lose_cross(),
-                "zero": zero_cross(),
-            }
+            self.feedback_stim = dict(_default_feedback_images())
         elif feedback_stim is None or feedback_stim is False:
             self.feedback_stim = {}
         else:
@@ -691,15 +705,13 @@ class FeedBackStimulus(BaseStimulus):
             self.total_reward_ind.autoDraw = True
 
         self.feedback_image = {}
+        textures = get_texture_cache(win)
 
         for kk in self.feedback_stim.keys():
             if isinstance(self.feedback_stim[kk], str):
-                self.feedback_image[kk] = ImageStim(
-                    win=win, image=self.feedback_stim[kk]
-                )
+                self.feedback_image[kk] = textures.get(image=self.feedback_stim[kk])
             else:
-                self.feedback_image[kk] = ImageStim(
-                    win,
+                self.feedback_image[kk] = textures.get(
                     image=self.feedback_stim[kk],
                     size=self.feedback_stim[kk].shape[:2],
                 )
@@ -759,7 +771,7 @@ class FeedBackStimulus(BaseStimulus):
                 self._update_reward_bar(total_reward=total_reward)
 
         stim_onset = logger.get_time()
-        win.flip()
+        logger.flip(win, self.name, stim_onset)
         logger.wait(win, self.duration, stim_onset)
 
         if feedback_img in self.feedback_image.keys():
@@ -770,7 +782,7 @@ class FeedBackStimulus(BaseStimulus):
         if not self.simple:
             self.total_reward_ind.setAutoDraw(True)
 
-        win.flip()
+        logger.flip(win, self.name)
 
         self._log_event(
             logger=logger,
@@ -823,3 +835,33 @@ class FeedBackStimulus(BaseStimulus):
             extra_info={"total_reward": total_reward},
             reward=reward,
         )
+
+
+def static_simulation(stimulus: BaseStimulus) -> Union[str, None]:
+    """
+    Checks if simulating the stimulus is independent of the agent's behavior. This
+    is the case when the stimulus only waits for its duration and logs an event,
+    i.e. it uses the simulate method of BaseStimulus or of FeedBackStimulus.
+
+    Parameters
+    ----------
+    stimulus : BaseStimulus
+        The stimulus object.
+
+    Returns
+    -------
+    Union[str, None]
+        "feedback" for feedback stimuli, "static" for other static stimuli, and
+        None for stimuli that have to be simulated.
+    """
+    stim_class = type(stimulus)
+
+    if stim_class._log_event is not BaseStimulus._log_event:
+        return None
+
+    if stim_class.simulate is BaseStimulus.simulate:
+        return "static"
+    elif stim_class.simulate is FeedBackStimulus.simulate:
+        return "feedback"
+
+    return None
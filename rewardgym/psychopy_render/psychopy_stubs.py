@@ -13,6 +13,9 @@ class Window:
     def flip(self):
         pass
 
+    def clearBuffer(self):
+        pass
+
     def close(self):
         pass
 
@@ -24,6 +27,9 @@ class ImageStim:
     def setAutoDraw(*args):
         pass
 
+    def draw(*args):
+        pass
+
 
 class TextStim(ImageStim):
     pass
@@ -0,0 +1,127 @@
+"""Window scoped cache of image stimuli, so that identical images share a texture."""
+
+import hashlib
+import os
+from typing import Dict, Hashable, Union
+
+import numpy as np
+
+try:
+    from psychopy.visual import ImageStim, Window
+except ModuleNotFoundError:
+    from .psychopy_stubs import ImageStim, Window
+
+
+def image_key(image: Union[str, np.ndarray]) -> Hashable:
+    """
+    Identifies the source of an image: the absolute path of an image file or the
+    shape, dtype and content hash of an image array.
+
+    Parameters
+    ----------
+    image : Union[str, np.ndarray]
+        Path to an image or an image array.
+
+    Returns
+    -------
+    Hashable
+        The key of the image.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        return ("path", os.path.abspath(image))
+
+    image = np.ascontiguousarray(image)
+    digest = hashlib.sha1(image.tobytes()).hexdigest()
+
+    return ("array", image.shape, image.dtype.str, digest)
+
+
+def _freeze(value) -> Hashable:
+    """Converts (nested) lists and arrays of stimulus parameters into tuples."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze(vv) for vv in value)
+
+    return value
+
+
+class TextureCache:
+    """
+    Cache of the ImageStim objects of a window. Stimuli that show the same image
+    (file or array) with the same parameters share one ImageStim, so that the image
+    is only loaded and uploaded to the GPU once.
+
+    The ImageStims are shared, stimulus classes using the cache must not change
+    their parameters (e.g. position or opacity) after creation.
+    """
+
+    def __init__(self, win: Window):
+        """
+        Parameters
+        ----------
+        win : Window
+            The psychopy window object the textures belong to.
+        """
+        self.win = win
+        self.stims: Dict[Hashable, ImageStim] = {}
+
+    def get(self, image: Union[str, np.ndarray], **kwargs) -> ImageStim:
+        """
+        Returns the ImageStim of an image, creating it, if it is not cached.
+
+        Parameters
+        ----------
+        image : Union[str, np.ndarray]
+            Path to an image or an image array.
+        kwargs :
+            Further parameters of the ImageStim (e.g. pos or size), part of the key.
+
+        Returns
+        -------
+        ImageStim
+            The (shared) image stimulus.
+        """
+        key = (image_key(image), _freeze(sorted(kwargs.items())))
+
+        if key not in self.stims:
+            self.stims[key] = ImageStim(self.win, image=image, **kwargs)
+
+        return self.stims[key]
+
+    def preload(self):
+        """
+        Draws every cached image once into the back buffer and clears it, so that
+        all textures are on the GPU before the first trial. Nothing is shown, as the
+        window is not flipped.
+        """
+        for stim in self.stims.values():
+            stim.draw()
+
+        if self.stims:
+            self.win.clearBuffer()
+
+    def __len__(self):
+        return len(self.stims)
+
+
+def get_texture_cache(win: Window) -> TextureCache:
+    """
+    The texture cache of a window. The cache is stored on the window, so that it is
+    discarded together with the window.
+
+    Parameters
+    ----------
+    win : Window
+        The psychopy window object.
+
+    Returns
+    -------
+    TextureCache
+        The cache of the window.
+    """
+    cache = getattr(win, "_rewardgym_textures", None)
+
+    if cache is None:
+        cache = TextureCache(win)
+        win._rewardgym_textures = cache
+
+    return cache
@@ -0,0 +1,146 @@
+"""Frame timing instrumentation for the PsychoPy stimuli."""
+
+import math
+from typing import List, Tuple
+
+SUMMARY_COLUMNS = [
+    "stimulus",
+    "n_flips",
+    "mean_delay",
+    "max_delay",
+    "dropped_frames",
+    "n_waits",
+    "mean_wait_overshoot",
+    "max_wait_overshoot",
+]
+
+
+class FrameTimer:
+    """
+    Records the window flips of an experiment, to validate the stimulus timing.
+
+    For each flip the intended onset (the time, the stimulus was supposed to appear,
+    usually the time before drawing) and the actual onset (the time, after the flip
+    returned) are stored. A flip should happen within one frame of the intended
+    onset, every further frame of delay is counted as a dropped frame. Additionally,
+    the overshoot of the waits following a flip (time waited beyond the intended
+    end) is recorded.
+
+    Times are in seconds of the logger's global clock.
+    """
+
+    def __init__(self, frame_rate: float = 60.0):
+        """
+        Parameters
+        ----------
+        frame_rate : float, optional
+            Refresh rate of the monitor in Hz, by default 60.0
+        """
+        self.frame_rate = frame_rate
+        self.frame_duration = 1.0 / frame_rate
+
+        self.flips: List[Tuple[str, float, float]] = []
+        self.waits: List[Tuple[str, float, float]] = []
+        self.current_stimulus = None
+
+    def record_flip(self, name: str, intended_onset: float, actual_onset: float):
+        """
+        Records a window flip.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stimulus, that has been flipped.
+        intended_onset : float
+            When the stimulus was supposed to appear, if None, only the time of the
+            flip is recorded (e.g. for flips that clear the screen).
+        actual_onset : float
+            When the flip returned.
+        """
+        self.current_stimulus = name
+        self.flips.append((name, intended_onset, actual_onset))
+
+    def record_wait(self, intended_end: float, actual_end: float):
+        """
+        Records a wait, the wait is assigned to the stimulus that was flipped last.
+
+        Parameters
+        ----------
+        intended_end : float
+            When the wait was supposed to end.
+        actual_end : float
+            When the wait ended.
+        """
+        self.waits.append((self.current_stimulus, intended_end, actual_end))
+
+    def dropped_frames(self, delay: float) -> int:
+        """The number of frames missed, given the delay of a flip."""
+        if delay is None or delay < self.frame_duration:
+            return 0
+
+        return math.floor(delay / self.frame_duration)
+
+    def flip_table(self):
+        """
+        All recorded flips.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per flip, with the stimulus, the intended and actual onset, the
+            delay and the number of dropped frames.
+        """
+        import pandas as pd
+
+        table = pd.DataFrame(
+            self.flips, columns=["stimulus", "intended_onset", "actual_onset"]
+        )
+        table["delay"] = table["actual_onset"] - table["intended_onset"]
+        table["dropped_frames"] = [
+            self.dropped_frames(None if pd.isna(dd) else dd) for dd in table["delay"]
+        ]
+
+        return table
+
+    def summary(self):
+        """
+        Summarizes the timing per stimulus.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per stimulus name, with the number of flips, the mean and maximum
+            onset delay, the number of dropped frames and the number, mean and
+            maximum overshoot of the waits.
+        """
+        import pandas as pd
+
+        flips = self.flip_table()
+        waits = pd.DataFrame(
+            self.waits, columns=["stimulus", "intended_end", "actual_end"]
+        )
+        waits["overshoot"] = waits["actual_end"] - waits["intended_end"]
+
+        # Flips and waits, which are not associated with a named stimulus.
+        flips["stimulus"] = flips["stimulus"].fillna("n/a")
+        waits["stimulus"] = waits["stimulus"].fillna("n/a")
+
+        flip_summary = flips.groupby("stimulus", sort=False).agg(
+            n_flips=("actual_onset", "size"),
+            mean_delay=("delay", "mean"),
+            max_delay=("delay", "max"),
+            dropped_frames=("dropped_frames", "sum"),
+        )
+        wait_summary = waits.groupby("stimulus", sort=False).agg(
+            n_waits=("overshoot", "size"),
+            mean_wait_overshoot=("overshoot", "mean"),
+            max_wait_overshoot=("overshoot", "max"),
+        )
+
+        summary = flip_summary.join(wait_summary, how="outer", sort=False)
+        summary = summary.fillna({"n_flips": 0, "dropped_frames": 0, "n_waits": 0})
+        summary = summary.astype(
+            {"n_flips": int, "dropped_frames": int, "n_waits": int}
+        )
+
+        return summary.rename_axis("stimulus").reset_index()[SUMMARY_COLUMNS]
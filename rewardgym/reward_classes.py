@@ -6,7 +6,28 @@ from .utils import check_random_state
 
 
 class BaseReward:
-    def __init__(self, reward, p=1, random_state=1234):
+    buffer_size = None
+    _buffer = None
+    _buffer_index = 0
+
+    def __init__(self, reward, p=1, random_state=1234, buffer_size=None):
+        """
+        Reward drawn from a fixed distribution.
+
+        Parameters
+        ----------
+        reward : Union[list, float]
+            The possible reward values.
+        p : Union[list, float], optional
+            Probability of each reward value, by default 1
+        random_state : Union[int, np.random.Generator], optional
+            Seed or random number generator, by default 1234
+        buffer_size : int, optional
+            If given, outcomes are drawn in blocks of buffer_size and served one by
+            one. As long as the generator is not shared with other objects and p is
+            not changed, the outcomes are identical to the unbuffered ones. Changes
+            of p or reward only take effect with the next block, by default None
+        """
         if not isinstance(reward, (list, tuple, np.ndarray)):
             reward = [reward]
 
@@ -18,8 +39,26 @@ class BaseReward:
 
         self.random_state = check_random_state(random_state)
 
+        self.buffer_size = buffer_size
+        self._buffer = None
+        self._buffer_index = 0
+
+    def _fill_buffer(self):
+        self._buffer = self.random_state.choice(
+            self.reward, p=self.p, size=self.buffer_size
+        )
+        self._buffer_index = 0
+
     def _reward_function(self, **kwargs):
-        reward = self.random_state.choice(self.reward, p=self.p)
+        if self.buffer_size is None:
+            return self.random_state.choice(self.reward, p=self.p)
+
+        if self._buffer is None or self._buffer_index == len(self._buffer):
+            self._fill_buffer()
+
+        reward = self._buffer[self._buffer_index]
+        self._buffer_index += 1
+
         return reward
 
     def __call__(self, **kwargs):
@@ -37,7 +76,30 @@ class DriftingReward(BaseReward):
         borders: list = [0.25, 0.75],
         gauss_sd: float = 0.025,
         random_state: int = 1234,
+        buffer_size: int = None,
     ):
+        """
+        Binary reward, whose probability follows a Gaussian random walk, reflected
+        at the borders.
+
+        Parameters
+        ----------
+        reward : Union[list, int], optional
+            The two reward values, the first one is given with probability p, by default [1, 0]
+        p : float, optional
+            Initial probability, if None drawn uniformly between the borders, by default None
+        borders : list, optional
+            Lower and upper bound of the probability, by default [0.25, 0.75]
+        gauss_sd : float, optional
+            Standard deviation of the random walk, by default 0.025
+        random_state : int, optional
+            Seed or random number generator, by default 1234
+        buffer_size : int, optional
+            If given, the walk of p and the outcomes are drawn in blocks of buffer_size
+            steps. The outcomes follow the same distribution as without buffering,
+            but not the same random stream. p is still updated after every call,
+            by default None
+        """
         if not isinstance(reward, (list, tuple, np.ndarray)):
             reward = [reward]
 
@@ -52,7 +114,24 @@ class DriftingReward(BaseReward):
         self.gauss_sd = gauss_sd
         self.borders = borders
 
+        self.buffer_size = buffer_size
+        self._buffer = None
+        self._buffer_index = 0
+
+    def _fill_buffer(self):
+        lower, upper = self.borders
+
+        steps = self.random_state.normal(0, self.gauss_sd, self.buffer_size)
+        walk = _reflect(self.p + np.cumsum(steps), lower, upper)
+
+        self._p_walk = np.concatenate([[self.p], walk])
+        self._buffer = self.random_state.random(self.buffer_size)
+        self._buffer_index = 0
+
     def _reward_function(self, **kwargs):
+        if self.buffer_size is not None:
+            return self._buffered_reward()
+
         reward = self.random_state.choice(self.reward, p=[self.p, 1 - self.p])
 
         next_val = self.p + self.random_state.normal(0, self.gauss_sd)
@@ -66,8 +145,22 @@ class DriftingReward(BaseReward):
 
         return reward
 
+    def _buffered_reward(self):
+        if self._buffer is None or self._buffer_index == len(self._buffer):
+            self._fill_buffer()
+
+        index = self._buffer_index
+        # Same rule as choice with p=[p, 1 - p], which compares against the cdf.
+        outcome = 0 if self._buffer[index] < self._p_walk[index] else 1
+
+        self.p = self._p_walk[index + 1]
+        self._buffer_index += 1
+
+        return np.asarray(self.reward)[outcome]
+
     def reset(self):
         self.p = self.initial_p
+        self._buffer = None
 
 
 class PseudoRandomReward(BaseReward):
@@ -91,3 +184,14 @@ class PseudoRandomReward(BaseReward):
 
     def reset(self):
         self.rewards = self._generate_sequence()
+
+
+def _reflect(values: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    """
+    Folds an unbounded random walk into [lower, upper]. For symmetric steps this has
+    the same distribution as reflecting the walk at the borders step by step.
+    """
+    width = upper - lower
+    folded = np.mod(values - lower, 2 * width)
+
+    return lower + width - np.abs(folded - width)
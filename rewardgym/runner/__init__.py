@@ -1,9 +1,11 @@
 from .file_utils import make_bids_name
+from .psychopy_batch import pspy_simulate_sessions
 from .psychopy_runner import pspy_run_task
 from .psychopy_utils import overwrite_warning, pspy_set_up_experiment
 
 __all__ = [
     "pspy_run_task",
+    "pspy_simulate_sessions",
     "make_bids_name",
     "pspy_set_up_experiment",
     "overwrite_warning",
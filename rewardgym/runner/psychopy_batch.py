@@ -0,0 +1,209 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from typing import Dict, List, Union
+
+import numpy as np
+
+from ..psychopy_render import SimulationLogger
+from ..psychopy_render.psychopy_stubs import Clock, Window
+from ..tasks import get_configs, get_env, get_psychopy_info
+from ..utils import spawn_seeds
+from .file_utils import make_bids_name
+from .psychopy_runner import plugin_registry, pspy_run_task
+
+
+def _session_inputs(task_name: str, stimulus_set: int, key_dict: Dict):
+    """The settings and psychopy stimuli of a stimulus set."""
+    settings = get_configs(task_name)(stimulus_set)
+
+    try:
+        kwargs = {} if key_dict is None else {"key_dict": key_dict}
+        psychopy_info = get_psychopy_info(task_name, seed=stimulus_set, **kwargs)[0]
+    except NotImplementedError:
+        psychopy_info = None
+
+    return settings, psychopy_info
+
+
+def _simulate_session(
+    task_name: str,
+    agent,
+    settings: Dict,
+    psychopy_info: Union[Dict, None],
+    seed: np.random.SeedSequence,
+    file_name: str,
+    participant_id: str,
+    run: int,
+    plugins: Dict,
+) -> str:
+    env_seed, reward_seed = seed.spawn(2)
+
+    env = get_env(
+        task_name,
+        render_backend="psychopy-simulate",
+        random_state=np.random.default_rng(env_seed),
+        reward_random_state=np.random.default_rng(reward_seed),
+    )
+
+    if psychopy_info is not None:
+        env.add_info(psychopy_info)
+
+    logger = SimulationLogger(
+        file_name, Clock(), participant_id=participant_id, task=task_name, run=run
+    )
+    logger.create()
+
+    win = Window()
+    env.setup(window=win, logger=logger, expose_last_stim=True)
+
+    pspy_run_task(env, logger, win=win, settings=settings, agent=agent, plugins=plugins)
+
+    events = logger.close()
+
+    # Same format as the files of the ExperimentLogger.
+    with open(file_name, "w") as f:
+        f.write(logger.sep.join(logger.categories) + "\n")
+        f.writelines(
+            logger.sep.join(row) + "\n"
+            for row in zip(*[events[ii] for ii in logger.categories])
+        )
+
+    return file_name
+
+
+def pspy_simulate_sessions(
+    task_name: str,
+    agents: List,
+    stimulus_sets: Union[int, List[int]] = 22,
+    outdir: str = "data/",
+    participant_ids: List[str] = None,
+    session: str = None,
+    run: int = 1,
+    key_dict: Dict = None,
+    n_workers: int = None,
+    random_state: Union[int, np.random.SeedSequence] = 1000,
+    plugins: Dict = plugin_registry,
+    overwrite: bool = False,
+    mp_context=None,
+) -> List[str]:
+    """
+    Simulates full PsychoPy sessions (using the psychopy-simulate render mode) of
+    many synthetic participants, e.g. for power analyses of fMRI designs, and writes
+    one BIDS events file per participant.
+
+    The settings and stimuli of each stimulus set are only created once and shared
+    by all participants with this set. Each participant gets its own copy of them
+    and of the plugins, as both are changed during a session.
+
+    Parameters
+    ----------
+    task_name : str
+        Name of a registered task.
+    agents : List
+        One agent per participant, needs to provide get_action, get_probs and update
+        (or get_rt_action). Agents are copied to the worker processes, so the given
+        objects are not updated if n_workers is not 1.
+    stimulus_sets : Union[int, List[int]], optional
+        The stimulus set (the seed of the task's configuration and stimuli), either
+        one for all participants, or one per participant, by default 22
+    outdir : str, optional
+        Where the events files are stored, by default "data/"
+    participant_ids : List[str], optional
+        Ids of the participants, by default consecutive numbers ("001", "002", ...)
+    session : str, optional
+        The session for the file names, by default None
+    run : int, optional
+        The run for the file names, by default 1
+    key_dict : Dict, optional
+        Mapping of keys to actions, passed to the task's get_psychopy_info,
+        by default None
+    n_workers : int, optional
+        Number of processes, if 1 everything runs in the current process, if None
+        one process per CPU is used, by default None
+    random_state : Union[int, np.random.SeedSequence], optional
+        Root seed of the environments' and rewards' random streams, by default 1000
+    plugins : Dict, optional
+        The plugins of pspy_run_task, by default plugin_registry
+    overwrite : bool, optional
+        If existing events files are overwritten, otherwise a FileExistsError is
+        raised before any session is simulated, by default False
+    mp_context : optional
+        Multiprocessing context of the process pool, by default None. With the
+        spawn or forkserver start methods (the default on Windows and macOS), the
+        workers only know tasks that are registered on import of rewardgym
+        (bundled or installed through an entry point). Tasks added at runtime (e.g.
+        with extend_task_registry) need the fork context.
+
+    Raises
+    ------
+    FileExistsError
+        If an events file exists already and overwrite is False.
+
+    Returns
+    -------
+    List[str]
+        The paths to the events files, one per participant.
+    """
+    n_participants = len(agents)
+
+    if isinstance(stimulus_sets, int):
+        stimulus_sets = [stimulus_sets] * n_participants
+
+    if participant_ids is None:
+        participant_ids = [f"{ii + 1:03d}" for ii in range(n_participants)]
+
+    if len(stimulus_sets) != n_participants or len(participant_ids) != n_participants:
+        raise ValueError("Need one stimulus set and participant id per agent.")
+
+    file_names = [
+        os.path.join(
+            outdir,
+            make_bids_name(
+                subid=participant_id,
+                session=session,
+                task=task_name,
+                run=run,
+                extension="events.tsv",
+            ),
+        )
+        for participant_id in participant_ids
+    ]
+
+    existing = [ff for ff in file_names if os.path.isfile(ff)]
+    if existing and not overwrite:
+        raise FileExistsError(
+            f"{len(existing)} events files exist already (e.g. {existing[0]}), use "
+            "overwrite=True to replace them."
+        )
+
+    os.makedirs(outdir, exist_ok=True)
+
+    shared = {
+        stim_set: _session_inputs(task_name, stim_set, key_dict)
+        for stim_set in set(stimulus_sets)
+    }
+    seeds = spawn_seeds(random_state, n_participants)
+
+    arguments = []
+    for agent, stim_set, participant_id, seed, file_name in zip(
+        agents, stimulus_sets, participant_ids, seeds, file_names
+    ):
+        arguments.append(
+            (
+                task_name,
+                agent,
+                *deepcopy(shared[stim_set]),
+                seed,
+                file_name,
+                participant_id,
+                run,
+                deepcopy(plugins),
+            )
+        )
+
+    if n_workers == 1 or n_participants == 0:
+        return [_simulate_session(*args) for args in arguments]
+
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp_context) as executor:
+        return list(executor.map(_simulate_session, *zip(*arguments)))
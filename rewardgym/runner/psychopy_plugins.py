@@ -5,11 +5,11 @@ from .psychopy_utils import update_psychopy_trials
 
 def draw_response_reminder(win, text_update, logger, reminder_duration=1.0):
     text_update.setAutoDraw(True)
-    win.flip()
+    logger.flip(win, "reminder")
     reminder_onset = logger.get_time()
     logger.wait(win=win, time=reminder_duration, start=reminder_onset)
     text_update.setAutoDraw(False)
-    win.flip()
+    logger.flip(win, "reminder")
 
     logger.log_event(
         {"event_type": "reminder", "expected_duration": reminder_duration},
@@ -44,7 +44,7 @@ def break_point(win, text_update, logger, settings, episode, countdown_cutoff=30
             seconds = int(time_left - minutes * 60)
             text_update.setText(break_text + f"{minutes}:{seconds:02d}")
             text_update.draw()
-            win.flip()
+            logger.flip(win, "break")
 
         logger.log_event(
             {"event_type": "break", "expected_duration": settings["break_duration"]},
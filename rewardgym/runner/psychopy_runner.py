@@ -47,6 +47,7 @@ def pspy_run_task(
     agent=None,
     n_episodes=None,
     plugins: Dict = plugin_registry,
+    return_frame_timing: bool = False,
 ):
     if settings is None:
         settings = get_configs(env.name)(random_state)
@@ -180,4 +181,13 @@ def pspy_run_task(
             countdown_cutoff=break_countdown_limit,
         )
 
+    if return_frame_timing:
+        # Per stimulus summary of the flip timing, if the logger records it.
+        if getattr(logger, "frame_timer", None) is not None:
+            frame_timing = logger.frame_timer.summary()
+        else:
+            frame_timing = None
+
+        return logger, env, agent, frame_timing
+
     return logger, env, agent
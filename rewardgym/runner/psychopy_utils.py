@@ -72,6 +72,8 @@ def pspy_set_up_experiment(outdir="data/"):
         "mode": ["behavior", "fmri"],
         "fullscreen": False,
         "instructions": True,
+        "frame_timing": False,
+        "log_writer": ["direct", "background"],
         "outdir": outdir,
     }
 
@@ -86,6 +88,8 @@ def pspy_set_up_experiment(outdir="data/"):
             "mode",
             "fullscreen",
             "instructions",
+            "frame_timing",
+            "log_writer",
             "outdir",
         ],
     )
@@ -0,0 +1,169 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from .tasks import get_configs, get_env
+from .utils import EpisodeRecorder, run_single_episode, spawn_seeds
+
+COLUMNS = ["participant", "episode", "state", "action", "reward", "condition"]
+
+
+def _simulate_participant(
+    task_name: str,
+    agent_factory: Callable,
+    participant: int,
+    n_episodes: int,
+    seed: np.random.SeedSequence,
+    conditions: Union[None, str, List],
+    step_reward: bool,
+    env_kwargs: Dict,
+) -> pd.DataFrame:
+    env_seed, agent_seed, reward_seed, config_seed = seed.spawn(4)
+
+    env = get_env(
+        task_name,
+        random_state=np.random.default_rng(env_seed),
+        reward_random_state=np.random.default_rng(reward_seed),
+        **env_kwargs,
+    )
+    agent = agent_factory(participant, env, np.random.default_rng(agent_seed))
+
+    if step_reward is None:
+        # Same default as pspy_run_task for tasks without the meta entry.
+        step_reward = env.info_dict.get("meta", {}).get(
+            "step_reward", env.name in ["two-step"]
+        )
+
+    if conditions == "configs":
+        settings = get_configs(task_name)(np.random.default_rng(config_seed))
+        condition_names = settings["condition"]
+        condition_dicts = [settings["condition_dict"][cn] for cn in condition_names]
+
+        if len(condition_names) < n_episodes:
+            raise ValueError(
+                f"The configuration of {task_name} has {len(condition_names)} "
+                f"trials, but {n_episodes} episodes were requested."
+            )
+    elif conditions is None:
+        condition_names = [None] * n_episodes
+        condition_dicts = condition_names
+    else:
+        condition_names = list(range(len(conditions)))
+        condition_dicts = conditions
+
+    recorder = EpisodeRecorder()
+
+    for episode in range(n_episodes):
+        run_single_episode(
+            env,
+            agent,
+            0,
+            condition_dicts[episode],
+            step_reward=step_reward,
+            recorder=recorder,
+            episode=episode,
+            condition_label=condition_names[episode],
+        )
+
+    data = recorder.to_pandas()
+    data.insert(0, "participant", participant)
+
+    return data[COLUMNS]
+
+
+def simulate_many(
+    task_name: str,
+    agent_factory: Callable,
+    n_participants: int,
+    n_episodes: int,
+    n_workers: int = None,
+    random_state: Union[int, np.random.SeedSequence] = 1000,
+    conditions: Union[None, str, List[Dict]] = None,
+    step_reward: bool = None,
+    env_kwargs: Dict = None,
+    mp_context=None,
+) -> pd.DataFrame:
+    """
+    Simulates many participants of a task, each in its own worker process.
+
+    Each participant gets a seed spawned from ``random_state``, which is split into
+    independent streams for the environment, the agent, the rewards and the
+    configuration, so results do not depend on the number of workers.
+
+    Parameters
+    ----------
+    task_name : str
+        Name of a registered task.
+    agent_factory : Callable
+        Called as ``agent_factory(participant, env, random_state)`` and returns the agent
+        of a participant. Has to be picklable (e.g. a module level function or a
+        ``functools.partial``) if ``n_workers`` is not 1.
+    n_participants : int
+        Number of simulated participants.
+    n_episodes : int
+        Number of episodes per participant.
+    n_workers : int, optional
+        Number of processes, if 1 everything runs in the current process, if None
+        one process per CPU is used, by default None
+    random_state : Union[int, np.random.SeedSequence], optional
+        Root seed of the simulation, by default 1000
+    conditions : Union[None, str, List[Dict]], optional
+        None for no conditions, "configs" to use the condition sequence of the task's
+        configuration (drawn per participant), or a list with one condition per
+        episode, by default None
+    step_reward : bool, optional
+        If all rewards should be triggered, if None the "step_reward" entry of the
+        task's "meta" info is used, if missing only the two-step task triggers all
+        rewards, by default None
+    env_kwargs : Dict, optional
+        Further keyword arguments of ``get_env``, by default None
+    mp_context : optional
+        Multiprocessing context of the process pool, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per step, with the columns participant, episode, state, action
+        (-1 for no action), reward and condition, see ``EpisodeRecorder``.
+    """
+    if (
+        conditions is not None
+        and conditions != "configs"
+        and len(conditions) < n_episodes
+    ):
+        raise ValueError(
+            f"Got {len(conditions)} conditions, but {n_episodes} episodes were "
+            "requested."
+        )
+
+    env_kwargs = {} if env_kwargs is None else env_kwargs
+    seeds = spawn_seeds(random_state, n_participants)
+
+    arguments = [
+        (
+            task_name,
+            agent_factory,
+            participant,
+            n_episodes,
+            seeds[participant],
+            conditions,
+            step_reward,
+            env_kwargs,
+        )
+        for participant in range(n_participants)
+    ]
+
+    if n_workers == 1 or n_participants == 0:
+        results = [_simulate_participant(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=mp_context
+        ) as executor:
+            results = list(executor.map(_simulate_participant, *zip(*arguments)))
+
+    if not results:
+        return pd.DataFrame(columns=COLUMNS)
+
+    return pd.concat(results, ignore_index=True)
@@ -1,6 +1,5 @@
 from itertools import permutations
 
-import matplotlib.font_manager
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
@@ -136,6 +135,8 @@ def mid_stimuli(
             padding=0,
         )
 
+        import matplotlib.font_manager
+
         offset = 30 if shape == "triangle_u" else 0
         matplotlib_font = matplotlib.font_manager.findfont("arial")
         fnt = ImageFont.truetype(matplotlib_font, 70)
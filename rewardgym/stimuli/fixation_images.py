@@ -1,12 +1,12 @@
-import matplotlib.pyplot as plt
 import numpy as np
 from PIL import Image, ImageDraw
 
 from .create_images import draw_centered_shape, draw_shape
 
-win_color = tuple([int(i * 255) for i in plt.cm.Set2.colors[0]])
-lose_color = tuple([int(i * 255) for i in plt.cm.Set2.colors[1]])
-zero_color = tuple([int(i * 255) for i in plt.cm.Set2.colors[5]])
+# Colors 0, 1 and 5 of matplotlib's Set2 palette, hard coded to not import matplotlib.
+win_color = (102, 194, 165)
+lose_color = (252, 141, 98)
+zero_color = (255, 217, 47)
 
 
 def fixation_cross(
@@ -1,3 +1,4 @@
+from .manifest import TaskManifest
 from .task_loader import TaskRegistry, get_configs, get_psychopy_info
 from .utils import get_env, get_task
 
@@ -16,5 +17,6 @@ __all__ = [
     "get_task",
     "FULLPOINTS",
     "get_psychopy_info",
+    "TaskManifest",
     "TaskRegistry",
 ]
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+
+MANIFEST_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """
+    The cache directory of rewardgym, set by the REWARDGYM_CACHE_DIR environment
+    variable, by default ~/.cache/rewardgym (or $XDG_CACHE_HOME/rewardgym).
+    """
+    if os.environ.get("REWARDGYM_CACHE_DIR"):
+        return Path(os.environ["REWARDGYM_CACHE_DIR"])
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "rewardgym"
+
+
+def source_hash(files: List[Union[str, Path]], extra: str = "") -> str:
+    """
+    Hash of the paths, modification times and sizes of the given files.
+
+    Parameters
+    ----------
+    files : List[Union[str, Path]]
+        Source files of a plugin, missing files are ignored.
+    extra : str, optional
+        Further identifying information, e.g. a package version, by default ""
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha1(extra.encode("utf-8"))
+
+    for ff in sorted(str(ff) for ff in files):
+        try:
+            stat = os.stat(ff)
+        except OSError:
+            continue
+        digest.update(f"{ff}:{stat.st_mtime_ns}:{stat.st_size};".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def task_metadata(registry: Dict) -> Dict:
+    """
+    Describes the tasks of a plugin registry (the output of register_task()),
+    without calling any of their handles.
+
+    Parameters
+    ----------
+    registry : Dict
+        Dictionary {task_name: task_handles}.
+
+    Returns
+    -------
+    Dict
+        For each task the available handles.
+    """
+    return {
+        name: {"handles": sorted(key for key, value in handles.items() if value)}
+        for name, handles in registry.items()
+    }
+
+
+def graph_metadata(handles: Dict) -> Dict:
+    """
+    Describes the graph of a single task, by calling its get_task().
+
+    Parameters
+    ----------
+    handles : Dict
+        The handles of the task.
+
+    Returns
+    -------
+    Dict
+        The number of nodes of the task graph, None if get_task() cannot be called
+        without arguments.
+    """
+    n_nodes = None
+    try:
+        n_nodes = len(handles["get_task"]()[0])
+    except Exception:
+        pass
+
+    return {"n_nodes": n_nodes}
+
+
+class TaskManifest:
+    """
+    On-disk cache of plugin information (e.g. the tasks a plugin provides), so that
+    task names and metadata are known without importing the plugins. Each entry
+    stores a hash of its source and is invalid as soon as the hash changes.
+    """
+
+    def __init__(self, path: Union[str, Path] = None):
+        """
+        Parameters
+        ----------
+        path : Union[str, Path], optional
+            The json file of the manifest, if None it is stored in the default cache
+            directory, by default None
+        """
+        if path is None:
+            path = default_cache_dir() / "task_manifest.json"
+
+        self.path = Path(path)
+        self._entries = self._read()
+        self._changed = False
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(content, dict) or content.get("version") != MANIFEST_VERSION:
+            return {}
+
+        return content.get("entries", {})
+
+    def get(self, key: str, hash_: str) -> Union[Dict, None]:
+        """The cached content of key, or None if there is none or it is outdated."""
+        entry = self._entries.get(key)
+
+        if entry is None or entry.get("hash") != hash_:
+            return None
+
+        return entry["content"]
+
+    def set(self, key: str, hash_: str, content: Dict, save: bool = True):
+        """
+        Stores the (json serializable) content of key. If save is False, the
+        manifest is only written with the next saved entry.
+        """
+        self._entries[key] = {"hash": hash_, "content": content}
+        self._changed = True
+
+        if save:
+            self.save()
+
+    def save(self):
+        """
+        Writes the manifest, if it was changed. The file is replaced atomically, so
+        that concurrent processes never read a partial file. Errors are ignored, the
+        cache is only an optimization.
+        """
+        if not self._changed:
+            return
+
+        # Keeps entries other processes wrote in the meantime.
+        self._entries = {**self._read(), **self._entries}
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": MANIFEST_VERSION, "entries": self._entries}, f, indent=1
+                )
+            os.replace(tmp_path, self.path)
+            self._changed = False
+        except OSError:
+            pass
@@ -1,10 +1,15 @@
+import ast
 import importlib
 import importlib.util
 import os
 import sys
 import types
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, List, NamedTuple, Union
+
+from .manifest import graph_metadata, source_hash, task_metadata
+
+ENTRY_POINT_GROUP = "rewardgym.tasks"
 
 
 def load_task_plugin(folder_path: Path, namespace_root: str = "rewardgym_tasks"):
@@ -42,18 +47,17 @@ def load_task_plugin(folder_path: Path, namespace_root: str = "rewardgym_tasks")
     return module
 
 
-def _discover_plugins(base_dir):
+def _plugin_folders(base_dir) -> List[Path]:
     """
-    Discover plugins in the given directory.
-    Returns a dict {task_name: task_class}.
+    Lists the task folders in the given directory that contain a plugin.py.
     """
-    task_registry = {}
     base_dir = Path(base_dir)
 
     if not base_dir.exists():
-        return task_registry
+        return []
 
-    for task_folder in os.listdir(base_dir):
+    folders = []
+    for task_folder in sorted(os.listdir(base_dir)):
         folder_path = base_dir / task_folder
         if not folder_path.is_dir():
             continue
@@ -61,24 +65,189 @@ def _discover_plugins(base_dir):
         if task_folder == "task_template" or "__" in task_folder:
             continue
 
-        plugin_path = folder_path / "plugin.py"
-        if not plugin_path.exists():
+        if not (folder_path / "plugin.py").exists():
             continue
 
-        try:
-            plugin_module = load_task_plugin(
-                folder_path, namespace_root="rewardgym_tasks"
+        folders.append(folder_path)
+
+    return folders
+
+
+def _load_plugin_registry(folder_path: Path) -> Dict:
+    """
+    Imports the plugin of a task folder and returns its {task_name: task_handles}.
+    """
+    plugin_module = load_task_plugin(folder_path, namespace_root="rewardgym_tasks")
+
+    if not hasattr(plugin_module, "register_task"):
+        raise AttributeError("No register_task() function defined")
+
+    return plugin_module.register_task()
+
+
+def _plugin_task_names(plugin_path: Path) -> Union[List[str], None]:
+    """
+    Reads the names of the tasks a plugin registers, without importing it.
+
+    Only works if register_task() returns a dictionary literal with string keys
+    (directly or through a variable assigned to one). Returns None otherwise.
+    """
+    try:
+        tree = ast.parse(Path(plugin_path).read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    register_task = None
+    assignments = {}
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "register_task":
+            register_task = node
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict):
+            assignments.update(
+                {tg.id: node.value for tg in node.targets if isinstance(tg, ast.Name)}
+            )
+
+    if register_task is None:
+        return None
+
+    for node in ast.walk(register_task):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict):
+            assignments.update(
+                {tg.id: node.value for tg in node.targets if isinstance(tg, ast.Name)}
             )
 
-            if not hasattr(plugin_module, "register_task"):
-                raise AttributeError("No register_task() function defined")
+    names = []
+    for node in ast.walk(register_task):
+        if not isinstance(node, ast.Return):
+            continue
+
+        value = node.value
+        if isinstance(value, ast.Name):
+            value = assignments.get(value.id)
+
+        if not isinstance(value, ast.Dict):
+            return None
+
+        for key in value.keys:
+            if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+                return None
+            names.append(key.value)
+
+    return list(dict.fromkeys(names)) or None
+
+
+class EntryPointPlugin(NamedTuple):
+    """
+    A task plugin installed by a package, through an entry point in the group
+    ``rewardgym.tasks``. The name of the entry point is the name of the task, its
+    value a module with a register_task() function, or the function itself, e.g.:
+
+    .. code-block:: toml
+
+        [project.entry-points."rewardgym.tasks"]
+        my-task = "my_package.plugin"
+    """
+
+    name: str
+    value: str
+    group: str = ENTRY_POINT_GROUP
+
+    def load(self):
+        module, _, attributes = self.value.partition(":")
+        plugin = importlib.import_module(module.strip())
+
+        for attr in filter(None, attributes.strip().split(".")):
+            plugin = getattr(plugin, attr)
+
+        return plugin
+
+
+def _environment_hash() -> str:
+    """Changes when distributions are (un)installed in any directory on sys.path."""
+    return source_hash([pp for pp in sys.path if pp and os.path.isdir(pp)])
+
+
+def _entry_point_plugins(group=ENTRY_POINT_GROUP, manifest=None) -> List:
+    """
+    Lists the task plugins installed through entry points. If a manifest is given,
+    the list is cached, such that importlib.metadata is only used after packages
+    were (un)installed.
+    """
+    key = f"entry_points:{group}"
+
+    if manifest is not None:
+        env_hash = _environment_hash()
+        cached = manifest.get(key, env_hash)
+        if cached is not None:
+            return [EntryPointPlugin(nm, val, group) for nm, val in cached.items()]
+
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
 
-            registry = plugin_module.register_task()
+    if hasattr(entry_points, "select"):
+        entry_points = entry_points.select(group=group)
+    else:
+        entry_points = entry_points.get(group, [])
+
+    plugins = [EntryPointPlugin(ep.name, ep.value, group) for ep in entry_points]
+
+    if manifest is not None:
+        # Not saved right away, so that importing rewardgym does not write the
+        # manifest. It is written with the first imported plugin.
+        manifest.set(key, env_hash, {pl.name: pl.value for pl in plugins}, save=False)
+
+    return plugins
+
+
+def _source_key(source) -> str:
+    if isinstance(source, EntryPointPlugin):
+        return f"entry_point:{source.group}:{source.value}"
+    return f"folder:{Path(source).resolve()}"
+
+
+def _source_hash(source) -> str:
+    if isinstance(source, EntryPointPlugin):
+        # Installed plugins are only invalidated when the installation changes.
+        return _environment_hash()
+    return source_hash(list(Path(source).rglob("*.py")))
+
+
+def _load_source(source) -> Dict:
+    """
+    Imports a plugin (a folder or an entry point) and returns its registry.
+    """
+    if not isinstance(source, EntryPointPlugin):
+        return _load_plugin_registry(source)
+
+    plugin = source.load()
+    register_task = getattr(plugin, "register_task", plugin)
+
+    if not callable(register_task):
+        raise AttributeError("No register_task() function defined")
+
+    return register_task()
+
+
+def _discover_plugins(base_dir):
+    """
+    Discover plugins in the given directory.
+    Returns a dict {task_name: task_class}.
+
+    All plugins are imported, use ``TaskRegistry.from_directory`` to only import
+    them on first use.
+    """
+    task_registry = {}
+
+    for folder_path in _plugin_folders(base_dir):
+        try:
+            registry = _load_plugin_registry(folder_path)
             task_registry.update(registry)
 
             print(f"Registered task: {list(registry.keys())[0]}")
         except Exception as e:
-            print(f"[WARN] Could not register task '{task_folder}': {e}")
+            print(f"[WARN] Could not register task '{folder_path.name}': {e}")
 
     return task_registry
 
@@ -122,17 +291,19 @@ def _discover_external_plugins(task_folder: Union[str, Path]) -> Dict:
 def get_task(task_name, *args, **kwargs):
     from .. import _task_registry
 
-    if task_name not in _task_registry:
+    task = _task_registry.get(task_name)
+    if task is None:
         raise ValueError(f"Task '{task_name}' not registered.")
-    return _task_registry[task_name]["get_task"](*args, **kwargs)
+    return task["get_task"](*args, **kwargs)
 
 
 def get_configs(task_name):
     from .. import _task_registry
 
-    if task_name not in _task_registry:
+    task = _task_registry.get(task_name)
+    if task is None:
         raise ValueError(f"Task '{task_name}' not registered.")
-    get_configs_func = _task_registry[task_name]["get_configs"]
+    get_configs_func = task["get_configs"]
     if get_configs_func is None:
         raise NotImplementedError(f"get_configs not implemented for {task_name}")
     return get_configs_func
@@ -141,9 +312,10 @@ def get_configs(task_name):
 def get_psychopy_info(task_name, **kwargs):
     from .. import _task_registry
 
-    if task_name not in _task_registry:
+    task = _task_registry.get(task_name)
+    if task is None:
         raise ValueError(f"Task '{task_name}' not registered.")
-    get_configs_func = _task_registry[task_name]["get_psychopy_info"]
+    get_configs_func = task["get_psychopy_info"]
     if get_configs_func is None:
         raise NotImplementedError(f"get_psychopy_info not implemented for {task_name}")
     return get_configs_func(**kwargs)
@@ -152,9 +324,10 @@ def get_psychopy_info(task_name, **kwargs):
 def get_pygame_info(task_name, **kwargs):
     from .. import _task_registry
 
-    if task_name not in _task_registry:
+    task = _task_registry.get(task_name)
+    if task is None:
         raise ValueError(f"Task '{task_name}' not registered.")
-    get_configs_func = _task_registry[task_name]["get_pygame_info"]
+    get_configs_func = task["get_pygame_info"]
     if get_configs_func is None:
         raise NotImplementedError(f"get_pygame_info not implemented for {task_name}")
     return get_configs_func(**kwargs)
@@ -163,9 +336,10 @@ def get_pygame_info(task_name, **kwargs):
 def get_instructions_psychopy(task_name, **kwargs):
     from .. import _task_registry
 
-    if task_name not in _task_registry:
+    task = _task_registry.get(task_name)
+    if task is None:
         raise ValueError(f"Task '{task_name}' not registered.")
-    get_configs_func = _task_registry[task_name]["instructions_psychopy"]
+    get_configs_func = task["instructions_psychopy"]
     if get_configs_func is None:
         raise NotImplementedError(
             f"instructions_psychopy not implemented for {task_name}"
@@ -174,17 +348,172 @@ def get_instructions_psychopy(task_name, **kwargs):
 
 
 class TaskRegistry:
-    """A composition-based task registry with conflict resolution."""
+    """
+    A composition-based task registry with conflict resolution.
+
+    Tasks can be registered lazily, by the folder of their plugin or by an entry
+    point. The plugin is only imported when one of its tasks is accessed for the
+    first time. With a ``TaskManifest``, the tasks of each plugin and their metadata
+    are cached on disk.
+    """
 
-    def __init__(self, initial_data=None):
+    def __init__(self, initial_data=None, manifest=None):
         self._data = {} if initial_data is None else dict(initial_data)
+        self._pending = {}
+        self._sources = {}
+        self.manifest = manifest
+
+    @classmethod
+    def from_directory(cls, base_dir, lazy=True, manifest=None):
+        """
+        Creates a registry of the task plugins in a directory.
+
+        Parameters
+        ----------
+        base_dir : Union[str, Path]
+            Directory containing one folder (with a plugin.py) per task.
+        lazy : bool, optional
+            If True, plugins are indexed by their task names and imported on first
+            use, by default True
+        manifest : TaskManifest, optional
+            Cache of the plugins' tasks, by default None
+
+        Returns
+        -------
+        TaskRegistry
+            The registry.
+        """
+        if not lazy:
+            return cls(_discover_plugins(base_dir), manifest=manifest)
+
+        registry = cls(manifest=manifest)
+        for folder_path in _plugin_folders(base_dir):
+            registry.add_plugin(folder_path)
+
+        return registry
+
+    def add_plugin(self, folder_path, overwrite=True):
+        """
+        Registers the tasks of a plugin folder without importing it. If the task names
+        are neither cached nor can be read from the plugin source, the plugin is
+        imported right away.
+        """
+        folder_path = Path(folder_path)
+        names = list(self._cached_tasks(folder_path))
+
+        if not names:
+            names = _plugin_task_names(folder_path / "plugin.py")
+
+        self._add_source(folder_path, names, overwrite)
+
+    def add_entry_points(self, group=ENTRY_POINT_GROUP, overwrite=False):
+        """
+        Registers the task plugins installed through entry points, without importing
+        them, see ``EntryPointPlugin``. By default, tasks that are already registered
+        are not overwritten.
+        """
+        for plugin in _entry_point_plugins(group, self.manifest):
+            names = list(self._cached_tasks(plugin)) or [plugin.name]
+            self._add_source(plugin, names, overwrite)
+
+    def _cached_tasks(self, source) -> Dict:
+        if self.manifest is None or source is None:
+            return {}
+
+        tasks = self.manifest.get(_source_key(source), _source_hash(source))
+        return {} if tasks is None else tasks
+
+    def _add_source(self, source, names, overwrite):
+        if names is None:
+            registry = self._import_source(source)
+            if registry is not None:
+                self.extend(registry, overwrite=overwrite)
+                self._sources.update(
+                    {nm: source for nm in registry if self._data[nm] is registry[nm]}
+                )
+            return
+
+        for name in names:
+            if name in self and not overwrite:
+                continue
+            self._data.pop(name, None)
+            self._pending[name] = source
+            self._sources[name] = source
+
+    def _import_source(self, source):
+        try:
+            registry = _load_source(source)
+        except Exception as e:
+            print(f"[WARN] Could not register task '{source.name}': {e}")
+            return None
+
+        if self.manifest is not None and not self._cached_tasks(source):
+            self.manifest.set(
+                _source_key(source), _source_hash(source), task_metadata(registry)
+            )
+
+        return registry
+
+    def _load(self, key):
+        source_key = _source_key(self._pending[key])
+        names = [
+            nm for nm, sc in self._pending.items() if _source_key(sc) == source_key
+        ]
+        source = self._pending[key]
+
+        for name in names:
+            del self._pending[name]
+
+        registry = self._import_source(source)
+
+        if registry is None:
+            return
+
+        for name, handles in registry.items():
+            if name in names or name not in self:
+                self._data[name] = handles
+                self._sources[name] = source
+
+    def metadata(self, key):
+        """
+        Metadata of a task, its available handles and the number of nodes of its
+        graph (None if unknown). Taken from the manifest, if possible. Otherwise the
+        graph of this task (and only this task) is built and stored in the manifest.
+
+        Raises
+        ------
+        KeyError
+            If the task is not registered.
+        """
+        metadata = self._cached_tasks(self._sources.get(key)).get(key)
+
+        if metadata is not None and "n_nodes" in metadata:
+            return metadata
+
+        task = self.get(key)
+        if task is None:
+            raise KeyError(key)
+
+        metadata = {**task_metadata({key: task})[key], **graph_metadata(task)}
+
+        # Importing the plugin (in get) stored its tasks in the manifest.
+        source = self._sources.get(key)
+        tasks = self._cached_tasks(source)
+        if key in tasks:
+            self.manifest.set(
+                _source_key(source), _source_hash(source), {**tasks, key: metadata}
+            )
+
+        return metadata
 
     def extend(self, other_dict, overwrite=True):
         """Extend the registry with another dictionary."""
         for key, value in other_dict.items():
-            if key in self._data:
+            if key in self:
                 if overwrite:
                     print(f"[WARN] Task '{key}' already registered, overwriting.")
+                    self._pending.pop(key, None)
+                    self._sources.pop(key, None)
                     self._data[key] = value
                 else:
                     print(f"[WARN] Task '{key}' already registered, skipping.")
@@ -193,28 +522,48 @@ class TaskRegistry:
 
     # Delegate dictionary methods to self._data
     def __getitem__(self, key):
+        if key in self._pending:
+            self._load(key)
         return self._data[key]
 
     def __setitem__(self, key, value):
+        self._pending.pop(key, None)
+        self._sources.pop(key, None)
         self._data[key] = value
 
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._data.pop(key, None)
+        self._pending.pop(key, None)
+        self._sources.pop(key, None)
+
     def __contains__(self, key):
-        return key in self._data
+        return key in self._data or key in self._pending
 
     def get(self, key, default=None):
+        if key in self._pending:
+            self._load(key)
         return self._data.get(key, default)
 
     def keys(self):
-        return self._data.keys()
+        return list(self._data.keys()) + list(self._pending.keys())
+
+    def _load_all(self):
+        while self._pending:
+            self._load(next(iter(self._pending)))
 
     def values(self):
+        self._load_all()
         return self._data.values()
 
     def items(self):
+        self._load_all()
         return self._data.items()
 
     def __len__(self):
-        return len(self._data)
+        return len(self._data) + len(self._pending)
 
     def __repr__(self):
-        return repr(self._data)
+        pending = {key: "<not loaded>" for key in self._pending}
+        return repr({**self._data, **pending})
@@ -1,8 +1,8 @@
-from typing import Any, List, Literal, Tuple, Union
+from typing import Any, Dict, List, Literal, Tuple, Union
 
 import numpy as np
 
-from ..environments import BaseEnv, PsychopyEnv, RenderEnv
+from ..utils import check_random_state
 from .task_loader import get_task
 
 
@@ -17,14 +17,21 @@ def get_env(
     ],
     render_backend: Literal["pygame", "psychopy", "psychopy-simulate"] = None,
     random_state: Union[int, np.random.Generator] = 1000,
+    reward_random_state: Union[int, np.random.Generator] = None,
     **kwargs,
 ):
+    from ..environments import BaseEnv, PsychopyEnv, RenderEnv
+
+    if reward_random_state is None:
+        reward_random_state = random_state
+
     environment_graph, reward_structure, info_dict = get_task(
         task_name,
         render_backend=render_backend,
-        random_state=random_state,
+        random_state=reward_random_state,
     )
 
+    reduced_actions = None
     if "meta" in info_dict.keys():
         if "reduced_actions" in info_dict["meta"].keys():
             reduced_actions = info_dict["meta"]["reduced_actions"]
@@ -115,18 +122,146 @@ def check_conditions_not_following_substring(
         Returns True if no strings containing substrings from not_following appear within the window length
         after any element in condition_list, False otherwise.
     """
-    for n in range(len(condition_list)):
-        # Check if the current element contains any substring from not_following
-        if any(substring in condition_list[n] for substring in not_following):
-            # Check the elements within the window for the presence of not_following substrings
-            if any(
-                any(substring in condition_list[k] for substring in not_following)
-                for k in range(n + 1, min(n + 1 + window_length, len(condition_list)))
-            ):
+    # Every distinct label is only scanned for the substrings once. A violation
+    # exists, if two consecutive matching elements are at most window_length apart.
+    # Use encode_conditions and check_encoded_not_following to check many lists.
+    matches = {}
+    last_match = None
+
+    for n, condition in enumerate(condition_list):
+        if condition not in matches:
+            matches[condition] = any(sub in condition for sub in not_following)
+
+        if matches[condition]:
+            if last_match is not None and n - last_match <= window_length:
                 return False
+            last_match = n
+
     return True
 
 
+def encode_conditions(
+    condition_list: Union[List[Any], List[List[Any]]], labels: List[Any] = None
+) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Maps conditions to integer codes, so that constraints can be checked with array
+    operations, see ``check_encoded_not_following``.
+
+    Parameters
+    ----------
+    condition_list : Union[List[Any], List[List[Any]]]
+        A list of (hashable) conditions, or a list of equally long condition lists
+        to encode many candidate sequences at once.
+    labels : List[Any], optional
+        The labels to encode with, the code of a condition is its index in labels.
+        If None, the unique conditions in order of appearance, by default None
+
+    Returns
+    -------
+    Tuple[np.ndarray, List[Any]]
+        The codes, with shape (n,) or (n_sequences, n), and the labels.
+
+    Raises
+    ------
+    ValueError
+        If a condition is not part of labels.
+    """
+    sequences = [condition_list] if _is_single_sequence(condition_list) else None
+    sequences = condition_list if sequences is None else sequences
+
+    if labels is None:
+        labels = list(dict.fromkeys(cc for seq in sequences for cc in seq))
+
+    lookup = {lb: n for n, lb in enumerate(labels)}
+
+    try:
+        codes = np.array(
+            [[lookup[cc] for cc in seq] for seq in sequences], dtype=np.int64
+        )
+    except KeyError as err:
+        raise ValueError(f"Condition {err} is not part of the labels.") from None
+
+    codes = codes.reshape(len(sequences), -1)
+
+    if sequences is not condition_list:
+        codes = codes[0]
+
+    return codes, labels
+
+
+def _is_single_sequence(condition_list) -> bool:
+    return not (
+        len(condition_list) > 0
+        and all(isinstance(seq, (list, tuple, np.ndarray)) for seq in condition_list)
+    )
+
+
+def condition_mask(
+    labels: List[Any], not_following: List[Any] = None, substrings: List[str] = None
+) -> np.ndarray:
+    """
+    Boolean mask of the labels that are part of a not-following constraint.
+
+    Parameters
+    ----------
+    labels : List[Any]
+        The labels of the encoding, see ``encode_conditions``.
+    not_following : List[Any], optional
+        Conditions that may not follow each other, by default None
+    substrings : List[str], optional
+        Substrings, labels containing any of them may not follow each other, by default None
+
+    Returns
+    -------
+    np.ndarray
+        True for every label in not_following or containing one of the substrings.
+    """
+    not_following = [] if not_following is None else not_following
+    substrings = [] if substrings is None else substrings
+
+    return np.array(
+        [
+            lb in not_following
+            or (isinstance(lb, str) and any(sub in lb for sub in substrings))
+            for lb in labels
+        ],
+        dtype=bool,
+    )
+
+
+def check_encoded_not_following(
+    codes: np.ndarray, mask: np.ndarray, window_length: int = 1
+) -> Union[bool, np.ndarray]:
+    """
+    Vectorized version of ``check_conditions_not_following`` for encoded conditions.
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Condition codes, of a single sequence (n,) or of many sequences (n_sequences, n).
+    mask : np.ndarray
+        Boolean mask of the codes that may not follow each other, see ``condition_mask``.
+    window_length : int, optional
+        The length of the window to check after each element, by default 1.
+
+    Returns
+    -------
+    Union[bool, np.ndarray]
+        True if no masked condition follows another one within the window, either
+        a single value or one per sequence.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    members = np.asarray(mask, dtype=bool)[codes]
+
+    valid = np.ones(members.shape[:-1], dtype=bool)
+
+    # Compares shifted views of the sequences, once per lag within the window.
+    for lag in range(1, min(window_length, members.shape[-1] - 1) + 1):
+        valid &= ~np.any(members[..., :-lag] & members[..., lag:], axis=-1)
+
+    return bool(valid) if codes.ndim == 1 else valid
+
+
 def check_conditions_present(
     condition_list: List[Any], conditions_required: List[Any]
 ) -> bool:
@@ -187,3 +322,215 @@ def check_condition_present_or(
     return any(
         [check_conditions_present(condition_list, cr) for cr in condition_required]
     )
+
+
+def generate_condition_sequence(
+    conditions: Union[List[Any], Dict[Any, int]],
+    not_following: Union[List[Any], List[List[Any]]] = None,
+    window_length: int = 1,
+    not_following_substring: Union[List[str], List[List[str]]] = None,
+    substring_window_length: int = 1,
+    conditions_required: List[Any] = None,
+    condition_required_or: Tuple[List] = None,
+    random_state: Union[int, np.random.Generator] = None,
+    max_backtracks: int = 10000,
+    n_restarts: int = 10,
+) -> List[Any]:
+    """
+    Constructs a random order of the given conditions that fulfills the constraints
+    of ``check_conditions_not_following`` and ``check_conditions_not_following_substring``,
+    instead of shuffling until a valid order is found.
+
+    The sequence is built position by position with backtracking. Candidates are
+    tried in a random order weighted by their remaining count, and partial sequences
+    are pruned as soon as the remaining members of a constraint group cannot be
+    spaced out anymore. Valid orders are random, but not exactly uniformly distributed.
+
+    Parameters
+    ----------
+    conditions : Union[List[Any], Dict[Any, int]]
+        The conditions to order, either a list (with repetitions) or a dictionary
+        mapping each condition to its number of occurrences.
+    not_following : Union[List[Any], List[List[Any]]], optional
+        Conditions that may not follow each other within window_length, or a list of
+        such groups, by default None
+    window_length : int, optional
+        Window of not_following, by default 1
+    not_following_substring : Union[List[str], List[List[str]]], optional
+        Substrings, conditions containing any of them may not follow each other within
+        substring_window_length, or a list of such groups, by default None
+    substring_window_length : int, optional
+        Window of not_following_substring, by default 1
+    conditions_required : List[Any], optional
+        Conditions that have to be present, see ``check_conditions_present``, by default None
+    condition_required_or : Tuple[List], optional
+        Alternatives of required conditions, see ``check_condition_present_or``, by default None
+    random_state : Union[int, np.random.Generator], optional
+        Seed or random number generator, by default None
+    max_backtracks : int, optional
+        Number of backtracking steps after which the search is restarted, by default 10000
+    n_restarts : int, optional
+        Number of restarts before giving up, by default 10
+
+    Returns
+    -------
+    List[Any]
+        An order of the conditions fulfilling all constraints.
+
+    Raises
+    ------
+    ValueError
+        If the constraints cannot be fulfilled.
+    RuntimeError
+        If no valid order was found within the search budget.
+    """
+    if isinstance(conditions, dict):
+        labels = list(conditions.keys())
+        counts = [int(conditions[lb]) for lb in labels]
+    else:
+        labels = list(dict.fromkeys(conditions))
+        counts = [conditions.count(lb) for lb in labels]
+
+    if conditions_required is not None and not check_conditions_present(
+        labels, conditions_required
+    ):
+        raise ValueError("Required conditions are not part of the conditions.")
+
+    if condition_required_or is not None and not check_condition_present_or(
+        labels, condition_required_or
+    ):
+        raise ValueError("None of the alternative required conditions is present.")
+
+    # The members of each group are selected as in the checks (condition_mask).
+    groups, windows = [], []
+    for group in _as_groups(not_following):
+        mask = condition_mask(labels, not_following=group)
+        groups.append({int(n) for n in np.flatnonzero(mask)})
+        windows.append(window_length)
+    for group in _as_groups(not_following_substring):
+        mask = condition_mask(labels, substrings=group)
+        groups.append({int(n) for n in np.flatnonzero(mask)})
+        windows.append(substring_window_length)
+
+    rng = check_random_state(random_state)
+    n_total = sum(counts)
+    label_groups = [
+        [g for g, members in enumerate(groups) if n in members]
+        for n in range(len(labels))
+    ]
+
+    for _ in range(n_restarts):
+        sequence = _search_sequence(
+            counts, groups, windows, label_groups, n_total, rng, max_backtracks
+        )
+        if sequence is not None:
+            return [labels[n] for n in sequence]
+
+    raise RuntimeError(
+        f"No valid condition order found after {n_restarts} restarts, "
+        "consider increasing max_backtracks."
+    )
+
+
+def _as_groups(not_following) -> List[List[Any]]:
+    if not not_following:
+        return []
+    if all(isinstance(group, (list, tuple, set)) for group in not_following):
+        return [list(group) for group in not_following]
+    return [list(not_following)]
+
+
+def _search_sequence(
+    counts, groups, windows, label_groups, n_total, rng, max_backtracks
+):
+    """
+    Depth-first search for a valid order, returns None if the backtracking budget
+    is exhausted and raises a ValueError if the search space is exhausted.
+    """
+    counts = list(counts)
+    remaining = [sum(counts[n] for n in members) for members in groups]
+    last = [-np.inf] * len(groups)
+
+    def _feasible(position):
+        # The remaining members of a group need window + 1 positions each.
+        for g, window in enumerate(windows):
+            if remaining[g] == 0:
+                continue
+            first = max(position, last[g] + window + 1)
+            if first + (remaining[g] - 1) * (window + 1) > n_total - 1:
+                return False
+        return True
+
+    def _candidates(position):
+        options = [
+            n
+            for n, count in enumerate(counts)
+            if count > 0
+            and all(position - last[g] > windows[g] for g in label_groups[n])
+        ]
+        # Members of a group block the positions after them. When the group is
+        # available its members are boosted, such that the group takes the share of
+        # unblocked positions it needs (which tends to 1 for tight constraints).
+        n_left = n_total - position
+        boost = [
+            (n_left - remaining[g])
+            / max(n_left - (windows[g] + 1) * remaining[g], 1e-12)
+            for g in range(len(groups))
+        ]
+        weights = np.array(
+            [
+                counts[n] * max([boost[g] for g in label_groups[n]] + [1])
+                for n in options
+            ]
+        )
+        # Weighted random order (Efraimidis-Spirakis keys).
+        keys = rng.random(len(options)) ** (1 / weights)
+        return [options[n] for n in np.argsort(-keys, kind="stable")]
+
+    sequence, saved = [], []
+    stack = [[_candidates(0), 0]] if n_total > 0 else []
+    backtracks = 0
+
+    while len(sequence) < n_total:
+        frame = stack[-1]
+
+        if frame[1] >= len(frame[0]):
+            stack.pop()
+            if not stack:
+                raise ValueError("The constraints cannot be fulfilled.")
+
+            backtracks += 1
+            if backtracks > max_backtracks:
+                return None
+
+            label = sequence.pop()
+            counts[label] += 1
+            for g, previous in saved.pop():
+                last[g] = previous
+                remaining[g] += 1
+            continue
+
+        label = frame[0][frame[1]]
+        frame[1] += 1
+
+        position = len(sequence)
+        sequence.append(label)
+        counts[label] -= 1
+        saved.append([(g, last[g]) for g in label_groups[label]])
+        for g in label_groups[label]:
+            last[g] = position
+            remaining[g] -= 1
+
+        if len(sequence) == n_total:
+            break
+
+        if _feasible(position + 1):
+            stack.append([_candidates(position + 1), 0])
+        else:
+            sequence.pop()
+            counts[label] += 1
+            for g, previous in saved.pop():
+                last[g] = previous
+                remaining[g] += 1
+
+    return sequence
@@ -1,7 +1,15 @@
-from typing import Any, Dict, Union
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
 
 import yaml
 
+from .manifest import default_cache_dir
+
 
 def load_yaml(yaml_path: Union[str]) -> Dict[str, Any]:
     with open(yaml_path, "r") as f:
@@ -39,10 +47,146 @@ def load_environment_graph(raw_data: Dict):
 
 def load_task_from_yaml(
     yaml_path: Union[str],
+    cache: bool = False,
+    cache_dir: Union[str, Path] = None,
 ) -> Any:
+    """
+    Loads the meta information and environment graph of a task from a yaml file.
+
+    Parameters
+    ----------
+    yaml_path : Union[str]
+        Path to the yaml file.
+    cache : bool, optional
+        If True, the parsed task is stored in (and on subsequent calls read from)
+        the graph cache, see ``yaml_cache_path``, by default False
+    cache_dir : Union[str, Path], optional
+        Root of the graph cache, by default the rewardgym cache directory
+
+    Returns
+    -------
+    Tuple[Dict, Dict]
+        The meta information and the environment graph.
+    """
+    if not cache:
+        return _parse_task_yaml(yaml_path)
+
+    entry = yaml_cache_path(yaml_path, cache_dir)
+
+    if not entry.exists():
+        _write_cache_entry(entry, yaml_path)
+
+    with open(entry / "task.pkl", "rb") as f:
+        return pickle.load(f)
+
+
+def load_compiled_task_from_yaml(
+    yaml_path: Union[str],
+    cache_dir: Union[str, Path] = None,
+) -> Tuple[Dict, Dict, Any]:
+    """
+    Loads a task from a yaml file together with its compiled graph (the transition
+    tables, see ``CompiledGraph``), through the graph cache. The tables are memory
+    mapped, so that worker processes loading the same task share them.
+
+    Parameters
+    ----------
+    yaml_path : Union[str]
+        Path to the yaml file.
+    cache_dir : Union[str, Path], optional
+        Root of the graph cache, by default the rewardgym cache directory
+
+    Returns
+    -------
+    Tuple[Dict, Dict, CompiledGraph]
+        The meta information, the environment graph and the compiled graph, which
+        can be passed to ``BaseEnv.compile``.
+
+    Raises
+    ------
+    ValueError
+        If the graph cannot be compiled, see ``CompiledGraph.from_graph``.
+    """
+    from ..environments import CompiledGraph
+
+    entry = yaml_cache_path(yaml_path, cache_dir)
+
+    if not entry.exists():
+        _write_cache_entry(entry, yaml_path)
+
+    if not (entry / "compiled").exists():
+        raise ValueError(f"The graph of {yaml_path} cannot be compiled.")
+
+    meta, graph = load_task_from_yaml(yaml_path, cache=True, cache_dir=cache_dir)
+
+    return meta, graph, CompiledGraph.load(entry / "compiled")
+
+
+def yaml_cache_path(
+    yaml_path: Union[str, Path], cache_dir: Union[str, Path] = None
+) -> Path:
+    """
+    Directory of a yaml file in the graph cache, named after the file and a hash of
+    its (absolute) path and content, so that changed files get a new entry.
+
+    Parameters
+    ----------
+    yaml_path : Union[str, Path]
+        Path to the yaml file.
+    cache_dir : Union[str, Path], optional
+        Root of the graph cache, by default the "graphs" folder in the rewardgym
+        cache directory (REWARDGYM_CACHE_DIR).
+
+    Returns
+    -------
+    Path
+        The cache directory of the file (which might not exist yet).
+    """
+    yaml_path = Path(yaml_path).resolve()
+    cache_dir = default_cache_dir() / "graphs" if cache_dir is None else cache_dir
+
+    digest = hashlib.sha1(str(yaml_path).encode("utf-8"))
+    digest.update(yaml_path.read_bytes())
+
+    return Path(cache_dir) / f"{yaml_path.stem}-{digest.hexdigest()[:16]}"
+
+
+def _parse_task_yaml(yaml_path):
     raw = load_yaml(yaml_path=yaml_path)
 
     graph = load_environment_graph(raw["graph"])
     meta = {"meta": raw["meta"]}
 
     return meta, graph
+
+
+def _write_cache_entry(entry: Path, yaml_path):
+    from ..environments import BaseEnv, CompiledGraph
+
+    meta, graph = _parse_task_yaml(yaml_path)
+    full_graph, skip_nodes = BaseEnv._unpack_graph(graph)
+
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    # Written to a temporary directory first, so that concurrent processes only
+    # ever see complete entries.
+    tmp_dir = Path(tempfile.mkdtemp(dir=entry.parent, prefix=f".{entry.name}-"))
+
+    try:
+        with open(tmp_dir / "task.pkl", "wb") as f:
+            pickle.dump((meta, graph), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        try:
+            compiled = CompiledGraph.from_graph(graph, full_graph, skip_nodes)
+        except ValueError:
+            # Graphs that cannot be compiled (e.g. non-integer nodes) are only parsed.
+            compiled = None
+
+        if compiled is not None:
+            compiled.save(tmp_dir / "compiled")
+
+        os.replace(tmp_dir, entry)
+    except OSError:
+        if not entry.exists():
+            raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
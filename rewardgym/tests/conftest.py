@@ -0,0 +1,62 @@
+import pytest
+
+import rewardgym
+from rewardgym.reward_classes import BaseReward
+from rewardgym.tasks import TaskManifest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps the caches (task manifest, compiled graphs) of each test separate."""
+    cache = tmp_path / "rewardgym-cache"
+    monkeypatch.setenv("REWARDGYM_CACHE_DIR", str(cache))
+    monkeypatch.setattr(
+        rewardgym._task_registry,
+        "manifest",
+        TaskManifest(cache / "task_manifest.json"),
+    )
+
+    return cache
+
+
+@pytest.fixture
+def register_task():
+    """Registers tasks in the global registry, the registrations are undone after
+    the test."""
+    registry = rewardgym._task_registry
+    previous = {}
+
+    def register(name, get_task, get_configs, get_psychopy_info=None):
+        if name not in previous:
+            previous[name] = registry.get(name)
+
+        handles = {"get_task": get_task, "get_configs": get_configs}
+        if get_psychopy_info is not None:
+            handles["get_psychopy_info"] = get_psychopy_info
+
+        registry[name] = handles
+
+    yield register
+
+    for name, handles in previous.items():
+        if handles is None:
+            del registry[name]
+        else:
+            registry[name] = handles
+
+
+@pytest.fixture
+def toy_get_task():
+    """Returns a get_task handle for a graph, with two rewarded terminal states."""
+
+    def make(graph):
+        def get_task(render_backend=None, random_state=None):
+            rewards = {
+                1: BaseReward([1, 0], p=[0.7, 0.3], random_state=random_state),
+                2: BaseReward([1, 0], p=[0.3, 0.7], random_state=random_state),
+            }
+            return graph, rewards, {}
+
+        return get_task
+
+    return make
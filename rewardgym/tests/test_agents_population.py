@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from rewardgym.agents import base_agent, population_agents
+from rewardgym.environments import VectorBaseEnv
+
+
+def _transitions(n_steps=60, n_states=4, n_actions=3, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n_steps):
+        yield (
+            int(rng.integers(n_states)),
+            int(rng.integers(n_actions)),
+            float(rng.normal()),
+            bool(rng.random() < 0.3),
+            int(rng.integers(n_states)),
+        )
+
+
+@pytest.mark.parametrize("eligibility", [False, True])
+def test_population_matches_single_agents(eligibility):
+    lr_pos = np.array([0.1, 0.5, 0.9])
+    lr_neg = np.array([0.3, 0.5, 0.05])
+    temperature = np.array([0.5, 1.0, 2.0])
+
+    if eligibility:
+        decay = np.array([0.0, 0.5, 0.9])
+        population = population_agents.ValenceQAgentPopulation_eligibility(
+            lr_pos,
+            lr_neg,
+            temperature,
+            eligibility_decay=decay,
+            action_space=3,
+            state_space=4,
+        )
+        agents = [
+            base_agent.ValenceQAgent_eligibility(
+                lr_pos[n],
+                lr_neg[n],
+                temperature[n],
+                eligibility_decay=decay[n],
+                action_space=3,
+                state_space=4,
+            )
+            for n in range(3)
+        ]
+    else:
+        population = population_agents.ValenceQAgentPopulation(
+            lr_pos, lr_neg, temperature, action_space=3, state_space=4
+        )
+        agents = [
+            base_agent.ValenceQAgent(
+                lr_pos[n], lr_neg[n], temperature[n], action_space=3, state_space=4
+            )
+            for n in range(3)
+        ]
+
+    for obs, action, reward, terminated, next_obs in _transitions():
+        population.update(obs, action, reward, terminated, next_obs)
+        for ag in agents:
+            ag.update(obs, action, reward, terminated, next_obs)
+
+        probs = population.get_probs(obs, [0, 2])
+        for n, ag in enumerate(agents):
+            assert np.allclose(population.q_values[n], ag.q_values)
+            assert np.allclose(probs[n], ag.get_probs(obs, [0, 2]))
+
+
+def test_population_mask_and_sizes():
+    population = population_agents.QAgentPopulation(
+        learning_rate=[0.5, 0.5], temperature=1.0, state_space=2
+    )
+    assert population.n_agents == 2
+
+    population.update(
+        [0, 0], [1, 1], [1.0, 1.0], True, [1, 1], mask=np.array([True, False])
+    )
+    assert population.q_values[0, 0, 1] == 0.75
+    assert population.q_values[1, 0, 1] == 0.5
+
+    with pytest.raises(ValueError):
+        population_agents.QAgentPopulation(
+            learning_rate=[0.1, 0.2], temperature=[1, 2, 3]
+        )
+
+
+def test_population_get_action_distribution():
+    population = population_agents.QAgentPopulation_eligibility(
+        learning_rate=0.1, temperature=1.0, action_space=3, n_agents=20000
+    )
+    population.q_values[:, 0] = [0.0, np.log(2), np.log(3)]
+
+    mask = np.ones((20000, 3), dtype=bool)
+    mask[:, 0] = False
+    actions = population.get_action(0, mask)
+
+    assert not np.any(actions == 0)
+    assert np.isclose(np.mean(actions == 2), 0.6, atol=0.02)
+
+
+def test_population_with_vector_env():
+    graph = {0: [1, 2], 1: [], 2: []}
+    n_agents = 500
+    env = VectorBaseEnv(graph, {1: lambda: 1, 2: lambda: 0}, n_envs=n_agents)
+    population = population_agents.QAgentPopulation(
+        learning_rate=np.linspace(0.05, 0.95, n_agents),
+        temperature=5.0,
+        state_space=env.n_states,
+        action_space=env.n_actions,
+    )
+
+    for _ in range(50):
+        obs, info = env.reset()
+        action = population.get_action(obs, info["avail-actions"])
+        next_obs, reward, terminated, _, _ = env.step(action)
+        population.update(obs, action, reward, terminated, next_obs)
+
+    assert np.mean(population.q_values[:, 0, 0] > population.q_values[:, 0, 1]) > 0.9
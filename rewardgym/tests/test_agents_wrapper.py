@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from rewardgym.agents import QAgent, QAgentPopulation
+from rewardgym.agents.wrapper import (
+    EAMWrapper,
+    race_first_passage,
+    race_first_passage_analytic,
+    race_log_likelihood,
+)
+
+
+def _eam_agent(block_size=None, seed=11, add_error_process=False):
+    agent = EAMWrapper(
+        QAgent,
+        learning_rate=0.1,
+        temperature=1.0,
+        action_space=3,
+        state_space=2,
+        seed=seed,
+        eam_sd=0.3,
+        eam_a=1.0,
+        eam_dt=0.01,
+        eam_v0=0.5,
+        eam_w=2.0,
+        add_error_process=add_error_process,
+        block_size=block_size,
+    )
+    agent.q_values[0] = [0.2, 0.9, 0.4]
+    return agent
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 200])
+def test_block_sampling_matches_stepwise(block_size):
+    stepwise = _eam_agent()
+    blocked = _eam_agent(block_size=block_size)
+
+    # Fresh generators, so both simulations use the same random numbers.
+    for seed in range(20):
+        stepwise.agent.rng = np.random.default_rng(seed)
+        blocked.agent.rng = np.random.default_rng(seed)
+        action, rt = stepwise.get_rt_action(0, [0, 1, 2])
+        assert (action, rt) == blocked.get_rt_action(0, [0, 1, 2])
+
+
+def test_batched_race_distribution():
+    drift = np.array([0.5, 1.5])
+    rng = np.random.default_rng(3)
+    choices, rts = race_first_passage(
+        np.tile(drift, (3000, 1)), 1.0, 0.3, 0.01, random_state=rng, block_size=32
+    )
+
+    stepwise = _eam_agent(seed=4)
+    stepwise.q_values[0] = [0.0, 0.5, 0.0]
+    single = [stepwise.get_rt_action(0, [0, 1]) for _ in range(1000)]
+    single_choices, single_rts = map(np.array, zip(*single))
+
+    assert choices.shape == rts.shape == (3000,)
+    assert np.isclose(np.mean(choices), np.mean(single_choices), atol=0.05)
+    assert np.isclose(np.mean(rts), np.mean(single_rts), rtol=0.05)
+
+
+def test_get_rt_actions():
+    agent = _eam_agent(block_size=16, add_error_process=True)
+    actions, rts = agent.get_rt_actions(np.zeros(50, dtype=int), [0, 1, 2])
+    assert actions.shape == rts.shape == (50,)
+    assert np.all((actions >= 0) & (actions < 3))
+    assert np.all(rts > 0)
+
+    population = EAMWrapper(
+        QAgentPopulation, learning_rate=0.1, temperature=1.0, n_agents=8
+    )
+    actions, rts = population.get_rt_actions(0)
+    assert actions.shape == rts.shape == (8,)
+
+
+@pytest.mark.parametrize("drift", [[0.5, 1.5], [-0.5, 1.0], [0.0, 0.8]])
+def test_analytic_race_matches_euler(drift):
+    n_trials = 4000
+    drift = np.tile(drift, (n_trials, 1))
+
+    choices, rts = race_first_passage_analytic(
+        drift, 1.0, 0.5, random_state=np.random.default_rng(1)
+    )
+    euler_choices, euler_rts = race_first_passage(
+        drift, 1.0, 0.5, 0.001, random_state=np.random.default_rng(2), block_size=256
+    )
+
+    assert np.isclose(np.mean(choices), np.mean(euler_choices), atol=0.04)
+    assert np.isclose(np.median(rts), np.median(euler_rts), rtol=0.06)
+
+
+def test_analytic_race_without_response():
+    # The threshold is reached with probability exp(-160).
+    with pytest.raises(RuntimeError, match="after 50 redraws"):
+        race_first_passage_analytic(
+            [[-20.0, -20.0], [1.0, 0.5]],
+            1.0,
+            0.5,
+            np.random.default_rng(0),
+            max_redraws=50,
+        )
+
+
+@pytest.mark.parametrize("add_error_process", [False, True])
+@pytest.mark.parametrize(
+    "drift, sd",
+    [([0.6, 1.2, -0.2], 0.5), ([-0.5, -0.3], 1.0), ([-0.4, 0.8, -1.0], 1.0)],
+)
+def test_race_likelihood_normalized(drift, sd, add_error_process):
+    drift = np.array(drift)
+    t = np.linspace(1e-4, 200, 400000)
+
+    probs = []
+    for choice in range(drift.size):
+        log_lik = race_log_likelihood(
+            drift, 1.0, sd, choice, t, add_error_process=add_error_process
+        )
+        probs.append(np.sum(np.exp(log_lik)) * (t[1] - t[0]))
+
+    assert np.isclose(np.sum(probs), 1, atol=2e-3)
+
+    if not add_error_process:
+        choices, _ = race_first_passage_analytic(
+            np.tile(drift, (20000, 1)), 1.0, sd, np.random.default_rng(0)
+        )
+        assert np.allclose(
+            np.bincount(choices, minlength=drift.size) / 20000, probs, atol=0.015
+        )
+
+
+def test_analytic_wrapper():
+    agent = _eam_agent()
+    agent.analytic = True
+
+    action, rt = agent.get_rt_action(0, [0, 1, 2])
+    assert 0 <= action < 3 and rt > 0
+
+    actions, rts = agent.get_rt_actions(np.zeros(20, dtype=int))
+    log_lik = agent.get_rt_log_likelihood(np.zeros(20, dtype=int), actions, rts)
+    assert log_lik.shape == (20,)
+    assert np.all(np.isfinite(log_lik))
+
+    agent.eam_sd = 0
+    with pytest.raises(ValueError):
+        agent.get_rt_action(0)
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rewardgym.handling.bids import (
+    find_bids_files,
+    iter_bids_dataset,
+    load_bids_dataset,
+    parse_bids_name,
+    read_bids_file,
+)
+from rewardgym.handling.data_tools import prepare_data, prepare_data_for_rl
+from rewardgym.runner import make_bids_name
+
+
+def _events(seed, n_trials=10):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for trial in range(n_trials):
+        action = int(rng.integers(2))
+        base = {
+            "onset": 4.0 * trial,
+            "duration": 0.5,
+            "trial_type": "a",
+            "event_type": "cue",
+            "response_time": "n/a",
+            "response_button": "n/a",
+            "action": "n/a",
+            "reward": "None",
+            "trial": trial,
+            "current_location": 0,
+            "start_position": 0,
+            "participant_id": "001",
+            "rl_label": "n/a",
+        }
+        rows.append({**base, "rl_label": "obs"})
+        rows.append(
+            {
+                **base,
+                "onset": 4.0 * trial + 1,
+                "event_type": "response",
+                "response_time": rng.random(),
+                "response_button": ["left", "right"][action],
+                "action": action,
+                "rl_label": "action",
+            }
+        )
+        rows.append(
+            {
+                **base,
+                "onset": 4.0 * trial + 2,
+                "event_type": "outcome",
+                "current_location": action + 1,
+                "rl_label": "obs",
+            }
+        )
+        rows.append(
+            {
+                **base,
+                "onset": 4.0 * trial + 3,
+                "event_type": "reward",
+                "reward": float(rng.random() < 0.5),
+                "current_location": action + 1,
+                "rl_label": "reward",
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    for seed, (sub, ses, run) in enumerate(
+        [("01", "1", 1), ("01", "1", 2), ("01", "2", 1), ("02", "1", 1)]
+    ):
+        name = make_bids_name(sub, session=ses, task="two-step", run=run)
+        beh_dir = tmp_path / f"sub-{sub}" / f"ses-{ses}" / "beh"
+        beh_dir.mkdir(parents=True, exist_ok=True)
+        _events(seed).to_csv(beh_dir / name, sep="\t", index=False)
+
+    (tmp_path / "sub-01" / "notes.tsv").write_text("a\tb\n")
+    return tmp_path
+
+
+def test_parse_bids_name():
+    name = make_bids_name("01", session="pre", task="risk-sensitive", run=2)
+
+    assert parse_bids_name(name) == {
+        "participant_id": "01",
+        "session": "pre",
+        "task": "risksensitive",
+        "acquisition": None,
+        "run": "2",
+        "suffix": "beh",
+    }
+    assert parse_bids_name("sub-01_events.tsv")["session"] is None
+    assert parse_bids_name("participants.tsv") is None
+
+
+def test_find_bids_files(dataset):
+    assert len(find_bids_files(dataset)) == 4
+    assert len(find_bids_files(dataset, participant_id="01", run=1)) == 2
+    assert len(find_bids_files(dataset, session=["2"], task="two-step")) == 1
+    assert find_bids_files(dataset, suffixes=("events",)) == []
+
+    # Events files duplicate the runs of the behavioral files.
+    path, _ = find_bids_files(dataset)[0]
+    path.with_name(path.name.replace("_beh", "_events")).write_text("onset\n")
+    assert len(find_bids_files(dataset)) == 4
+    assert len(find_bids_files(dataset, suffixes=("beh", "events"))) == 5
+
+
+def test_read_bids_file(dataset):
+    path, _ = find_bids_files(dataset)[0]
+    data = read_bids_file(path)
+
+    assert "participant_id" not in data.columns
+    assert data["action"].dtype == pd.Int64Dtype()
+    assert data["reward"].dtype == float
+    assert all(read_bids_file(path, columns=None)["participant_id"] == "001")
+
+    # Reading the selected columns gives the same RL data as reading everything.
+    reference, _ = prepare_data(str(path))
+    prepared = read_bids_file(path, prepare_kwargs={})
+    pd.testing.assert_frame_equal(
+        prepare_data_for_rl(prepared),
+        prepare_data_for_rl(reference),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_load_bids_dataset(dataset, n_workers):
+    data = load_bids_dataset(dataset, n_workers=n_workers)
+
+    assert len(data) == 4 * 40
+    keys = data[["participant_id", "session", "run"]].drop_duplicates()
+    assert keys.values.tolist() == [
+        ["01", "1", "1"],
+        ["01", "1", "2"],
+        ["01", "2", "1"],
+        ["02", "1", "1"],
+    ]
+    assert set(data["task"]) == {"twostep"}
+
+    streamed = list(iter_bids_dataset(dataset, participant_id="02", n_workers=1))
+    assert len(streamed) == 1
+    entities, run_data = streamed[0]
+    assert entities["participant_id"] == "02"
+    pd.testing.assert_frame_equal(
+        run_data, data.query("participant_id == '02'").reset_index(drop=True)
+    )
+
+
+def test_load_bids_dataset_empty(tmp_path):
+    assert load_bids_dataset(tmp_path).empty
@@ -1,5 +1,6 @@
 import warnings
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -290,3 +291,61 @@ def test_prepare_data_for_rl_multiple_trials(sample_df):
     result_df = prepare_data_for_rl(df)
     assert result_df["trial"].nunique() == 2
     assert result_df.shape[0] == 2
+
+
+def _prepare_data_for_rl_loop(df):
+    """Reference implementation, processing each trial with process_trial_for_rl."""
+    df = df.sort_values(["trial", "onset"]).reset_index(drop=True)
+
+    all_tuples = []
+    for trial_id, trial_df in df.groupby("trial"):
+        all_tuples.extend(process_trial_for_rl(trial_id, trial_df))
+
+    return pd.DataFrame(
+        all_tuples,
+        columns=["obs0", "action", "reward", "obs1", "reaction_time", "trial"],
+    )
+
+
+@pytest.mark.parametrize("regular", [True, False])
+def test_prepare_data_for_rl_equivalent(regular):
+    rng = np.random.default_rng(1 + regular)
+
+    for _ in range(50):
+        if regular:
+            # Two-step like trials, possibly aborted.
+            sequence = ["obs", "action", "obs", "reward", "action", "obs", "reward"]
+            rows = [
+                (trial, label)
+                for trial in range(rng.integers(1, 6))
+                for label in sequence[: rng.integers(0, 8)]
+            ]
+            trial = [row[0] for row in rows]
+            labels = [row[1] for row in rows]
+        else:
+            labels = rng.choice(["obs", "action", "reward", "n/a"], rng.integers(0, 30))
+            trial = rng.integers(0, 4, len(labels))
+
+        n = len(labels)
+        df = pd.DataFrame(
+            {
+                "trial": pd.array(trial, dtype="Int64"),
+                "onset": np.arange(n, dtype=float) if regular else rng.random(n),
+                "rl_label": labels,
+                "current_location": rng.integers(0, 5, n).astype(object),
+                "action": pd.array(rng.integers(0, 2, n), dtype="Int64"),
+                "reward": rng.random(n),
+                "response_time": rng.random(n),
+            }
+        )
+
+        if n and rng.random() < 0.3:
+            df.loc[rng.integers(n), "current_location"] = None
+        if n and rng.random() < 0.3:
+            df.loc[rng.integers(n), "action"] = pd.NA
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            pd.testing.assert_frame_equal(
+                prepare_data_for_rl(df), _prepare_data_for_rl_loop(df)
+            )
@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 from rewardgym.environments import BaseEnv
 
 
@@ -36,3 +39,104 @@ class TestBaseEnv:
         assert terminated is True
         assert truncated is False
         assert env.cumulative_reward == 1
+
+
+def _stochastic_graph():
+    return {
+        0: ([1, 2], 0.7),
+        1: {0: 3, 1: ([4, 3, 5], 0.6), "skip": False},
+        2: [3, 4, 5],
+        3: [],
+        4: [],
+        5: [],
+    }
+
+
+def test_compile_tables():
+    reward_locations = {3: lambda: 1, 4: lambda: 0, 5: lambda: -1}
+    env = BaseEnv(_stochastic_graph(), reward_locations)
+    compiled = env.compile()
+
+    assert env.compiled_graph is compiled
+    assert compiled.next_state.shape == (6, 3)
+    assert compiled.next_state[0].tolist() == [1, 2, -1]
+    assert compiled.alternatives[1, 1].tolist() == [4, 3, 5]
+    assert np.isnan(compiled.stochasticity[2, 0])
+    assert compiled.stochasticity[0, 1] == 0.7
+    assert compiled.terminal.tolist() == [False, False, False, True, True, True]
+    assert compiled.action_mask[1].tolist() == [True, True, False]
+
+
+def test_compile_equivalent_steps():
+    reward_locations = {3: lambda: 1, 4: lambda: 0, 5: lambda: -1}
+    env = BaseEnv(_stochastic_graph(), reward_locations, random_state=12)
+    env_compiled = BaseEnv(_stochastic_graph(), reward_locations, random_state=12)
+    env_compiled.compile()
+
+    action_rng = np.random.default_rng(3)
+    condition = {2: {0: 4, 1: ([5, 3], 0.5)}}
+
+    for episode in range(200):
+        cond = condition if episode % 3 == 0 else None
+        assert env.reset(0, cond) == env_compiled.reset(0, cond)
+        done = False
+        while not done:
+            action = int(action_rng.integers(0, 4))
+            out = env.step(action)
+            out_compiled = env_compiled.step(action)
+            assert out == out_compiled
+            done = out[2]
+
+    assert env.random_state.random() == env_compiled.random_state.random()
+
+
+def test_compile_non_integer_actions():
+    reward_locations = {3: lambda: 1, 4: lambda: 0, 5: lambda: -1}
+    env = BaseEnv(_stochastic_graph(), reward_locations, random_state=12)
+    env_compiled = BaseEnv(_stochastic_graph(), reward_locations, random_state=12)
+    env_compiled.compile()
+
+    for action in ["left", None, 1.5, -1.0, 1.0, np.float64(0)]:
+        assert env.reset(0) == env_compiled.reset(0)
+        assert env.step(action) == env_compiled.step(action)
+
+
+def test_compile_invalid_graph():
+    env = BaseEnv({"a": ["b"], "b": []}, {"b": lambda: 1})
+
+    with pytest.raises(ValueError):
+        env.compile()
+
+
+def test_light_info_matches_info_dict():
+    reward_locations = {3: lambda: 1, 4: lambda: 0, 5: lambda: -1}
+    graph = _stochastic_graph()
+    graph[2] = {0: 3, None: 4, 1: 5}
+    env = BaseEnv(graph, reward_locations, random_state=12)
+    env_light = BaseEnv(graph, reward_locations, random_state=12, light_info=True)
+
+    action_rng = np.random.default_rng(3)
+    condition = {2: {1: 4, 0: ([5, 3], 0.5)}}
+
+    for episode in range(50):
+        cond = condition if episode % 3 == 0 else None
+        obs, info = env.reset(0, cond)
+        obs_light, info_light = env_light.reset(0, cond)
+        assert obs == obs_light
+
+        done = False
+        while not done:
+            for key in ["avail-actions", "behav_remap", "skip-node", "obs"]:
+                assert info[key] == info_light[key]
+            action = int(action_rng.integers(0, 3))
+            obs, _, done, _, info = env.step(action)
+            obs_light, _, _, _, info_light = env_light.step(action)
+            assert obs == obs_light
+
+    assert env_light.reset(0, condition)[1] is env_light.reset(0, condition)[1]
+    assert "avail-actions" in info_light
+    with pytest.raises(KeyError):
+        info_light["psychopy"]
+
+    with pytest.raises(ValueError):
+        BaseEnv(graph, reward_locations, render_mode="pygame", light_info=True)
@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+from rewardgym.environments import BaseEnv, VectorBaseEnv
+from rewardgym.reward_classes import BaseReward
+
+
+def _graph():
+    return {
+        0: ([1, 2], 0.7),
+        1: {0: 3, 1: ([4, 3, 5], 0.6), "skip": False},
+        2: [3, 4, 5],
+        3: [],
+        4: [],
+        5: [],
+    }
+
+
+def _rewards():
+    return {3: BaseReward(1), 4: BaseReward([0, 1], p=[0.5, 0.5]), 5: BaseReward(-1)}
+
+
+def test_vector_deterministic_matches_base_env():
+    graph = {0: [1, 2], 1: [3, 4], 2: [4, 3], 3: [], 4: []}
+    rewards = {3: lambda: 1, 4: lambda: 2}
+    env = BaseEnv(graph, rewards)
+    venv = VectorBaseEnv(graph, rewards, n_envs=4)
+
+    actions = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    obs, info = venv.reset()
+    assert obs.tolist() == [0, 0, 0, 0]
+    assert info["avail-actions"].all()
+
+    obs, _, terminated, _, _ = venv.step(actions[:, 0])
+    obs, reward, terminated, _, _ = venv.step(actions[:, 1])
+
+    for n, (a0, a1) in enumerate(actions):
+        env.reset(0)
+        env.step(a0)
+        base_obs, base_reward, base_terminated, _, _ = env.step(a1)
+        assert obs[n] == base_obs
+        assert reward[n] == base_reward
+        assert terminated[n] == base_terminated
+
+
+def test_vector_transition_probabilities():
+    venv = VectorBaseEnv(_graph(), _rewards(), n_envs=5000, random_state=5)
+    venv.reset()
+    obs, *_ = venv.step(np.zeros(venv.n_envs))
+    assert np.isclose(np.mean(obs == 1), 0.7, atol=0.03)
+
+    venv.reset(agent_location=1)
+    obs, reward, terminated, _, _ = venv.step(np.ones(venv.n_envs))
+    assert terminated.all()
+    assert np.isclose(np.mean(obs == 4), 0.6, atol=0.03)
+    assert np.isclose(np.mean(obs == 3), 0.2, atol=0.03)
+    assert np.isclose(np.mean(obs == 5), 0.2, atol=0.03)
+    assert np.all(reward[obs == 5] == -1)
+
+
+def test_vector_terminated_envs_are_frozen():
+    venv = VectorBaseEnv(_graph(), _rewards(), n_envs=3)
+    venv.reset(agent_location=2)
+    obs, reward, terminated, _, _ = venv.step([0, -1, 5])
+
+    assert obs.tolist() == [3, 2, 2]
+    assert terminated.tolist() == [True, False, False]
+
+    obs, reward, terminated, _, _ = venv.step([1, 0, 0])
+    assert obs.tolist() == [3, 3, 3]
+    assert reward.tolist() == [0, 1, 1]
+    assert venv.cumulative_reward.tolist() == [1, 1, 1]
+
+
+def test_vector_conditions():
+    condition = {0: {0: 2}, "reward": 10}
+    venv = VectorBaseEnv(_graph(), _rewards(), n_envs=2)
+    obs, info = venv.reset(condition=[condition, None])
+    assert info["avail-actions"][0].tolist() == [True, False, False]
+    assert info["avail-actions"][1].tolist() == [True, True, False]
+
+    obs, *_ = venv.step([0, 0])
+    assert obs[0] == 2
+    obs, reward, terminated, _, _ = venv.step([1, 1])
+    assert reward[0] == 10
+    assert terminated[0]
+
+
+def test_vector_skip_nodes():
+    graph = {0: {0: 1, "skip": True}, 1: [2], 2: []}
+    venv = VectorBaseEnv(graph, {2: lambda: 1}, n_envs=2)
+    obs, info = venv.reset()
+    assert obs.tolist() == [1, 1]
+    assert not info["skip-node"].any()
+
+
+def test_vector_reproducible_streams():
+    def run(n_envs):
+        venv = VectorBaseEnv(_graph(), _rewards(), n_envs=n_envs, random_state=3)
+        out = []
+        for _ in range(50):
+            venv.reset()
+            venv.step(np.zeros(n_envs))
+            obs, reward, *_ = venv.step(np.ones(n_envs))
+            out.append((obs[:2], reward[:2]))
+        return out
+
+    for (o1, r1), (o2, r2) in zip(run(2), run(6)):
+        assert np.array_equal(o1, o2)
+        assert np.array_equal(r1, r2)
+
+
+def test_vector_reward_list_length():
+    with pytest.raises(ValueError):
+        VectorBaseEnv(_graph(), [_rewards()], n_envs=2)
+
+
+def test_vector_condition_cache():
+    venv = VectorBaseEnv(_graph(), _rewards(), n_envs=2)
+
+    # Equal conditions share one graph, even if they are different objects.
+    for _ in range(10):
+        venv.reset(condition=[{0: {0: 2}, "reward": 10}, None])
+    assert len(venv._graphs) == 2
+
+    venv.max_conditions = 4
+    for reward in range(10):
+        obs, info = venv.reset(condition={0: {0: 2}, "reward": reward})
+        assert len(venv._graphs) <= 5
+
+    assert info["avail-actions"][0].tolist() == [True, False, False]
+    venv.step([0, 0])
+    _, reward, *_ = venv.step([1, 1])
+    assert reward.tolist() == [9, 9]
+
+
+def test_vector_reset_like_base_env():
+    venv = VectorBaseEnv(_graph(), _rewards(), n_envs=2)
+
+    # Same positional order as BaseEnv.reset(agent_location, condition).
+    obs, _ = venv.reset(2, [None, {2: {0: 3}}])
+    assert obs.tolist() == [2, 2]
+    assert venv.condition_index[0] == 0 and venv.condition_index[1] > 0
+
+
+def test_vector_reduced_actions():
+    graph = {0: [1, 2, 3], 1: [], 2: [], 3: []}
+    rewards = {1: lambda: 1, 2: lambda: 2, 3: lambda: 3}
+    venv = VectorBaseEnv(graph, rewards, n_envs=500, reduced_actions=2)
+    env = BaseEnv(graph, rewards, reduced_actions=2)
+
+    _, info = venv.reset()
+    n_available = info["avail-actions"].sum(axis=1)
+    base_available = [len(env.reset()[1]["avail-actions"]) for _ in range(500)]
+
+    assert n_available.max() <= 3 and np.mean(n_available) < 2.5
+    assert np.isclose(np.mean(n_available), np.mean(base_available), atol=0.1)
+
+    # A given condition replaces the reduction.
+    _, info = venv.reset(condition={0: {0: 1}})
+    assert (info["avail-actions"].sum(axis=1) == 1).all()
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from rewardgym.agents import QAgent
+from rewardgym.fitting import (
+    fit_dataset,
+    load_participant_data,
+    negative_log_likelihood,
+)
+from rewardgym.handling.bids import read_bids_file
+from rewardgym.handling.data_tools import prepare_data_for_rl
+
+
+def _bandit_events(seed, n_trials=80, learning_rate=0.3, temperature=3.0):
+    rng = np.random.default_rng(seed)
+    agent = QAgent(learning_rate, temperature, state_space=3, seed=rng)
+    rows = []
+    for trial in range(n_trials):
+        action = agent.get_action(0)
+        reward = float(rng.random() < [0.8, 0.2][action])
+        agent.update(0, action, reward, True, action + 1)
+        base = {
+            "trial": trial,
+            "duration": 0.1,
+            "start_position": 0,
+            "response_time": "n/a",
+            "reward": "n/a",
+            "action": "n/a",
+            "response_button": "n/a",
+            "event_type": "trial",
+            "current_location": "n/a",
+        }
+        rows.append({**base, "onset": trial, "rl_label": "obs", "current_location": 0})
+        rows.append(
+            {
+                **base,
+                "onset": trial + 0.1,
+                "rl_label": "action",
+                "action": action,
+                "response_time": 0.4,
+                "response_button": ["left", "right"][action],
+            }
+        )
+        rows.append(
+            {**base, "onset": trial + 0.2, "rl_label": "reward", "reward": reward}
+        )
+        rows.append(
+            {
+                **base,
+                "onset": trial + 0.3,
+                "rl_label": "obs",
+                "current_location": action + 1,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def test_fit_dataset(tmp_path):
+    for sub in ["01", "02"]:
+        beh_dir = tmp_path / f"sub-{sub}" / "beh"
+        beh_dir.mkdir(parents=True)
+        for run in [1, 2]:
+            _bandit_events(10 * int(sub) + run).to_csv(
+                beh_dir / f"sub-{sub}_task-bandit_run-{run}_beh.tsv",
+                sep="\t",
+                index=False,
+            )
+        # The events file of the same run is not fitted again.
+        _bandit_events(int(sub)).to_csv(
+            beh_dir / f"sub-{sub}_task-bandit_run-1_events.tsv", sep="\t", index=False
+        )
+
+    bounds = {"learning_rate": (0.01, 1.0), "temperature": (0.1, 10.0)}
+    kwargs = {"n_starts": 2, "n_screen": 50, "state_space": 3, "action_space": 2}
+
+    summary = fit_dataset(
+        tmp_path, QAgent, bounds, n_workers=1, output=tmp_path / "fits.tsv", **kwargs
+    )
+
+    assert list(summary["participant_id"]) == ["01", "02"]
+    assert (tmp_path / "fits.tsv").exists()
+    assert pd.read_csv(tmp_path / "fits.tsv", sep="\t").shape == summary.shape
+
+    for _, fit in summary.iterrows():
+        paths = [
+            tmp_path / f"sub-{fit.participant_id}" / "beh" / ff
+            for ff in fit.files.split(",")
+        ]
+        assert len(paths) == 2
+
+        rl_data = load_participant_data(paths)
+        assert rl_data["trial"].tolist() == list(range(160))
+
+        true_nll = negative_log_likelihood(
+            rl_data,
+            QAgent,
+            {"learning_rate": 0.3, "temperature": 3.0},
+            state_space=3,
+            action_space=2,
+        )[0]
+        assert fit.nll <= true_nll + 1e-6
+        assert fit.n_choices == 160
+
+    parallel = fit_dataset(tmp_path, QAgent, bounds, n_workers=2, **kwargs)
+    pd.testing.assert_frame_equal(summary, parallel)
+
+    by_session = fit_dataset(
+        tmp_path, QAgent, bounds, n_workers=1, by_session=True, **kwargs
+    )
+    assert by_session["session"].isna().all()
+    assert len(by_session) == 2
+
+
+def test_fit_dataset_tasks_and_run_order(tmp_path):
+    beh_dir = tmp_path / "sub-01" / "beh"
+    beh_dir.mkdir(parents=True)
+    for run in range(1, 12):
+        _bandit_events(run, n_trials=5).to_csv(
+            beh_dir / f"sub-01_task-bandit_run-{run}_beh.tsv", sep="\t", index=False
+        )
+    _bandit_events(0, n_trials=5).to_csv(
+        beh_dir / "sub-01_task-other_run-1_beh.tsv", sep="\t", index=False
+    )
+
+    bounds = {"learning_rate": (0.01, 1.0), "temperature": (0.1, 10.0)}
+    kwargs = {"n_starts": 1, "n_screen": 10, "state_space": 3, "action_space": 2}
+
+    summary = fit_dataset(tmp_path, QAgent, bounds, n_workers=1, **kwargs)
+
+    assert list(summary["task"]) == ["bandit", "other"]
+    assert summary["files"][0].split(",") == [
+        f"sub-01_task-bandit_run-{run}_beh.tsv" for run in range(1, 12)
+    ]
+    assert list(summary["n_choices"]) == [55, 5]
+
+    bandit = fit_dataset(tmp_path, QAgent, bounds, n_workers=1, task="bandit", **kwargs)
+    pd.testing.assert_frame_equal(bandit, summary.iloc[:1])
+
+
+def test_load_participant_data_types(tmp_path):
+    path = tmp_path / "sub-01_task-bandit_run-1_beh.tsv"
+    events = _bandit_events(1, n_trials=5)
+    # A run without a single reward or response is still read with the logger's
+    # column types.
+    events[["reward", "response_time"]] = "n/a"
+    events.to_csv(path, sep="\t", index=False)
+
+    rl_data = load_participant_data([path])
+    expected = prepare_data_for_rl(read_bids_file(path, prepare_kwargs={}))
+
+    pd.testing.assert_frame_equal(rl_data, expected)
+    assert rl_data["reward"].isna().all()
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rewardgym.agents import (
+    HybridAgent,
+    QAgent,
+    QAgent_eligibility,
+    ValenceHybridAgent,
+    ValenceQAgent,
+)
+from rewardgym.fitting import log_likelihood, negative_log_likelihood
+
+GRAPH = {
+    0: {0: ([1, 2], 0.7), 1: ([2, 1], 0.7)},
+    1: {0: 3, 1: 4},
+    2: {0: 5, 1: 6},
+    3: {},
+    4: {},
+    5: {},
+    6: {},
+}
+
+
+def _two_step_data(n_trials=40, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for trial in range(n_trials):
+        action0 = int(rng.integers(2))
+        state1 = int(rng.choice([1, 2]))
+        action1 = int(rng.integers(2))
+        rows.append((0, action0, 0.0, state1, 0.5, trial))
+        rows.append((state1, action1, float(rng.normal()), None, 0.5, trial))
+
+    return pd.DataFrame(
+        rows, columns=["obs0", "action", "reward", "obs1", "reaction_time", "trial"]
+    )
+
+
+def _replay(data, agent):
+    log_lik = 0.0
+    rows = list(data.itertuples())
+    for n, row in enumerate(rows):
+        log_lik += np.log(agent.get_probs(row.obs0)[row.action])
+        terminated = n == len(rows) - 1 or rows[n + 1].trial != row.trial
+        next_obs = None if pd.isna(row.obs1) else int(row.obs1)
+        agent.update(row.obs0, row.action, row.reward, terminated, next_obs)
+    return log_lik
+
+
+@pytest.mark.parametrize(
+    "agent_class,parameters,kwargs",
+    [
+        (QAgent, {"learning_rate": [0.1, 0.6], "temperature": [1.0, 3.0]}, {}),
+        (
+            ValenceQAgent,
+            {
+                "learning_rate_pos": [0.1, 0.6],
+                "learning_rate_neg": [0.4, 0.2],
+                "temperature": [1.0, 3.0],
+            },
+            {},
+        ),
+        (
+            QAgent_eligibility,
+            {
+                "learning_rate": [0.1, 0.6],
+                "temperature": [1.0, 3.0],
+                "eligibility_decay": [0.2, 0.9],
+            },
+            {},
+        ),
+        (
+            HybridAgent,
+            {
+                "learning_rate_mb": [0.2, 0.5],
+                "learning_rate_mf": [0.1, 0.6],
+                "temperature": [1.0, 3.0],
+                "hybrid": [0.3, 0.8],
+            },
+            {"graph": GRAPH},
+        ),
+        (
+            ValenceHybridAgent,
+            {
+                "learning_rate_mb": [0.2, 0.5],
+                "learning_rate_mf_pos": [0.1, 0.6],
+                "learning_rate_mf_neg": [0.4, 0.2],
+                "temperature": [1.0, 3.0],
+                "eligibility_decay": [0.0, 0.5],
+            },
+            {"graph": GRAPH, "use_fixed": True},
+        ),
+    ],
+)
+def test_likelihood_matches_replay(agent_class, parameters, kwargs):
+    data = _two_step_data()
+
+    log_lik = log_likelihood(
+        data,
+        agent_class,
+        {k: np.array(v) for k, v in parameters.items()},
+        state_space=7,
+        action_space=2,
+        **kwargs,
+    )
+
+    for n in range(2):
+        agent = agent_class(
+            **{k: v[n] for k, v in parameters.items()},
+            action_space=2,
+            state_space=7,
+            **kwargs,
+        )
+        assert np.isclose(log_lik[n], _replay(data, agent))
+
+
+def test_likelihood_missing_actions_and_masks():
+    data = _two_step_data(n_trials=5)
+    data.loc[3, "action"] = np.nan
+
+    parameters = {"learning_rate": np.array([0.1, 0.5, 0.9]), "temperature": 2.0}
+    nll = negative_log_likelihood(data, QAgent, parameters)
+
+    assert nll.shape == (3,)
+    assert np.all(nll > 0)
+
+    # Only one available action, the choices are certain.
+    avail_actions = np.zeros((len(data), 2), dtype=bool)
+    avail_actions[np.arange(len(data)), data["action"].fillna(0).astype(int)] = True
+
+    nll = negative_log_likelihood(data, QAgent, parameters, avail_actions=avail_actions)
+    assert np.allclose(nll, 0)
+
+
+def test_likelihood_unknown_agent():
+    with pytest.raises(ValueError):
+        log_likelihood(_two_step_data(n_trials=2), dict, {})
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+
+IMPORT_TIME_BUDGET = 1.0
+MODULE_BUDGET = 300
+HEAVY_MODULES = ["pandas", "scipy", "matplotlib", "PIL", "psychopy", "pygame"]
+
+SCRIPT = f"""
+import json, sys, time
+
+n_modules = len(sys.modules)
+start = time.perf_counter()
+import rewardgym
+duration = time.perf_counter() - start
+
+print(json.dumps({{
+    "time": duration,
+    "modules": len(sys.modules) - n_modules,
+    "heavy": [mm for mm in {HEAVY_MODULES!r} if mm in sys.modules],
+}}))
+"""
+
+
+def test_import_budget():
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True
+    )
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+
+    assert result["heavy"] == []
+    assert result["modules"] < MODULE_BUDGET
+    assert result["time"] < IMPORT_TIME_BUDGET
+
+
+def test_lazy_attributes():
+    import rewardgym
+
+    assert "agents" in dir(rewardgym)
+    assert rewardgym.agents.QAgent is not None
+    assert callable(rewardgym.simulate_many)
+    assert isinstance(rewardgym.__version__, str)
@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+import rewardgym
+from rewardgym.agents import QAgent
+from rewardgym.psychopy_render import ActionStimulus, BaseStimulus, FeedBackStimulus
+from rewardgym.runner import pspy_simulate_sessions
+from rewardgym.tasks import TaskRegistry
+
+N_TRIALS = 15
+
+
+def _get_toy_configs(stimulus_set):
+    return {
+        "ntrials": N_TRIALS,
+        "condition": ["a"] * N_TRIALS,
+        "condition_dict": {"a": None},
+        "update": ["iti"],
+        "iti": [0.5 + 0.1 * stimulus_set] * N_TRIALS,
+    }
+
+
+def _get_toy_psychopy_info(seed=None, key_dict=None):
+    outcome = [
+        FeedBackStimulus(1.0, text="{0}", name="reward", rl_label="reward"),
+        BaseStimulus(name="iti", duration=1.0),
+    ]
+    info_dict = {
+        0: {
+            "psychopy": [
+                BaseStimulus(name="fixation", duration=0.5),
+                ActionStimulus(duration=2.0, rl_label="action"),
+            ]
+        },
+        1: {"psychopy": outcome},
+        2: {"psychopy": outcome},
+    }
+    return info_dict, {"seed": seed}
+
+
+@pytest.fixture
+def toy_task(register_task, toy_get_task):
+    register_task(
+        "toy",
+        toy_get_task({0: [1, 2], 1: [], 2: []}),
+        _get_toy_configs,
+        _get_toy_psychopy_info,
+    )
+
+
+def _agents(n):
+    return [
+        QAgent(0.1 + 0.1 * ii, 1.0, action_space=2, state_space=3, seed=ii)
+        for ii in range(n)
+    ]
+
+
+def test_pspy_simulate_sessions(toy_task, tmp_path):
+    files = pspy_simulate_sessions(
+        "toy",
+        _agents(3),
+        stimulus_sets=[1, 2, 1],
+        outdir=str(tmp_path),
+        session="1",
+        n_workers=1,
+        random_state=5,
+    )
+
+    assert [os.path.basename(ff) for ff in files] == [
+        f"sub-00{ii}_ses-1_task-toy_run-1_events.tsv" for ii in range(1, 4)
+    ]
+
+    events = [pd.read_csv(ff, sep="\t") for ff in files]
+    for ii, data in enumerate(events):
+        assert set(data["participant_id"]) == {ii + 1}
+        assert data["trial"].max() == N_TRIALS - 1
+        assert len(data.query("event_type == 'reward'")) == N_TRIALS
+
+    # Stimulus sets change the timing, participants the random streams.
+    iti = [data.query("event_type == 'iti'")["duration"].unique() for data in events]
+    assert iti[0] == pytest.approx(0.6)
+    assert iti[1] == pytest.approx(0.7)
+    assert not events[0]["action"].equals(events[2]["action"])
+
+    parallel = pspy_simulate_sessions(
+        "toy",
+        _agents(3),
+        stimulus_sets=[1, 2, 1],
+        outdir=str(tmp_path / "parallel"),
+        session="1",
+        n_workers=2,
+        random_state=5,
+        mp_context=multiprocessing.get_context("fork"),
+    )
+
+    for ff, pp in zip(files, parallel):
+        with open(ff) as f, open(pp) as p:
+            assert f.read() == p.read()
+
+
+def test_pspy_simulate_sessions_overwrite(toy_task, tmp_path):
+    kwargs = {"outdir": str(tmp_path), "n_workers": 1}
+    files = pspy_simulate_sessions("toy", _agents(1), **kwargs)
+
+    with pytest.raises(FileExistsError):
+        pspy_simulate_sessions("toy", _agents(2), **kwargs)
+    assert not os.path.exists(files[0].replace("001", "002"))
+
+    assert pspy_simulate_sessions("toy", _agents(1), overwrite=True, **kwargs) == files
+
+
+SPAWN_PLUGIN = """
+from rewardgym.reward_classes import BaseReward
+from rewardgym.psychopy_render import ActionStimulus, FeedBackStimulus
+
+
+def get_task(render_backend=None, random_state=None):
+    rewards = {
+        1: BaseReward([1, 0], p=[0.7, 0.3], random_state=random_state),
+        2: BaseReward([1, 0], p=[0.3, 0.7], random_state=random_state),
+    }
+    return {0: [1, 2], 1: [], 2: []}, rewards, {}
+
+
+def get_configs(stimulus_set):
+    return {
+        "ntrials": 5,
+        "condition": ["a"] * 5,
+        "condition_dict": {"a": None},
+        "update": [],
+    }
+
+
+def get_psychopy_info(seed=None, key_dict=None):
+    outcome = [FeedBackStimulus(1.0, text="{0}", name="reward", rl_label="reward")]
+    info_dict = {
+        0: {"psychopy": [ActionStimulus(duration=2.0, rl_label="action")]},
+        1: {"psychopy": outcome},
+        2: {"psychopy": outcome},
+    }
+    return info_dict, {}
+
+
+def register_task():
+    return {
+        "toyspawn": {
+            "get_task": get_task,
+            "get_configs": get_configs,
+            "get_psychopy_info": get_psychopy_info,
+        }
+    }
+"""
+
+
+def test_pspy_simulate_sessions_spawn(tmp_path, monkeypatch):
+    # Spawned workers import rewardgym anew, the task is installed through an entry
+    # point, so that it is registered there as well.
+    site = tmp_path / "site"
+    dist_info = site / "toyspawn-0.0.dist-info"
+    dist_info.mkdir(parents=True)
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: toyspawn\nVersion: 0.0\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[rewardgym.tasks]\ntoyspawn = toyspawn_plugin\n"
+    )
+    (site / "toyspawn_plugin.py").write_text(SPAWN_PLUGIN)
+    monkeypatch.syspath_prepend(str(site))
+
+    registry = TaskRegistry()
+    registry.add_entry_points()
+    monkeypatch.setattr(rewardgym, "_task_registry", registry)
+
+    kwargs = {"task_name": "toyspawn", "random_state": 3}
+    files = pspy_simulate_sessions(
+        agents=_agents(2), outdir=str(tmp_path / "serial"), n_workers=1, **kwargs
+    )
+    spawned = pspy_simulate_sessions(
+        agents=_agents(2),
+        outdir=str(tmp_path / "spawn"),
+        n_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        **kwargs,
+    )
+
+    for ff, ss in zip(files, spawned):
+        with open(ff) as f, open(ss) as s:
+            assert f.read() == s.read()
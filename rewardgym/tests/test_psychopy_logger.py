@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from rewardgym.psychopy_render import BaseStimulus, ExperimentLogger, FrameTimer
+from rewardgym.psychopy_render.psychopy_stubs import Window
+
+
+class _SlowFile:
+    def __init__(self, file, delay):
+        self.file = file
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _log_rows(tmp_path, writer, delay=0.0):
+    logger = ExperimentLogger(
+        tmp_path / f"{writer}.tsv", participant_id="1", writer=writer
+    )
+    logger.create()
+    logger.log_file = _SlowFile(logger.log_file, delay)
+
+    start = time.perf_counter()
+    for ii in range(5):
+        logger.log_event({"event_type": "test", "misc": ii}, reward=ii)
+    duration = time.perf_counter() - start
+
+    logger.close()
+
+    with open(tmp_path / f"{writer}.tsv") as f:
+        rows = [line.split("\t") for line in f.read().splitlines()]
+
+    return rows, duration
+
+
+def test_background_writer(tmp_path):
+    direct, _ = _log_rows(tmp_path, "direct")
+    background, duration = _log_rows(tmp_path, "background", delay=0.1)
+
+    # Logging does not wait for the (slow) file.
+    assert duration < 0.1
+    assert len(background) == len(direct) == 6
+    assert background[0] == direct[0]
+
+    columns = direct[0].index("misc"), direct[0].index("event_type")
+    assert [[row[cc] for cc in columns] for row in background[1:]] == [
+        [str(ii), "test"] for ii in range(5)
+    ]
+
+
+def test_unknown_writer(tmp_path):
+    with pytest.raises(ValueError):
+        ExperimentLogger(tmp_path / "log.tsv", writer="async")
+
+
+class _FrameClock:
+    """A clock, which advances by one frame, each time it is read."""
+
+    def __init__(self, frame_duration):
+        self.time = 0.0
+        self.frame_duration = frame_duration
+
+    def getTime(self):
+        self.time += self.frame_duration
+        return self.time
+
+
+def test_frame_timer(tmp_path):
+    clock = _FrameClock(0.01)
+    logger = ExperimentLogger(
+        tmp_path / "log.tsv", global_clock=clock, frame_timer=FrameTimer(50.0)
+    )
+    logger.create()
+
+    stimulus = BaseStimulus(duration=0.05, name="blank")
+    stimulus.display(Window(), logger)
+
+    # The time is read by the flip and the following wait.
+    clock.frame_duration = 0.05
+    stimulus.display(Window(), logger)
+    logger.flip(Window())
+    logger.close()
+
+    flips = logger.frame_timer.flip_table()
+    assert flips["stimulus"].tolist()[:2] == ["blank", "blank"]
+    assert flips["dropped_frames"].tolist() == [0, 2, 0]
+
+    summary = logger.frame_timer.summary().set_index("stimulus")
+    assert summary.loc["blank", "n_flips"] == 2
+    assert summary.loc["blank", "dropped_frames"] == 2
+    assert summary.loc["blank", "n_waits"] == 2
+    assert summary.loc["blank", "max_delay"] == pytest.approx(0.05)
+    assert summary.loc["n/a", "n_flips"] == 1
+    assert summary.loc["n/a", "n_waits"] == 0
@@ -0,0 +1,212 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rewardgym.agents import QAgent
+from rewardgym.environments import PsychopyEnv
+from rewardgym.handling.data_tools import prepare_data
+from rewardgym.psychopy_render import (
+    ActionStimulus,
+    BaseStimulus,
+    FeedBackStimulus,
+    FrameTimer,
+    SimulationLogger,
+    TypedSimulationLogger,
+)
+from rewardgym.psychopy_render.psychopy_stubs import Clock, Window
+from rewardgym.psychopy_render.timing import SUMMARY_COLUMNS
+from rewardgym.reward_classes import BaseReward
+from rewardgym.runner import pspy_run_task
+
+N_TRIALS = 20
+
+
+def _simulate(expose_last_stim, logger_class=SimulationLogger, compile_timeline=True):
+    outcome = [
+        BaseStimulus(name="outcome", duration=0.5, rl_label="obs"),
+        FeedBackStimulus(1.0, text="{0}", name="reward", rl_label="reward"),
+        FeedBackStimulus(None, text="{0}", name="no-duration"),
+        BaseStimulus(name="iti", duration=1.0),
+    ]
+    info_dict = {
+        0: {
+            "psychopy": [
+                BaseStimulus(name="fixation", duration=0.5),
+                BaseStimulus(name="marker"),
+                ActionStimulus(duration=2.0, rl_label="action"),
+            ]
+        },
+        1: {"psychopy": outcome},
+        2: {"psychopy": outcome[::-1]},
+    }
+
+    logger = logger_class("", Clock(), participant_id="1", task="test")
+    logger.create()
+
+    env = PsychopyEnv(
+        {0: [1, 2], 1: [], 2: []},
+        {1: BaseReward([1, 0], p=[0.7, 0.3]), 2: BaseReward([1, 0], p=[0.3, 0.7])},
+        render_mode="psychopy-simulate",
+        info_dict=info_dict,
+        name="test",
+    )
+    env.setup(
+        window=Window(),
+        logger=logger,
+        expose_last_stim=expose_last_stim,
+        compile_timeline=compile_timeline,
+    )
+
+    settings = {
+        "ntrials": N_TRIALS,
+        "condition": ["a"] * N_TRIALS,
+        "condition_dict": {"a": None},
+        "update": ["iti"],
+        "iti": [0.5 + 0.1 * ii for ii in range(N_TRIALS)],
+    }
+    agent = (
+        QAgent(0.1, 1.0, action_space=2, state_space=3) if expose_last_stim else None
+    )
+
+    if agent is None:
+        env.reaction_time = 0.4
+        for episode in range(N_TRIALS):
+            logger.set_trial_time()
+            env.reset(0)
+            env.step(episode % 2)
+    else:
+        pspy_run_task(env, logger, settings=settings, agent=agent, plugins={})
+
+    return logger.close()
+
+
+@pytest.mark.parametrize("expose_last_stim", [True, False])
+def test_compiled_timeline_equivalent(expose_last_stim):
+    reference = _simulate(expose_last_stim, compile_timeline=False)
+    compiled = _simulate(expose_last_stim)
+
+    assert len(reference["onset"]) > N_TRIALS * 5
+    assert compiled == reference
+
+    typed = _simulate(expose_last_stim, TypedSimulationLogger, compile_timeline=False)
+    pd.testing.assert_frame_equal(
+        _simulate(expose_last_stim, TypedSimulationLogger), typed
+    )
+
+
+@pytest.mark.parametrize("expose_last_stim", [True, False])
+def test_typed_simulation_logger(expose_last_stim):
+    reference = _simulate(expose_last_stim)
+    assert len(reference["onset"]) > N_TRIALS * 5
+
+    reference, _ = prepare_data(reference, remap_dictionary=None, drop_trials=False)
+    typed = _simulate(expose_last_stim, TypedSimulationLogger)
+
+    assert isinstance(typed, pd.DataFrame)
+    assert list(typed.columns) == list(reference.columns)
+    assert typed["event_type"].dtype == "category"
+    assert typed["action"].dtype == pd.Int64Dtype()
+
+    for column in ["onset", "duration", "reward", "response_time", "trial", "action"]:
+        pd.testing.assert_series_equal(
+            typed[column], reference[column], check_dtype=False
+        )
+
+    assert typed["event_type"].astype(str).tolist() == reference["event_type"].tolist()
+    assert np.array_equal(
+        typed["current_location"].to_numpy(dtype=float, na_value=np.nan),
+        pd.to_numeric(reference["current_location"], errors="coerce"),
+        equal_nan=True,
+    )
+
+
+def test_typed_simulation_logger_types():
+    logger = TypedSimulationLogger("", Clock())
+    logger.create()
+    logger.set_trial_time()
+
+    for ii in range(5):
+        logger.update_trial_info(trial=ii, misc=[ii])
+        logger.log_event({"event_type": "test", "action": ii if ii % 2 else None})
+    # Integral floats are stored as integers.
+    logger.log_event({"event_type": "test", "action": np.float64(5.0)})
+    assert logger._columns[logger.categories.index("action")][0] == "int"
+
+    with pytest.warns(UserWarning, match="'action'"):
+        logger.log_event({"event_type": "test", "action": "left"})
+
+    df = logger.close()
+    assert len(df) == 7
+    assert df["trial"].tolist() == [0, 1, 2, 3, 4, 4, 4]
+    assert df["misc"].tolist() == [[0], [1], [2], [3], [4], [4], [4]]
+    # Non numeric values turn the column into an object column.
+    assert df["action"].tolist() == [None, 1, None, 3, None, 5, "left"]
+
+
+def test_typed_simulation_logger_nan():
+    logger = TypedSimulationLogger("", Clock())
+    logger.create()
+    logger.set_trial_time()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        for ii in range(3):
+            logger.update_trial_info(trial=ii, current_location=float("nan"))
+            logger.log_event({"event_type": "test", "action": np.float64(np.nan)})
+
+    df = logger.close()
+    for column in ["trial", "action", "current_location"]:
+        assert df[column].dtype == pd.Int64Dtype()
+    assert df["action"].isna().all()
+    assert df["current_location"].isna().all()
+
+
+def test_frame_timing_summary():
+    env = PsychopyEnv(
+        {0: [1, 2], 1: [], 2: []},
+        {1: BaseReward([1, 0], p=[0.7, 0.3]), 2: BaseReward([1, 0], p=[0.3, 0.7])},
+        render_mode="psychopy-simulate",
+        info_dict={
+            0: {
+                "psychopy": [
+                    BaseStimulus(name="fixation", duration=0.5),
+                    ActionStimulus(duration=2.0, rl_label="action"),
+                ]
+            },
+            1: {"psychopy": [BaseStimulus(name="iti", duration=1.0)]},
+            2: {"psychopy": [BaseStimulus(name="iti", duration=1.0)]},
+        },
+        name="test",
+    )
+    settings = {
+        "ntrials": 5,
+        "condition": ["a"] * 5,
+        "condition_dict": {"a": None},
+        "update": [],
+    }
+    agent = QAgent(0.1, 1.0, action_space=2, state_space=3)
+
+    logger = SimulationLogger("", Clock())
+    logger.create()
+    env.setup(window=Window(), logger=logger, expose_last_stim=True)
+    assert len(pspy_run_task(env, logger, settings=settings, agent=agent)) == 3
+    *_, frame_timing = pspy_run_task(
+        env, logger, settings=settings, agent=agent, return_frame_timing=True
+    )
+    assert frame_timing is None
+
+    # Simulated stimuli are not flipped, only the screen shown before the task.
+    logger = SimulationLogger("", Clock(), frame_timer=FrameTimer(60.0))
+    logger.create()
+    env.setup(window=Window(), logger=logger, expose_last_stim=True)
+    logger.flip(Window(), "instructions", intended_onset=0.0)
+    *_, frame_timing = pspy_run_task(
+        env, logger, settings=settings, agent=agent, return_frame_timing=True
+    )
+
+    assert list(frame_timing.columns) == SUMMARY_COLUMNS
+    assert frame_timing["stimulus"].tolist() == ["instructions"]
+    assert frame_timing["n_flips"].tolist() == [1]
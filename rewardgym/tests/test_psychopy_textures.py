@@ -0,0 +1,68 @@
+import numpy as np
+
+from rewardgym.environments import PsychopyEnv
+from rewardgym.psychopy_render import (
+    FeedBackStimulus,
+    ImageStimulus,
+    get_texture_cache,
+    textures,
+)
+from rewardgym.psychopy_render.psychopy_stubs import Window
+
+
+class _ImageStim:
+    def __init__(self, win, image=None, **kwargs):
+        self.n_draws = 0
+
+    def draw(self):
+        self.n_draws += 1
+
+    def setAutoDraw(self, value):
+        self.autoDraw = value
+
+
+def test_image_stimuli_share_textures(monkeypatch):
+    monkeypatch.setattr(textures, "ImageStim", _ImageStim)
+    win = Window()
+    image = np.zeros((10, 20, 3))
+
+    stims = [
+        ImageStimulus(1.0, [image]),
+        ImageStimulus(1.0, [image.copy()]),
+        ImageStimulus(1.0, [image], positions=[(0, 100)]),
+        ImageStimulus(1.0, [image], autodraw=True),
+    ]
+    for stim in stims:
+        stim.setup(win)
+
+    assert stims[0].imageStims[0] is stims[1].imageStims[0]
+    assert stims[0].imageStims[0] is not stims[2].imageStims[0]
+    assert not isinstance(stims[3].imageStims[0], _ImageStim)
+
+    feedback = [FeedBackStimulus(1.0, "{}", name="a") for _ in range(2)]
+    for stim in feedback:
+        stim.setup(win)
+
+    assert feedback[0].feedback_stim["win"] is feedback[1].feedback_stim["win"]
+    assert feedback[0].feedback_image == feedback[1].feedback_image
+    assert len(get_texture_cache(win)) == 5
+
+
+def test_preload_on_setup(monkeypatch):
+    monkeypatch.setattr(textures, "ImageStim", _ImageStim)
+    win = Window()
+    image = np.ones((5, 5, 3))
+
+    env = PsychopyEnv(
+        {0: [1], 1: []},
+        {},
+        info_dict={
+            0: {"psychopy": [ImageStimulus(1.0, [image])]},
+            1: {"psychopy": [ImageStimulus(1.0, [image])]},
+        },
+    )
+    env.setup(window=win)
+
+    stims = list(get_texture_cache(win).stims.values())
+    assert len(stims) == 1
+    assert stims[0].n_draws == 1
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from rewardgym.reward_classes import BaseReward, DriftingReward, _reflect
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 64])
+def test_buffered_base_reward_matches_unbuffered(buffer_size):
+    unbuffered = BaseReward([1, 0, -1], p=[0.2, 0.5, 0.3], random_state=3)
+    buffered = BaseReward(
+        [1, 0, -1], p=[0.2, 0.5, 0.3], random_state=3, buffer_size=buffer_size
+    )
+
+    assert [unbuffered() for _ in range(200)] == [buffered() for _ in range(200)]
+
+
+def test_buffered_drifting_reward():
+    reward = DriftingReward(
+        p=0.5, borders=[0.25, 0.75], gauss_sd=0.05, random_state=5, buffer_size=50
+    )
+
+    outcomes, probabilities = [], []
+    for _ in range(20000):
+        probabilities.append(reward.p)
+        outcomes.append(reward())
+
+    probabilities = np.array(probabilities)
+    outcomes = np.array(outcomes)
+
+    assert set(outcomes) <= {0, 1}
+    assert np.all((probabilities >= 0.25) & (probabilities <= 0.75))
+    assert np.isclose(np.std(np.diff(probabilities)), 0.05, rtol=0.1)
+    assert np.isclose(np.mean(outcomes), np.mean(probabilities), atol=0.02)
+
+    reward.reset()
+    assert reward.p == 0.5
+
+
+def test_reflect():
+    values = np.array([0.5, 0.8, 0.2, 1.3, -0.3, 0.75])
+    assert np.allclose(_reflect(values, 0.25, 0.75), [0.5, 0.7, 0.3, 0.3, 0.7, 0.75])
@@ -0,0 +1,126 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from rewardgym import simulate_many
+from rewardgym.agents import QAgent
+from rewardgym.reward_classes import DriftingReward
+
+
+def _get_toy_configs(random_state):
+    rng = np.random.default_rng(random_state)
+    condition = list(rng.choice(["left", "right"], 10))
+    condition_dict = {"left": {0: {0: 1}}, "right": {0: {1: 2}}}
+    return {"condition": condition, "condition_dict": condition_dict}
+
+
+def _agent_factory(participant, env, random_state):
+    return QAgent(
+        learning_rate=0.1 + 0.1 * participant,
+        temperature=1.0,
+        action_space=env.n_actions,
+        state_space=env.n_states,
+        seed=random_state,
+    )
+
+
+@pytest.fixture
+def toy_task(register_task, toy_get_task):
+    graph = {0: {0: 1, 1: ([2, 1], 0.8)}, 1: [], 2: []}
+    register_task("toy", toy_get_task(graph), _get_toy_configs)
+
+
+def test_simulate_many(toy_task):
+    data = simulate_many("toy", _agent_factory, 4, 25, n_workers=1, random_state=5)
+
+    assert len(data) == 100
+    assert list(data.columns) == [
+        "participant",
+        "episode",
+        "state",
+        "action",
+        "reward",
+        "condition",
+    ]
+    assert np.all(np.bincount(data["participant"]) == 25)
+    assert set(data["state"]) <= {1, 2}
+
+    # Different participants receive different random streams.
+    actions = data.pivot(index="episode", columns="participant", values="action")
+    assert not np.all(actions.to_numpy() == actions.to_numpy()[:, :1])
+
+    repeated = simulate_many("toy", _agent_factory, 4, 25, n_workers=1, random_state=5)
+    assert data.equals(repeated)
+
+    parallel = simulate_many(
+        "toy",
+        _agent_factory,
+        4,
+        25,
+        n_workers=2,
+        random_state=5,
+        mp_context=multiprocessing.get_context("fork"),
+    )
+    assert data.equals(parallel)
+
+
+def test_simulate_many_conditions(toy_task):
+    data = simulate_many(
+        "toy", _agent_factory, 3, 10, n_workers=1, conditions="configs"
+    )
+
+    assert set(data["condition"]) <= {"left", "right"}
+    assert np.all(data.loc[data["condition"] == "left", "state"] == 1)
+    assert np.all(data.loc[data["condition"] == "right", "state"] == 2)
+
+
+def test_simulate_many_too_many_episodes(toy_task):
+    with pytest.raises(ValueError, match="2 conditions"):
+        simulate_many("toy", _agent_factory, 1, 5, n_workers=1, conditions=[None] * 2)
+
+    with pytest.raises(ValueError, match="10 trials"):
+        simulate_many("toy", _agent_factory, 1, 20, n_workers=1, conditions="configs")
+
+
+def test_simulate_many_step_reward_meta(register_task):
+    calls = []
+
+    def reward():
+        calls.append(1)
+        return 1
+
+    def get_task(render_backend=None, random_state=None):
+        graph = {0: [1, 2], 1: [], 2: []}
+        return graph, {1: reward, 2: reward}, {"meta": {"step_reward": True}}
+
+    register_task("toy-meta", get_task, _get_toy_configs)
+
+    simulate_many("toy-meta", _agent_factory, 1, 5, n_workers=1)
+    assert len(calls) == 10
+
+    calls.clear()
+    simulate_many("toy-meta", _agent_factory, 1, 5, n_workers=1, step_reward=False)
+    assert len(calls) == 5
+
+
+def test_simulate_many_two_step_drift(register_task):
+    rewards = []
+
+    class CountingReward(DriftingReward):
+        calls = 0
+
+        def __call__(self, **kwargs):
+            self.calls += 1
+            return super().__call__(**kwargs)
+
+    def get_task(render_backend=None, random_state=None):
+        graph = {0: [1, 2], 1: [], 2: []}
+        rewards[:] = [CountingReward(random_state=random_state) for _ in range(2)]
+        return graph, dict(zip([1, 2], rewards)), {}
+
+    register_task("two-step", get_task, _get_toy_configs)
+
+    simulate_many("two-step", _agent_factory, 1, 5, n_workers=1)
+    assert [rw.calls for rw in rewards] == [5, 5]
+    assert all(rw.p != rw.initial_p for rw in rewards)
@@ -0,0 +1,184 @@
+import sys
+
+from rewardgym.tasks import TaskManifest
+from rewardgym.tasks.task_loader import (
+    EntryPointPlugin,
+    TaskRegistry,
+    _entry_point_plugins,
+    _environment_hash,
+    _plugin_task_names,
+)
+
+LITERAL_PLUGIN = """
+def _get_task(*args, **kwargs):
+    return {{0: [1], 1: []}}, {{}}, {{"name": "{name}"}}
+
+
+def register_task():
+    return {{"{name}": {{"get_task": _get_task, "get_configs": None}}}}
+"""
+
+DYNAMIC_PLUGIN = """
+def _get_task(*args, **kwargs):
+    return {{0: [1], 1: []}}, {{}}, {{"name": "{name}"}}
+
+
+def register_task():
+    return dict([("{name}", {{"get_task": _get_task, "get_configs": None}})])
+"""
+
+
+def _make_plugin(base_dir, folder, source):
+    (base_dir / folder).mkdir(parents=True)
+    (base_dir / folder / "plugin.py").write_text(source)
+
+
+def test_plugin_task_names(tmp_path):
+    _make_plugin(tmp_path, "a", LITERAL_PLUGIN.format(name="task-a"))
+    _make_plugin(tmp_path, "b", DYNAMIC_PLUGIN.format(name="task-b"))
+
+    assert _plugin_task_names(tmp_path / "a" / "plugin.py") == ["task-a"]
+    assert _plugin_task_names(tmp_path / "b" / "plugin.py") is None
+
+
+def test_registry_imports_plugins_lazily(tmp_path):
+    prefix = tmp_path.name
+    _make_plugin(tmp_path, f"{prefix}_lazy", LITERAL_PLUGIN.format(name="lazy"))
+    _make_plugin(tmp_path, f"{prefix}_eager", DYNAMIC_PLUGIN.format(name="eager"))
+    _make_plugin(tmp_path, f"{prefix}_broken", "def register_task(:\n")
+
+    registry = TaskRegistry.from_directory(tmp_path)
+
+    assert sorted(registry.keys()) == ["eager", "lazy"]
+    assert "lazy" in registry
+    assert f"rewardgym_tasks.{prefix}_lazy.plugin" not in sys.modules
+    assert f"rewardgym_tasks.{prefix}_eager.plugin" in sys.modules
+
+    assert registry["lazy"]["get_task"]()[2]["name"] == "lazy"
+    assert f"rewardgym_tasks.{prefix}_lazy.plugin" in sys.modules
+    assert registry.get("missing") is None
+
+    del registry["lazy"]
+    assert sorted(registry.keys()) == ["eager"]
+
+
+def test_registry_lazy_load_failure(tmp_path):
+    folder = f"{tmp_path.name}_fails"
+    _make_plugin(
+        tmp_path,
+        folder,
+        "raise ImportError('missing dependency')\n"
+        + LITERAL_PLUGIN.format(name="fails"),
+    )
+
+    registry = TaskRegistry.from_directory(tmp_path)
+
+    assert "fails" in registry
+    assert registry.get("fails") is None
+    assert "fails" not in registry
+    assert len(registry) == 0
+
+
+def test_registry_manifest(tmp_path):
+    prefix = tmp_path.name
+    _make_plugin(tmp_path / "tasks", f"{prefix}_dyn", DYNAMIC_PLUGIN.format(name="dyn"))
+    module = f"rewardgym_tasks.{prefix}_dyn.plugin"
+    manifest_path = tmp_path / "cache" / "manifest.json"
+
+    TaskRegistry.from_directory(
+        tmp_path / "tasks", manifest=TaskManifest(manifest_path)
+    )
+    assert module in sys.modules
+    del sys.modules[module]
+
+    # The names of the plugin are now known without importing it.
+    registry = TaskRegistry.from_directory(
+        tmp_path / "tasks", manifest=TaskManifest(manifest_path)
+    )
+    assert list(registry.keys()) == ["dyn"]
+    assert module not in sys.modules
+
+    # The graph metadata is computed on first request, and then cached.
+    assert registry.metadata("dyn") == {"handles": ["get_task"], "n_nodes": 2}
+    assert module in sys.modules
+    del sys.modules[module]
+
+    registry = TaskRegistry.from_directory(
+        tmp_path / "tasks", manifest=TaskManifest(manifest_path)
+    )
+    assert registry.metadata("dyn") == {"handles": ["get_task"], "n_nodes": 2}
+    assert module not in sys.modules
+
+    assert registry["dyn"]["get_task"]()[2]["name"] == "dyn"
+
+
+def test_manifest_only_describes_requested_task(tmp_path):
+    folder = f"{tmp_path.name}_pair"
+    _make_plugin(
+        tmp_path,
+        folder,
+        """
+CALLS = []
+
+
+def _get_task(name):
+    def get_task(*args, **kwargs):
+        CALLS.append(name)
+        return {0: [1], 1: []}, {}, {}
+
+    return get_task
+
+
+def register_task():
+    return {name: {"get_task": _get_task(name)} for name in ["first", "second"]}
+""",
+    )
+    module = f"rewardgym_tasks.{folder}.plugin"
+    manifest_path = tmp_path / "cache" / "manifest.json"
+
+    registry = TaskRegistry.from_directory(
+        tmp_path, manifest=TaskManifest(manifest_path)
+    )
+    assert sys.modules[module].CALLS == []
+    assert manifest_path.exists()
+
+    assert registry.metadata("first")["n_nodes"] == 2
+    assert sys.modules[module].CALLS == ["first"]
+
+
+def test_entry_points_do_not_write_manifest(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest = TaskManifest(manifest_path)
+
+    TaskRegistry(manifest=manifest).add_entry_points()
+    assert not manifest_path.exists()
+
+    manifest.set("other", "hash", {})
+    assert "entry_points:rewardgym.tasks" in TaskManifest(manifest_path)._entries
+
+
+def test_entry_point_plugins(tmp_path, monkeypatch):
+    module = f"{tmp_path.name}_ep_plugin"
+    (tmp_path / "site").mkdir()
+    (tmp_path / "site" / f"{module}.py").write_text(
+        LITERAL_PLUGIN.format(name="ep-task")
+    )
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+
+    manifest = TaskManifest(tmp_path / "manifest.json")
+    manifest.set(
+        "entry_points:rewardgym.tasks", _environment_hash(), {"ep-task": module}
+    )
+
+    plugins = _entry_point_plugins(manifest=manifest)
+    assert plugins == [EntryPointPlugin("ep-task", module)]
+
+    registry = TaskRegistry({"other": {}}, manifest=manifest)
+    monkeypatch.setattr(
+        "rewardgym.tasks.task_loader._entry_point_plugins", lambda *args: plugins
+    )
+    registry.add_entry_points()
+
+    assert sorted(registry.keys()) == ["ep-task", "other"]
+    assert module not in sys.modules
+    assert registry["ep-task"]["get_task"]()[2]["name"] == "ep-task"
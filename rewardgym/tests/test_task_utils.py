@@ -1,8 +1,15 @@
+import numpy as np
+import pytest
+
 from rewardgym.tasks.utils import (
     check_condition_present_or,
     check_conditions_not_following,
     check_conditions_not_following_substring,
     check_conditions_present,
+    check_encoded_not_following,
+    condition_mask,
+    encode_conditions,
+    generate_condition_sequence,
 )
 
 
@@ -235,4 +242,91 @@ def test_no_substring_violation_due_to_non_following():
     )
 
 
+def test_generate_condition_sequence_constraints():
+    conditions = {"win-a": 20, "win-b": 20, "loss-a": 20, "loss-b": 20, "neutral": 60}
+    sequence = generate_condition_sequence(
+        conditions,
+        not_following=["win-a", "loss-a"],
+        window_length=2,
+        not_following_substring=["win"],
+        substring_window_length=1,
+        random_state=1,
+    )
+
+    assert len(sequence) == 140
+    assert {cc: sequence.count(cc) for cc in conditions} == conditions
+    assert check_conditions_not_following(sequence, ["win-a", "loss-a"], 2)
+    assert check_conditions_not_following_substring(sequence, ["win"], 1)
+
+
+def test_generate_condition_sequence_mixed_labels():
+    conditions = {"win-a": 5, "win-b": 5, None: 10, 3: 10}
+    sequence = generate_condition_sequence(
+        conditions, not_following_substring=["win"], random_state=2
+    )
+
+    codes, labels = encode_conditions(sequence)
+    mask = condition_mask(labels, substrings=["win"])
+    assert mask.tolist() == [lb in ["win-a", "win-b"] for lb in labels]
+    assert check_encoded_not_following(codes, mask)
+    assert {cc: sequence.count(cc) for cc in conditions} == conditions
+
+
+def test_generate_condition_sequence_reproducible():
+    conditions = ["a"] * 10 + ["b"] * 10 + ["c"] * 20
+    first = generate_condition_sequence(conditions, ["a", "b"], random_state=5)
+    second = generate_condition_sequence(conditions, ["a", "b"], random_state=5)
+
+    assert first == second
+    assert sorted(first) == sorted(conditions)
+
+
+def test_generate_condition_sequence_infeasible():
+    with pytest.raises(ValueError):
+        generate_condition_sequence({"a": 5, "b": 3}, ["a"], random_state=1)
+
+    with pytest.raises(ValueError):
+        generate_condition_sequence(
+            {"a": 5, "b": 5}, ["a"], conditions_required=["c"], random_state=1
+        )
+
+
+def test_encode_conditions():
+    codes, labels = encode_conditions(["b", "a", "b", "c"])
+    assert labels == ["b", "a", "c"]
+    assert codes.tolist() == [0, 1, 0, 2]
+
+    codes, labels = encode_conditions([["a", "b"], ["b", "b"]], labels=["b", "a"])
+    assert codes.tolist() == [[1, 0], [0, 0]]
+
+    with pytest.raises(ValueError):
+        encode_conditions(["a", "d"], labels=["a", "b"])
+
+
+def test_encoded_check_matches_checkers():
+    rng = np.random.default_rng(0)
+    labels = ["win-a", "win-b", "loss-a", "loss-b", "neutral"]
+    sequences = [list(rng.choice(labels, 12)) for _ in range(200)]
+    codes, labels = encode_conditions(sequences, labels=labels)
+
+    for window_length in [0, 1, 2, 3]:
+        substring = check_encoded_not_following(
+            codes, condition_mask(labels, substrings=["win"]), window_length
+        )
+        members = check_encoded_not_following(
+            codes, condition_mask(labels, not_following=["loss-a"]), window_length
+        )
+
+        assert substring.tolist() == [
+            check_conditions_not_following_substring(seq, ["win"], window_length)
+            for seq in sequences
+        ]
+        assert members.tolist() == [
+            check_conditions_not_following(seq, ["loss-a"], window_length)
+            for seq in sequences
+        ]
+
+    assert check_encoded_not_following(codes[0], np.zeros(5, dtype=bool)) is True
+
+
 # To run the tests, save this in a test file and run `pytest`.
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from rewardgym.environments import BaseEnv
+from rewardgym.tasks import yaml_tools
+
+TASK_YAML = """
+meta:
+  name: toy
+graph:
+  0:
+    0:
+      next: [1, 2]
+      prob: 0.7
+    1:
+      next: [2, 1]
+      prob: 0.7
+  1: [3, 4]
+  2:
+    0: 3
+    skip: true
+  3: []
+  4: []
+"""
+
+
+@pytest.fixture
+def task_yaml(tmp_path):
+    path = tmp_path / "task.yaml"
+    path.write_text(TASK_YAML)
+    return path
+
+
+def test_load_task_from_yaml_cache(task_yaml, tmp_path, monkeypatch):
+    meta, graph = yaml_tools.load_task_from_yaml(task_yaml)
+    assert graph[0][0] == ([1, 2], 0.7)
+    assert graph[2] == {0: 3, "skip": True}
+
+    cached = yaml_tools.load_task_from_yaml(
+        task_yaml, cache=True, cache_dir=tmp_path / "cache"
+    )
+    assert cached == (meta, graph)
+
+    def _fail(*args):
+        raise AssertionError("The yaml file should not be parsed again.")
+
+    monkeypatch.setattr(yaml_tools, "_parse_task_yaml", _fail)
+    cached = yaml_tools.load_task_from_yaml(
+        task_yaml, cache=True, cache_dir=tmp_path / "cache"
+    )
+    assert cached == (meta, graph)
+
+    # Changing the file invalidates the entry.
+    old_entry = yaml_tools.yaml_cache_path(task_yaml, tmp_path / "cache")
+    task_yaml.write_text(TASK_YAML.replace("0.7", "0.8"))
+    assert yaml_tools.yaml_cache_path(task_yaml, tmp_path / "cache") != old_entry
+
+
+def test_load_compiled_task_from_yaml(task_yaml, tmp_path):
+    _, graph, compiled = yaml_tools.load_compiled_task_from_yaml(
+        task_yaml, cache_dir=tmp_path / "cache"
+    )
+    reference = BaseEnv(graph, {3: lambda: 1, 4: lambda: 0}).compile()
+
+    assert isinstance(compiled.next_state, np.memmap)
+    for name in ["next_state", "stochasticity", "alternatives", "terminal", "skip"]:
+        assert np.array_equal(
+            getattr(compiled, name), getattr(reference, name), equal_nan=True
+        )
+    assert compiled.avail_actions == reference.avail_actions
+
+    env = BaseEnv(graph, {3: lambda: 1, 4: lambda: 0}, random_state=2)
+    env.compile(compiled)
+    assert env.reset()[0] == 0
+
+    with pytest.raises(ValueError):
+        BaseEnv({0: [1], 1: []}, {}).compile(compiled)
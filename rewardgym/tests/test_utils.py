@@ -1,8 +1,10 @@
 import numpy as np
+import pandas as pd
 import pytest
 
 from rewardgym import ENVIRONMENTS, get_env
 from rewardgym.utils import (
+    EpisodeRecorder,
     add_to_df,
     check_elements_in_list,
     check_random_state,
@@ -279,3 +281,77 @@ def test_get_stripped_graph_with_empty_dict():
     graph = {}
     expected = {}
     assert get_stripped_graph(graph) == expected
+
+
+def test_episode_recorder_matches_add_to_df():
+    episodes = [
+        ([0, 3, 6], [1, 4, 7], [2.0, 5.0, 8.0]),
+        ([1, 2], [0, None], [1.0, 0.0]),
+    ]
+
+    recorder = EpisodeRecorder(capacity=2)
+    df = None
+    for n, episode_step in enumerate(episodes):
+        recorder.extend(episode_step, episode=n, condition="cond", starting_position=0)
+        df = add_to_df(
+            episode_step, episode=n, condition="cond", starting_position=0, df=df
+        )
+
+    recorder.append(5, 1, 3.0)
+
+    data = recorder.to_pandas()
+    assert len(recorder) == 6
+    assert list(data.columns) == EpisodeRecorder.columns
+    for col in ["index", "episode", "state", "reward", "starting_position"]:
+        assert list(data[col])[:5] == df[col]
+    assert list(data["action"]) == [1, 4, 7, 0, -1, 1]
+    assert list(data["condition"])[:5] == df["condition"]
+    assert pd.isna(data["condition"].iloc[5])
+    assert data["episode"].iloc[5] == -1
+
+
+def test_episode_recorder_unhashable_conditions():
+    condition = {0: {0: 1}}
+    recorder = EpisodeRecorder()
+    recorder.extend(([1], [0], [1.0]), condition=condition)
+    recorder.extend(([1], [0], [1.0]), condition=condition)
+
+    assert recorder.categories == [condition]
+    assert list(recorder.to_dict()["condition"]) == [0, 0]
+    assert recorder.to_pandas()["condition"].iloc[0] is condition
+
+
+def test_episode_recorder_to_arrow():
+    pytest.importorskip("pyarrow")
+
+    recorder = EpisodeRecorder()
+    recorder.extend(([1, 2], [0, 1], [1.0, 0.0]), episode=0, condition="a")
+
+    table = recorder.to_arrow()
+    assert table.column_names == EpisodeRecorder.columns
+    assert table.column("condition").to_pylist() == ["a", "a"]
+
+
+def test_run_single_episode_recorder():
+    from rewardgym.environments import BaseEnv
+
+    class FirstAgent:
+        def get_action(self, obs, avail_actions):
+            return avail_actions[0]
+
+        def update(self, *args, **kwargs):
+            pass
+
+    env = BaseEnv({0: [1, 2], 1: [], 2: []}, {1: lambda: 1.0, 2: lambda: 0.0})
+    recorder = EpisodeRecorder()
+
+    for episode in range(3):
+        run_single_episode(
+            env, FirstAgent(), 0, None, recorder=recorder, episode=episode
+        )
+
+    data = recorder.to_pandas()
+    assert list(data["episode"]) == [0, 1, 2]
+    assert list(data["state"]) == [1, 1, 1]
+    assert list(data["reward"]) == [1.0, 1.0, 1.0]
+    assert list(data["starting_position"]) == [0, 0, 0]
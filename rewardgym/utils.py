@@ -11,6 +11,9 @@ def run_single_episode(
     condition: int,
     update_agent: bool = True,
     step_reward: bool = False,
+    recorder: "EpisodeRecorder" = None,
+    episode: int = None,
+    condition_label=None,
 ) -> Union[List, List, float]:
     """
     Runs a single episode of a task.
@@ -29,6 +32,12 @@ def run_single_episode(
         If the agent should update internal states, by default True
     step_reward : bool, optional
         If all rewards should be triggered e.g. in two-step task, by default False
+    recorder : EpisodeRecorder, optional
+        If given, the episode is also written into the recorder, by default None
+    episode : int, optional
+        Episode counter variable stored in the recorder, by default None
+    condition_label : optional
+        Stored in the recorder instead of the condition, by default None
 
     Returns
     -------
@@ -59,6 +68,14 @@ def run_single_episode(
         states.append(obs)
         rewards.append(reward)
 
+    if recorder is not None:
+        recorder.extend(
+            (states, actions, rewards),
+            episode=episode,
+            condition=condition if condition_label is None else condition_label,
+            starting_position=starting_position,
+        )
+
     return states, actions, rewards
 
 
@@ -121,6 +138,233 @@ def add_to_df(
     return df
 
 
+class EpisodeRecorder:
+    """
+    Columnar alternative to ``add_to_df``. Outcomes are written into preallocated
+    NumPy arrays, which double in size when full. Missing episodes, actions and
+    starting positions are stored as -1, conditions as integer codes into
+    ``categories``.
+    """
+
+    columns = [
+        "index",
+        "episode",
+        "state",
+        "action",
+        "reward",
+        "condition",
+        "starting_position",
+    ]
+
+    dtypes = {
+        "index": np.int64,
+        "episode": np.int64,
+        "state": np.int64,
+        "action": np.int64,
+        "reward": np.float64,
+        "condition": np.int32,
+        "starting_position": np.int64,
+    }
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Creates an empty recorder.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Number of rows that are initially allocated, by default 1024
+        """
+        self._data = {
+            col: np.empty(max(capacity, 1), dtype=dt) for col, dt in self.dtypes.items()
+        }
+        self.n_rows = 0
+        self.categories = []
+        self._category_codes = {}
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def _reserve(self, n: int):
+        capacity = len(self._data["index"])
+
+        if self.n_rows + n <= capacity:
+            return
+
+        while capacity < self.n_rows + n:
+            capacity *= 2
+
+        for col, values in self._data.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[: self.n_rows] = values[: self.n_rows]
+            self._data[col] = grown
+
+    def _condition_code(self, condition) -> int:
+        if condition is None:
+            return -1
+
+        try:
+            code = self._category_codes.get(condition)
+        except TypeError:
+            # Unhashable conditions, e.g. condition dictionaries, are compared by identity.
+            code = next(
+                (n for n, cat in enumerate(self.categories) if cat is condition), None
+            )
+
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(condition)
+            try:
+                self._category_codes[condition] = code
+            except TypeError:
+                pass
+
+        return code
+
+    def append(
+        self,
+        state: int,
+        action: int,
+        reward: float,
+        episode: int = None,
+        condition=None,
+        starting_position: int = None,
+    ):
+        """
+        Records a single step.
+
+        Parameters
+        ----------
+        state : int
+            The observation after the step.
+        action : int
+            The action taken, None is stored as -1.
+        reward : float
+            The obtained reward.
+        episode : int, optional
+            Episode counter variable, by default None
+        condition : optional
+            Condition (or condition label) of the episode, by default None
+        starting_position : int, optional
+            Where the agent started, by default None
+        """
+        self._reserve(1)
+        row = self.n_rows
+
+        self._data["index"][row] = row
+        self._data["episode"][row] = -1 if episode is None else episode
+        self._data["state"][row] = state
+        self._data["action"][row] = -1 if action is None else action
+        self._data["reward"][row] = reward
+        self._data["condition"][row] = self._condition_code(condition)
+        self._data["starting_position"][row] = (
+            -1 if starting_position is None else starting_position
+        )
+
+        self.n_rows += 1
+
+    def extend(
+        self,
+        episode_step: List,
+        episode: int = None,
+        condition=None,
+        starting_position: int = None,
+    ):
+        """
+        Records all steps of an episode, takes the same arguments as ``add_to_df``.
+
+        Parameters
+        ----------
+        episode_step : List
+            Outcomes of run_single_episode, i.e. states, actions and rewards.
+        episode : int, optional
+            Episode counter variable, by default None
+        condition : optional
+            Condition (or condition label) of the episode, by default None
+        starting_position : int, optional
+            Where the agent started, by default None
+        """
+        states, actions, rewards = episode_step
+        n = len(states)
+
+        self._reserve(n)
+        rows = slice(self.n_rows, self.n_rows + n)
+
+        self._data["index"][rows] = np.arange(self.n_rows, self.n_rows + n)
+        self._data["episode"][rows] = -1 if episode is None else episode
+        self._data["state"][rows] = states
+        self._data["action"][rows] = [-1 if ac is None else ac for ac in actions]
+        self._data["reward"][rows] = rewards
+        self._data["condition"][rows] = self._condition_code(condition)
+        self._data["starting_position"][rows] = (
+            -1 if starting_position is None else starting_position
+        )
+
+        self.n_rows += n
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """
+        Returns views of the recorded part of each column.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Dictionary of column arrays, conditions are integer codes.
+        """
+        return {col: values[: self.n_rows] for col, values in self._data.items()}
+
+    def _condition_values(self):
+        codes = self._data["condition"][: self.n_rows]
+
+        try:
+            import pandas as pd
+
+            return pd.Categorical.from_codes(codes, categories=self.categories)
+        except (TypeError, ValueError):
+            # Categories that cannot be used by pandas, e.g. dictionaries.
+            categories = np.empty(len(self.categories) + 1, dtype=object)
+            categories[:-1] = self.categories
+            categories[-1] = None
+            return categories[codes]
+
+    def to_pandas(self):
+        """
+        Returns the recording as a pandas DataFrame, without copying the numeric columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            The recording, conditions as a categorical column.
+        """
+        import pandas as pd
+
+        data = self.to_dict()
+        data["condition"] = self._condition_values()
+
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        Returns the recording as a pyarrow Table, numeric columns are not copied.
+
+        Returns
+        -------
+        pyarrow.Table
+            The recording, conditions as a dictionary encoded column.
+        """
+        import pyarrow as pa
+
+        data = self.to_dict()
+        codes = data.pop("condition")
+        columns = {col: pa.array(values) for col, values in data.items()}
+        columns["condition"] = pa.DictionaryArray.from_arrays(
+            pa.array(codes, mask=codes < 0),
+            pa.array([str(cat) for cat in self.categories], type=pa.string()),
+        )
+
+        return pa.table({col: columns[col] for col in self.columns})
+
+
 def check_elements_in_list(check_list: List, check_set: List) -> bool:
     """
     Checks if all elements in the check_list are included in the check
@@ -244,6 +488,36 @@ def check_random_state(
         return np.random.default_rng(random_state)
 
 
+def spawn_seeds(
+    random_state: Union[np.random.SeedSequence, np.random.Generator, int] = None,
+    n: int = 1,
+) -> List[np.random.SeedSequence]:
+    """
+    Creates n independent seed sequences, e.g. to seed environments, agents and
+    rewards of different (simulated) participants.
+
+    Parameters
+    ----------
+    random_state : Union[np.random.SeedSequence, np.random.Generator, int], optional
+        Root of the seed sequences. A Generator is advanced by one draw, by default None
+    n : int, optional
+        Number of seed sequences to create, by default 1
+
+    Returns
+    -------
+    List[np.random.SeedSequence]
+        List of independent seed sequences.
+    """
+    if isinstance(random_state, np.random.SeedSequence):
+        seed_sequence = random_state
+    elif isinstance(random_state, np.random.Generator):
+        seed_sequence = np.random.SeedSequence(int(random_state.integers(2**63)))
+    else:
+        seed_sequence = np.random.SeedSequence(random_state)
+
+    return seed_sequence.spawn(n)
+
+
 def get_starting_nodes(graph: dict) -> List:
     """
     Returns the starting nodes of a graph.
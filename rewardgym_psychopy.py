@@ -3,7 +3,7 @@ import json
 from psychopy import core, event, visual
 
 from rewardgym import get_configs, get_env, get_psychopy_info
-from rewardgym.psychopy_render import ExperimentLogger
+from rewardgym.psychopy_render import ExperimentLogger, FrameTimer
 from rewardgym.runner import pspy_run_task, pspy_set_up_experiment
 from rewardgym.runner.psychopy_instructions import show_instructions
 from rewardgym.tasks import FULLPOINTS
@@ -39,6 +39,10 @@ if __name__ == "__main__":
         run=exp_dict["run"],
         task=exp_dict["task"],
         mr_clock=globalClock,
+        writer=exp_dict["log_writer"],
+        frame_timer=FrameTimer(win.getActualFrameRate() or 60.0)
+        if exp_dict["frame_timing"]
+        else None,
     )
     Logger.create()
 
@@ -96,6 +100,13 @@ if __name__ == "__main__":
 
     pspy_run_task(env=env, win=win, logger=Logger, settings=settings, n_episodes=None)
 
+    if Logger.frame_timer is not None:
+        Logger.frame_timer.summary().to_csv(
+            config_save.replace("config.json", "frametiming.tsv"),
+            sep="\t",
+            index=False,
+        )
+
     win.to_Draw = []
     proportion = max([min([env.cumulative_reward / FULLPOINTS[task], 1.0]), 0])
 